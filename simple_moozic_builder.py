@@ -16,19 +16,31 @@ Output structure is compatible with the True Moozic main mod contract:
 from __future__ import annotations
 
 import argparse
+import base64
+import ctypes
+import fnmatch
 import hashlib
+import io
 import json
+import multiprocessing
 import os
 import tempfile
 import random
 import re
+import select
 import shutil
 import subprocess
 import sys
+import threading
+import time
 import unicodedata
-from dataclasses import dataclass
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 from PIL import Image, ImageChops, ImageDraw, ImageEnhance, ImageFont
 
@@ -70,6 +82,54 @@ AUDIO_SOURCE_EXTENSIONS = {
     ".wma",
 }
 MIX_META_SUFFIX = ".smbmixmeta.json"
+MIX_RECIPE_SUFFIX = ".smbmixrecipe.json"
+MIX_RECIPE_VERSION = 1
+MIX_RENDER_FOLDER_NAME = ".smb_mix_renders"
+# Encoder settings for rendered mixes; they are hashed into every recipe, so changing one re-renders.
+MIX_RENDER_SAMPLE_RATE = 44100
+MIX_RENDER_CHANNELS = 2
+MIX_RENDER_VORBIS_QUALITY = 5  # ffmpeg -q:a scale (0-10)
+MIX_RENDER_PRUNE_GRACE = 300.0  # seconds; younger render folders may still be filling
+CATALOG_SNAPSHOT_FILENAME = ".smb_catalog.json"
+CATALOG_SNAPSHOT_VERSION = 2
+SCAN_IGNORE_FILENAME = ".smbignore"
+SCAN_DEFAULT_PAGE_SIZE = 500
+STAT_CACHE_TTL = 2.0
+TEMPLATE_BUNDLE_FOLDER_NAME = ".smb_templates"
+TEMPLATE_BUNDLE_MAGIC = b"SMBTPL\x00\x01"
+TEMPLATE_BUNDLE_VERSION = 1
+TEXTURE_CACHE_FOLDER_NAME = ".smb_textures"
+TEXTURE_CACHE_VERSION = 2
+COVER_WORKING_MAX_SIDE = 2048
+COVER_WORKING_MIN_SIDE = 256
+COVER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+COVER_HASH_SIZE = 8
+COVER_THUMB_SIZE = 96
+COVER_INDEX_FOLDER_NAME = ".smb_covers"
+COVER_INDEX_VERSION = 1
+COVER_SIMILAR_MAX_DISTANCE = 6
+PNG_PROFILES = ("draft", "default", "release")
+PNG_PALETTE_MAX_SIDE = 64
+TEXTURE_SIZE_POLICIES = ("native", "128", "256")
+HR_TEXTURE_POLICIES = ("auto", "ship", "downsample", "side", "off")
+HR_MAX_SIDE = 2048
+HR_DOWNSAMPLE_SIZE = 1024
+HR_SIDE_FOLDER_SUFFIX = "_HR"
+COMPOSE_BATCH_PIXELS = 1 << 16
+TEXTURE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+FINGERPRINT_CACHE_FILENAME = ".smb_fingerprints.json"
+FINGERPRINT_VERSION = 1
+FINGERPRINT_RATE = 11025
+FINGERPRINT_FRAME = 2048
+FINGERPRINT_HOP = 512
+FINGERPRINT_BANDS = 17
+FINGERPRINT_MAX_SECONDS = 120
+FINGERPRINT_MAX_SHIFT = 40
+FINGERPRINT_MATCH_BER = 0.30
+FINGERPRINT_DURATION_TOLERANCE = 0.03
+FINGERPRINT_INDEX_MIN_VOTES = 4  # exact sub-fingerprint hits at one alignment before a pair gets a BER check
+FINGERPRINT_INDEX_MAX_POSTINGS = 64  # longer (word, block) lists are silence/stop words and are skipped
+FINGERPRINT_INDEX_CHUNK_WORDS = 4096  # word range joined per pass
 
 def _safe_song_stem(name: str) -> str:
     stem = (name or "").strip()
@@ -122,6 +182,18 @@ class AudioTrackEntry:
     ogg: Path
     status: str
     detail: str = ""
+    duplicate_of: Optional[str] = None
+
+
+@dataclass
+class FileStat:
+    path: Path
+    size: int
+    mtime_ns: int
+
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1e9
 
 
 @dataclass
@@ -301,22 +373,37 @@ def _square_letterbox(src: Path, out_size: int) -> Image.Image:
         return canvas.resize((out_size, out_size), Image.LANCZOS)
 
 
-def _load_overlay_font(size: int) -> ImageFont.ImageFont:
-    candidates = [
-        Path(r"C:\Windows\Fonts\segoeuib.ttf"),
-        Path(r"C:\Windows\Fonts\arialbd.ttf"),
-        Path(r"C:\Windows\Fonts\calibrib.ttf"),
-        Path(r"C:\Windows\Fonts\impact.ttf"),
-        Path(r"C:\Windows\Fonts\segoeui.ttf"),
-        Path(r"C:\Windows\Fonts\arial.ttf"),
-    ]
-    for font_path in candidates:
+OVERLAY_FONT_CANDIDATES = (
+    Path(r"C:\Windows\Fonts\segoeuib.ttf"),
+    Path(r"C:\Windows\Fonts\arialbd.ttf"),
+    Path(r"C:\Windows\Fonts\calibrib.ttf"),
+    Path(r"C:\Windows\Fonts\impact.ttf"),
+    Path(r"C:\Windows\Fonts\segoeui.ttf"),
+    Path(r"C:\Windows\Fonts\arial.ttf"),
+)
+OVERLAY_LAYOUT_CACHE_MAX = 4096
+# LRU of wrapped layouts; posters are also rendered from build worker threads, hence the lock.
+_OVERLAY_LAYOUTS: OrderedDict[tuple[str, int, int, int, int], tuple[list[str], int, int]] = OrderedDict()
+_OVERLAY_LAYOUTS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _overlay_font_file() -> Optional[str]:
+    # Discovered once per process: the first candidate FreeType can load.
+    for font_path in OVERLAY_FONT_CANDIDATES:
         if font_path.exists():
             try:
-                return ImageFont.truetype(str(font_path), size=size)
+                ImageFont.truetype(str(font_path), size=12)
             except Exception:
                 continue
-    return ImageFont.load_default()
+            return str(font_path)
+    return None
+
+
+@lru_cache(maxsize=None)
+def _load_overlay_font(size: int) -> ImageFont.ImageFont:
+    font_file = _overlay_font_file()
+    return ImageFont.truetype(font_file, size=size) if font_file else ImageFont.load_default()
 
 
 def _wrap_text(
@@ -359,6 +446,28 @@ def _wrap_text(
     return lines
 
 
+def _overlay_layout(
+    draw: ImageDraw.ImageDraw, text: str, size: int, max_w: int, spacing: int, stroke: int
+) -> tuple[list[str], int, int]:
+    # Wrapped lines and their rendered width/height at one font size, shared by every poster and preview.
+    key = (text, size, max_w, spacing, stroke)
+    with _OVERLAY_LAYOUTS_LOCK:
+        layout = _OVERLAY_LAYOUTS.get(key)
+        if layout is not None:
+            _OVERLAY_LAYOUTS.move_to_end(key)
+            return layout
+    font = _load_overlay_font(size)
+    lines = _wrap_text(draw, text, font, max_width=max_w)
+    tb = draw.multiline_textbbox((0, 0), "\n".join(lines), font=font, spacing=spacing, align="right", stroke_width=stroke)
+    layout = (lines, tb[2] - tb[0], tb[3] - tb[1])
+    with _OVERLAY_LAYOUTS_LOCK:
+        _OVERLAY_LAYOUTS[key] = layout
+        _OVERLAY_LAYOUTS.move_to_end(key)
+        while len(_OVERLAY_LAYOUTS) > OVERLAY_LAYOUT_CACHE_MAX:
+            _OVERLAY_LAYOUTS.popitem(last=False)
+    return layout
+
+
 def _apply_mod_name_overlay(img: Image.Image, mod_name: str) -> Image.Image:
     out = img.convert("RGBA")
     draw = ImageDraw.Draw(out, "RGBA")
@@ -379,23 +488,17 @@ def _apply_mod_name_overlay(img: Image.Image, mod_name: str) -> Image.Image:
     lines: list[str] = [text]
     font: ImageFont.ImageFont = ImageFont.load_default()
     min_size = max(8, w // 40)
+    # Largest size whose wrapped text fits the box, scanned top-down. Wrap points move with the size,
+    # so the fit test is not monotonic and a bisection can settle well below the first fitting size.
+    fit: Optional[int] = None
     for size in range(max(14, w // 9), min_size - 1, -1):
-        trial_font = _load_overlay_font(size)
-        trial_lines = _wrap_text(draw, text, trial_font, max_width=max_w, max_lines=None, truncate_with_ellipsis=False)
-        tb = draw.multiline_textbbox(
-            (0, 0),
-            "\n".join(trial_lines),
-            font=trial_font,
-            spacing=line_spacing,
-            align="right",
-            stroke_width=stroke,
-        )
-        tw = tb[2] - tb[0]
-        th = tb[3] - tb[1]
+        trial_lines, tw, th = _overlay_layout(draw, text, size, max_w, line_spacing, stroke)
         if tw <= max_w and th <= max_h:
+            fit = size
             lines = trial_lines
-            font = trial_font
             break
+    if fit is not None:
+        font = _load_overlay_font(fit)
     else:
         # Last-resort fallback: clamp to a reasonable line count and ellipsize.
         fallback_font = _load_overlay_font(min_size)
@@ -431,13 +534,312 @@ def render_workshop_square_image(source: Path, out_size: int, mod_name: str, add
     return img
 
 
-def _save_hr_cover(source: Path, target: Path, max_size: int = 2048) -> None:
+def load_cover_image(source: Path, max_side: int = COVER_WORKING_MAX_SIDE, min_side: int = COVER_WORKING_MIN_SIDE) -> Image.Image:
+    # RGBA working copy of a cover, shrunk once so its long side is at most max_side (the HR export,
+    # our largest output) while the short side stays >= min_side for the template crops. JPEGs are
+    # DCT-scaled during decode (draft) so huge scans never get decoded at full size.
     with Image.open(source) as im:
+        w, h = im.size
+        scale = min(1.0, max(max_side / max(1, max(w, h)), min_side / max(1, min(w, h))))
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        if scale < 1.0 and im.format == "JPEG":
+            im.draft("RGB", size)
         src = im.convert("RGBA")
-        side = min(max_size, max(src.width, src.height))
-        out = _cover_letterbox(src, side, side)
+    if src.size != size:
+        src = src.resize(size, Image.LANCZOS)
+    return src
+
+
+def _decode_cover_preview(im: Image.Image) -> Image.Image:
+    # Reduced RGBA decode for hashes and thumbnails; JPEGs are DCT-scaled instead of fully decoded.
+    if im.format == "JPEG":
+        im.draft("RGB", (COVER_THUMB_SIZE, COVER_THUMB_SIZE))
+    return im.convert("RGBA")
+
+
+def _cover_dhash(img: Image.Image) -> int:
+    # 64-bit difference hash: the cover is box-filtered to a 9x8 grey grid and each bit records whether
+    # a cell is brighter than its right neighbour. Re-encodes, rescales and recompression barely move
+    # the bits, so look-alike covers land within a few bits of each other.
+    side = COVER_HASH_SIZE
+    small = img.resize((side + 1, side), Image.BOX)
+    # Transparent areas hash as mid grey whatever colour they carry underneath.
+    grey = Image.alpha_composite(Image.new("RGBA", small.size, (128, 128, 128, 255)), small).convert("L")
+    if np is not None:
+        cells = np.asarray(grey, dtype=np.int16)
+        return int.from_bytes(np.packbits(cells[:, 1:] > cells[:, :-1]).tobytes(), "big")
+    px = list(grey.getdata())
+    value = 0
+    for y in range(side):
+        for x in range(side):
+            value = (value << 1) | int(px[y * (side + 1) + x + 1] > px[y * (side + 1) + x])
+    return value
+
+
+def cover_phash(source: Path) -> Optional[int]:
+    try:
+        with Image.open(source) as im:
+            return _cover_dhash(_decode_cover_preview(im))
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+def cover_hash_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class CoverRecord:
+    # What the cover index knows about one image file, valid while its size and mtime match.
+    path: Path
+    size: int
+    mtime_ns: int
+    sha1: str
+    width: int
+    height: int
+    phash: Optional[int]
+    thumb: Optional[Path]
+
+
+class CoverIndex:
+    # Persistent facts about cover images (file hash, dimensions, perceptual hash, small thumbnail)
+    # keyed by path and file signature. Covers are indexed when assigned in the UI, so build planning,
+    # texture dedup and preview tiles answer from here instead of opening the images again.
+    def __init__(self, root: Optional[Path] = None):
+        self._root = root
+        self._records: Optional[dict[str, dict]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> Path:
+        return self._root or (app_root() / COVER_INDEX_FOLDER_NAME)
+
+    def _load(self) -> dict[str, dict]:
+        if self._records is None:
+            records: dict[str, dict] = {}
+            try:
+                raw = json.loads((self.root / "index.json").read_text(encoding="utf-8"))
+                if isinstance(raw, dict) and raw.get("version") == COVER_INDEX_VERSION and isinstance(raw.get("covers"), dict):
+                    records = raw["covers"]
+            except Exception:
+                pass
+            self._records = records
+        return self._records
+
+    def _to_record(self, path: Path, rec: dict) -> CoverRecord:
+        return CoverRecord(
+            path=path,
+            size=int(rec["sig"][0]),
+            mtime_ns=int(rec["sig"][1]),
+            sha1=str(rec.get("sha1") or ""),
+            width=int(rec.get("width") or 0),
+            height=int(rec.get("height") or 0),
+            phash=int(rec["phash"], 16) if rec.get("phash") else None,
+            thumb=self.root / "thumbs" / rec["thumb"] if rec.get("thumb") else None,
+        )
+
+    def cached(self, path: Path) -> Optional[CoverRecord]:
+        # Index lookup only: None when the file is unknown or has changed since it was indexed.
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        with self._lock:
+            rec = self._load().get(os.path.normcase(str(path)))
+        if not isinstance(rec, dict) or rec.get("sig") != [st.st_size, st.st_mtime_ns]:
+            return None
+        return self._to_record(path, rec)
+
+    def record(self, path: Path) -> Optional[CoverRecord]:
+        found = self.cached(path)
+        if found is not None:
+            return found
+        try:
+            st = path.stat()
+            data = path.read_bytes()
+            with Image.open(io.BytesIO(data)) as im:
+                width, height = im.size
+                img = _decode_cover_preview(im)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return None
+        sha1 = hashlib.sha1(data).hexdigest()
+        thumb_name = f"{sha1}.png"
+        thumb_path = self.root / "thumbs" / thumb_name
+        if not thumb_path.is_file():
+            thumb = img.copy()
+            thumb.thumbnail((COVER_THUMB_SIZE, COVER_THUMB_SIZE), Image.LANCZOS)
+            tmp = thumb_path.with_name(f"{thumb_name}.{os.getpid()}.tmp")
+            try:
+                thumb_path.parent.mkdir(parents=True, exist_ok=True)
+                thumb.save(tmp, format="PNG")
+                os.replace(tmp, thumb_path)
+            except Exception:
+                thumb_name = ""
+                try:
+                    tmp.unlink()
+                except Exception:
+                    pass
+        phash = _cover_dhash(img)
+        rec = {
+            "sig": [st.st_size, st.st_mtime_ns],
+            "sha1": sha1,
+            "width": width,
+            "height": height,
+            "phash": f"{phash:016x}",
+            "thumb": thumb_name,
+        }
+        with self._lock:
+            self._load()[os.path.normcase(str(path))] = rec
+            self._dirty = True
+        return self._to_record(path, rec)
+
+    def phash(self, path: Path) -> Optional[int]:
+        rec = self.record(path)
+        return rec.phash if rec is not None else None
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty or self._records is None:
+                return
+            payload = json.dumps({"version": COVER_INDEX_VERSION, "covers": self._records}, separators=(",", ":"))
+            self._dirty = False
+        path = self.root / "index.json"
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                tmp.unlink()
+            except Exception:
+                pass
+
+    def similar_groups(self, paths: Iterable[Path], max_distance: int = COVER_SIMILAR_MAX_DISTANCE) -> list[list[Path]]:
+        # Groups of distinct cover files within max_distance bits of each other, each in first-seen order.
+        unique: dict[str, Path] = {}
+        for path in paths:
+            if path:
+                unique.setdefault(os.path.normcase(str(path)), Path(path))
+        hashed = [(path, h) for path in unique.values() if (h := self.phash(path)) is not None]
+        self.save()
+        parent = list(range(len(hashed)))
+
+        def root(i: int) -> int:
+            while parent[i] != i:
+                i = parent[i]
+            return i
+
+        for i, (_, ha) in enumerate(hashed):
+            for j in range(i + 1, len(hashed)):
+                if cover_hash_distance(ha, hashed[j][1]) <= max_distance:
+                    ri, rj = root(i), root(j)
+                    if ri != rj:
+                        parent[max(ri, rj)] = min(ri, rj)
+        groups: dict[int, list[Path]] = {}
+        for i, (path, _) in enumerate(hashed):
+            groups.setdefault(root(i), []).append(path)
+        return [group for group in groups.values() if len(group) > 1]
+
+
+COVER_INDEX = CoverIndex()
+
+
+def plan_cover_aliases(covers: Iterable[Path], collapse: bool = False) -> dict[Path, Path]:
+    # Reports look-alike covers and, when collapsing, maps each one onto the first of its group so
+    # those songs share one texture set instead of shipping near-identical copies.
+    aliases: dict[Path, Path] = {}
+    for group in COVER_INDEX.similar_groups(covers):
+        names = ", ".join(p.name for p in group)
+        if collapse:
+            _safe_console_print(f"Look-alike covers share {group[0].name}'s textures: {names}")
+            aliases.update((p, group[0]) for p in group[1:])
+        else:
+            _safe_console_print(f"WARN: Look-alike covers (enable collapse_similar_covers to share textures): {names}")
+    return aliases
+
+
+def _parse_png_profile(value: str, default: str = "default") -> str:
+    raw = (value or "").strip().lower()
+    return raw if raw in PNG_PROFILES else default
+
+
+def _png_palette_lossless(img: Image.Image) -> Optional[Image.Image]:
+    # Exact RGBA palette for small icons with at most 256 distinct colours; None when that is not lossless.
+    if max(img.size) > PNG_PALETTE_MAX_SIDE:
+        return None
+    rgba = img.convert("RGBA")
+    colors = rgba.getcolors(256)
+    if colors is None:
+        return None
+    palette = [color for _, color in colors]
+    index = {color: i for i, color in enumerate(palette)}
+    pal = Image.new("P", rgba.size)
+    pal.putdata([index[px] for px in rgba.getdata()])
+    pal.putpalette([v for color in palette for v in color], rawmode="RGBA")
+    pal.info.update({k: v for k, v in img.info.items() if k != "transparency"})
+    if pal.convert("RGBA").tobytes() != rgba.tobytes():
+        return None
+    return pal
+
+
+def _encode_png(img: Image.Image, **params) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", **params)
+    return buf.getvalue()
+
+
+def save_png(img: Image.Image, target: Path, profile: str = "default") -> tuple[int, int]:
+    # Encode with a PNG profile and return (bytes written, bytes the default encoder would have
+    # written). The baseline is only measured for release, where it is cheap next to optimize=True.
+    if profile == "draft":
+        data = _encode_png(img, compress_level=1)
+        baseline = 0
+    elif profile == "release":
+        baseline = len(_encode_png(img))
+        data = _encode_png(img, optimize=True)
+        pal = _png_palette_lossless(img)
+        if pal is not None:
+            pal_data = _encode_png(pal, optimize=True)
+            if len(pal_data) < len(data):
+                data = pal_data
+    else:
+        data = _encode_png(img)
+        baseline = len(data)
+    target.write_bytes(data)
+    return len(data), baseline
+
+
+def resolve_hr_policy(value: str, png_profile: str = "default") -> str:
+    # "auto" ships HR covers, except in draft builds, which skip them to keep iteration fast.
+    raw = str(value or "").strip().lower()
+    if raw not in HR_TEXTURE_POLICIES or raw == "auto":
+        return "off" if png_profile == "draft" else "ship"
+    return raw
+
+
+def _hr_max_size(policy: str, size=HR_DOWNSAMPLE_SIZE) -> int:
+    if policy != "downsample":
+        return HR_MAX_SIDE
+    try:
+        return max(64, min(HR_MAX_SIDE, int(size)))
+    except (TypeError, ValueError):
+        return HR_DOWNSAMPLE_SIZE
+
+
+def _save_hr_cover(
+    source: Path,
+    target: Path,
+    max_size: int = HR_MAX_SIDE,
+    image: Optional[Image.Image] = None,
+    png_profile: str = "default",
+) -> tuple[int, int]:
+    src = image if image is not None else load_cover_image(source, max_side=max_size)
+    side = min(max_size, max(src.width, src.height))
+    out = _cover_letterbox(src, side, side)
     target.parent.mkdir(parents=True, exist_ok=True)
-    out.save(target, format="PNG")
+    return save_png(out, target, png_profile)
 
 
 def write_workshop_images(
@@ -445,6 +847,7 @@ def write_workshop_images(
     selected_cover: Optional[Path],
     mod_name: str,
     add_name_overlay: bool = True,
+    hr_max_size: int = HR_MAX_SIDE,
 ) -> None:
     poster_root = default_poster_root()
     default_icon = poster_root / "icon.png"
@@ -477,10 +880,11 @@ def write_workshop_images(
     # Write both name variants to match existing mixed usage in your workshop folders.
     preview_img.save(paths["root"] / "Preview.png", format="PNG")
     preview_img.save(paths["root"] / "preview.png", format="PNG")
-    _save_hr_cover(poster_src, paths["hr"] / "Poster.png")
+    if "hr" in paths:
+        _save_hr_cover(poster_src, paths["hr"] / "Poster.png", max_size=hr_max_size)
 
 
-def build_mod_layout(out_dir: Path, mod_id: str) -> dict[str, Path]:
+def build_mod_layout(out_dir: Path, mod_id: str, hr_policy: str = "ship") -> dict[str, Path]:
     root = out_dir / mod_id
     mod_base = root / "Contents" / "mods" / mod_id
     v42 = mod_base / "42"
@@ -500,11 +904,26 @@ def build_mod_layout(out_dir: Path, mod_id: str) -> dict[str, Path]:
         "wtextures": ensure(media / "textures" / "WorldItems"),
         "lua_shared": ensure(media / "lua" / "shared"),
         "lua_server_items": ensure(media / "lua" / "server" / "Items"),
-        "hr": ensure(media / "textures" / "HR"),
     }
+    if hr_policy in ("ship", "downsample"):
+        paths["hr"] = ensure(media / "textures" / "HR")
+    else:
+        # HR covers stay out of the uploaded pack; drop any a previous shipping build left behind.
+        shutil.rmtree(media / "textures" / "HR", ignore_errors=True)
+        if hr_policy == "side":
+            paths["hr"] = ensure(out_dir / f"{mod_id}{HR_SIDE_FOLDER_SUFFIX}")
     return paths
 
 
+def _report_hr_policy(paths: dict[str, Path], hr_policy: str, hr_size: int) -> None:
+    if hr_policy == "downsample":
+        _safe_console_print(f"HR covers: shipped at up to {hr_size} px")
+    elif hr_policy == "side":
+        _safe_console_print(f"HR covers: written outside the pack to {paths['hr']}")
+    elif hr_policy == "off":
+        _safe_console_print("HR covers: skipped")
+
+
 def write_mod_info(
     mod_base: Path,
     v42: Path,
@@ -783,6 +1202,163 @@ def _copy_ogg_with_mix_meta(src_ogg: Path, dst_ogg: Path) -> None:
             pass
 
 
+def _file_sha1(path: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def is_mix_recipe(path: Path) -> bool:
+    return path.name.lower().endswith(MIX_RECIPE_SUFFIX)
+
+
+def mix_recipe_path(src_root: Path, stem: str) -> Path:
+    return src_root / f"{stem}{MIX_RECIPE_SUFFIX}"
+
+
+def mix_recipe_stem(recipe_path: Path) -> str:
+    return recipe_path.name[: -len(MIX_RECIPE_SUFFIX)]
+
+
+def _mix_recipe_source_record(path: Path, previous: Optional[dict] = None) -> dict:
+    st = path.stat()
+    # Content hashes are only recomputed when size/mtime moved, so re-checking a recipe is cheap.
+    if (
+        previous
+        and previous.get("sha1")
+        and previous.get("size") == st.st_size
+        and previous.get("mtime_ns") == st.st_mtime_ns
+    ):
+        digest = str(previous["sha1"])
+    else:
+        digest = _file_sha1(path)
+    return {"path": str(path), "sha1": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _mix_recipe_hash(sources: list[dict]) -> str:
+    # Render settings are part of the key so a future encoder change never reuses old renders.
+    settings = f"{MIX_RENDER_SAMPLE_RATE}:{MIX_RENDER_CHANNELS}:vorbis-q{MIX_RENDER_VORBIS_QUALITY}"
+    h = hashlib.sha1(f"smbmix:v{MIX_RECIPE_VERSION}:{settings}".encode("ascii"))
+    for rec in sources:
+        h.update(str(rec.get("sha1", "")).encode("ascii"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def write_mix_recipe(recipe_path: Path, source_files: list[Path], previous: Optional[dict] = None) -> dict:
+    prev_sources = list((previous or {}).get("sources") or [])
+    records: list[dict] = []
+    for idx, src in enumerate(source_files):
+        prev = prev_sources[idx] if idx < len(prev_sources) else None
+        if prev and Path(str(prev.get("path", ""))) != src:
+            prev = None
+        records.append(_mix_recipe_source_record(src, prev))
+    payload = {
+        "type": "mixrecipe",
+        "version": MIX_RECIPE_VERSION,
+        "name": mix_recipe_stem(recipe_path),
+        "hash": _mix_recipe_hash(records),
+        "sources": records,
+        "tracks": [display_name_from_file(src) for src in source_files],
+    }
+    recipe_path.parent.mkdir(parents=True, exist_ok=True)
+    recipe_path.write_text(json.dumps(payload, ensure_ascii=True, indent=2), encoding="utf-8")
+    return payload
+
+
+def read_mix_recipe(recipe_path: Path) -> Optional[dict]:
+    try:
+        raw = json.loads(recipe_path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(raw, dict) or raw.get("type") != "mixrecipe":
+        return None
+    if not isinstance(raw.get("sources"), list) or not raw.get("hash"):
+        return None
+    return raw
+
+
+def mix_recipe_render_path(recipe_path: Path, cache_root: Path, recipe: Optional[dict] = None) -> Path:
+    data = recipe if recipe is not None else read_mix_recipe(recipe_path)
+    digest = str((data or {}).get("hash") or "unknown")
+    return cache_root / MIX_RENDER_FOLDER_NAME / digest / f"{mix_recipe_stem(recipe_path)}.ogg"
+
+
+def prune_mix_renders(cache_root: Path, live_hashes: Iterable[str]) -> int:
+    # Edited sources and deleted recipes leave their render folders behind; drop every folder no live
+    # recipe hash points at. Fresh folders are kept, since a build may be rendering into one right now.
+    live = set(live_hashes)
+    cutoff = time.time() - MIX_RENDER_PRUNE_GRACE
+    removed = 0
+    try:
+        it = os.scandir(cache_root / MIX_RENDER_FOLDER_NAME)
+    except OSError:
+        return 0
+    with it:
+        for entry in it:
+            if entry.name in live:
+                continue
+            try:
+                if not entry.is_dir() or entry.stat().st_mtime > cutoff:
+                    continue
+            except OSError:
+                continue
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def render_mix_recipe(recipe_path: Path, audio_dir: Path) -> Path:
+    recipe = read_mix_recipe(recipe_path)
+    if recipe is None:
+        raise SystemExit(f"Invalid mix recipe: {recipe_path}")
+    source_files: list[Path] = []
+    for rec in recipe["sources"]:
+        p = Path(str(rec.get("path", "")))
+        if not p.exists() or not p.is_file():
+            raise SystemExit(f"Mix source file not found: {p}")
+        source_files.append(p)
+    if not source_files:
+        raise SystemExit(f"Mix recipe has no source files: {recipe_path.name}")
+
+    # Re-validate against the files on disk; an edited source yields a new recipe hash.
+    refreshed = [
+        _mix_recipe_source_record(p, rec) for p, rec in zip(source_files, recipe["sources"])
+    ]
+    if _mix_recipe_hash(refreshed) != recipe.get("hash") or refreshed != recipe["sources"]:
+        recipe = write_mix_recipe(recipe_path, source_files, previous=recipe)
+
+    cache_root = ensure(audio_cache_root(Path(audio_dir).resolve()))
+    target = mix_recipe_render_path(recipe_path, cache_root, recipe)
+    if target.exists() and target.is_file():
+        return target
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    # Same recipe hash under a different mix name: reuse the rendered audio instead of re-encoding.
+    twin = next((p for p in sorted(target.parent.glob("*.ogg")) if p.name != target.name), None)
+    if twin is not None:
+        try:
+            os.link(twin, target)
+        except OSError:
+            shutil.copy2(twin, target)
+    else:
+        partial = target.with_name(f".{target.stem}.rendering.ogg")
+        try:
+            _render_mix_audio(source_files, partial)
+            os.replace(partial, target)
+        finally:
+            if partial.exists():
+                try:
+                    partial.unlink()
+                except Exception:
+                    pass
+    _write_mix_metadata(target, source_files)
+    STAT_CACHE.invalidate([target, _mix_meta_path(target)])
+    return target
+
+
 def audio_source_root(audio_dir: Path) -> Path:
     if audio_dir.name in (AUDIO_CACHE_FOLDER_NAME, LEGACY_AUDIO_CACHE_FOLDER_NAME):
         return audio_dir
@@ -805,16 +1381,297 @@ def ensure_audio_workspace(audio_dir: Path) -> tuple[Path, Path]:
     return src_root, cache_root
 
 
-def _collect_audio_sources(src_root: Path) -> list[Path]:
-    if not src_root.exists():
+def _scan_dir_entries(root: Path) -> tuple[dict[str, FileStat], list[str]]:
+    # One scandir pass; DirEntry caches type info so we only pay a single stat per file.
+    files: dict[str, FileStat] = {}
+    dirs: list[str] = []
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return files, dirs
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    dirs.append(entry.name)
+                    continue
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            files[entry.name] = FileStat(path=Path(entry.path), size=st.st_size, mtime_ns=st.st_mtime_ns)
+    return files, dirs
+
+
+def scan_dir_files(root: Path) -> dict[str, FileStat]:
+    return _scan_dir_entries(root)[0]
+
+
+def _scan_recursive_default() -> bool:
+    return os.environ.get("SMB_SCAN_RECURSIVE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def load_scan_ignore_patterns(root: Path) -> list[str]:
+    try:
+        lines = (root / SCAN_IGNORE_FILENAME).read_text(encoding="utf-8").splitlines()
+    except Exception:
         return []
-    return sorted(
-        [
-            p
-            for p in src_root.iterdir()
-            if p.is_file() and p.suffix.lower() in AUDIO_SOURCE_EXTENSIONS
-        ]
-    )
+    patterns: list[str] = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            patterns.append(line.rstrip("/"))
+    return patterns
+
+
+def _scan_ignored(rel: str, name: str, patterns: list[str]) -> bool:
+    return any(fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(name, pat) for pat in patterns)
+
+
+def _scan_listing(
+    root: Path,
+    rel_dir: str,
+    dir_cache: Optional[dict],
+    dir_cache_out: Optional[dict],
+) -> tuple[dict[str, FileStat], list[str]]:
+    path = root / rel_dir if rel_dir else root
+    if not rel_dir or dir_cache_out is None:
+        return _scan_dir_entries(path)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}, []
+    cached = (dir_cache or {}).get(rel_dir)
+    # Nested folders whose mtime did not move are not listed again; the root is always rescanned.
+    # Editing a file in place leaves its folder's mtime alone, so the known files are still stat'ed.
+    if isinstance(cached, dict) and cached.get("mtime_ns") == mtime_ns:
+        files = {}
+        for name in cached.get("files") or {}:
+            try:
+                st = os.stat(path / name)
+            except OSError:
+                continue
+            files[name] = FileStat(path=path / name, size=st.st_size, mtime_ns=st.st_mtime_ns)
+        dirs = list(cached.get("dirs") or [])
+    else:
+        files, dirs = _scan_dir_entries(path)
+    dir_cache_out[rel_dir] = {
+        "mtime_ns": mtime_ns,
+        "files": {name: [st.size, st.mtime_ns] for name, st in files.items()},
+        "dirs": dirs,
+    }
+    return files, dirs
+
+
+def iter_library_files(
+    root: Path,
+    recursive: Optional[bool] = None,
+    ignore_patterns: Optional[list[str]] = None,
+    exclude_dirs: tuple[Path, ...] = (),
+    dir_cache: Optional[dict] = None,
+    dir_cache_out: Optional[dict] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[FileStat]:
+    recursive = _scan_recursive_default() if recursive is None else recursive
+    patterns = load_scan_ignore_patterns(root) if ignore_patterns is None else list(ignore_patterns)
+    excluded = {os.path.normcase(os.path.abspath(p)) for p in exclude_dirs}
+    workers = max_workers or min(8, (os.cpu_count() or 2) * 2)
+    pool: Optional[ThreadPoolExecutor] = None
+    level = [""]
+    try:
+        while level:
+            # Walk breadth-first; sibling folders of one level are listed concurrently.
+            if len(level) > 1 and workers > 1:
+                if pool is None:
+                    pool = ThreadPoolExecutor(max_workers=workers)
+                listings = pool.map(lambda d: _scan_listing(root, d, dir_cache, dir_cache_out), level)
+            else:
+                listings = (_scan_listing(root, d, dir_cache, dir_cache_out) for d in level)
+            next_level: list[str] = []
+            for rel_dir, (files, dirs) in zip(level, listings):
+                for name in sorted(files):
+                    rel = f"{rel_dir}/{name}" if rel_dir else name
+                    if name == SCAN_IGNORE_FILENAME or (patterns and _scan_ignored(rel, name, patterns)):
+                        continue
+                    yield files[name]
+                if not recursive:
+                    continue
+                for name in sorted(dirs):
+                    rel = f"{rel_dir}/{name}" if rel_dir else name
+                    if name.startswith(".") or (patterns and _scan_ignored(rel, name, patterns)):
+                        continue
+                    if excluded and os.path.normcase(os.path.abspath(root / rel)) in excluded:
+                        continue
+                    next_level.append(rel)
+            level = next_level
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def library_song_key(src_root: Path, path: Path) -> str:
+    # The song's cache .ogg name. Top-level sources keep their bare stem; nested ones fold their
+    # folders into it, so ArtistA/01 Intro.mp3 and ArtistB/01 Intro.mp3 stay two different songs.
+    if is_mix_recipe(path):
+        return f"{mix_recipe_stem(path)}.ogg"
+    try:
+        folders = path.relative_to(src_root).parts[:-1]
+    except ValueError:
+        try:
+            folders = path.resolve().relative_to(src_root.resolve()).parts[:-1]
+        except (OSError, ValueError):
+            folders = ()
+    return " - ".join([*folders, path.stem]) + ".ogg"
+
+
+def iter_audio_sources(src_root: Path, recursive: Optional[bool] = None, **kwargs) -> Iterator[FileStat]:
+    for st in iter_library_files(src_root, recursive=recursive, **kwargs):
+        if st.path.suffix.lower() in AUDIO_SOURCE_EXTENSIONS:
+            yield st
+
+
+def iter_audio_source_pages(
+    src_root: Path,
+    page_size: int = SCAN_DEFAULT_PAGE_SIZE,
+    recursive: Optional[bool] = None,
+    **kwargs,
+) -> Iterator[list[FileStat]]:
+    page: list[FileStat] = []
+    for st in iter_audio_sources(src_root, recursive=recursive, **kwargs):
+        page.append(st)
+        if len(page) >= max(1, page_size):
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def _library_exclude_dirs(src_root: Path, cache_root: Path) -> tuple[Path, ...]:
+    # A separate cache folder nested inside the source root must not be listed as sources.
+    if cache_root.resolve() == src_root.resolve():
+        return ()
+    return (cache_root,)
+
+
+class StatCache:
+    # Short-lived, process-wide answers to exists/is_file/stat. Catalog scans and the watcher keep it fed,
+    # writers invalidate what they touch, and anything older than the TTL is stat'ed again.
+    def __init__(self, ttl: float = STAT_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._paths: dict[str, tuple[float, Optional[FileStat], bool]] = {}
+        self._listings: dict[str, tuple[float, set[str]]] = {}
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _lookup(self, path: Path) -> tuple[Optional[FileStat], bool]:
+        key = self._key(path)
+        now = time.monotonic()
+        with self._lock:
+            hit = self._paths.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1], hit[2]
+            listing = self._listings.get(os.path.dirname(key))
+            if listing is not None and listing[0] > now and os.path.basename(key) not in listing[1]:
+                return None, False
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            info: tuple[Optional[FileStat], bool] = (None, False)
+        else:
+            is_dir = (st.st_mode & 0o170000) == 0o040000
+            info = (None if is_dir else FileStat(path=Path(path), size=st.st_size, mtime_ns=st.st_mtime_ns), is_dir)
+        with self._lock:
+            self._paths[key] = (now + self.ttl, info[0], info[1])
+        return info
+
+    def stat(self, path: Path) -> Optional[FileStat]:
+        return self._lookup(path)[0]
+
+    def exists(self, path: Path) -> bool:
+        st, is_dir = self._lookup(path)
+        return st is not None or is_dir
+
+    def is_file(self, path: Path) -> bool:
+        return self._lookup(path)[0] is not None
+
+    def prime(self, stats: Iterable[FileStat]) -> None:
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for st in stats:
+                self._paths[self._key(st.path)] = (expires, st, False)
+
+    def prime_listing(self, folder: Path, stats: Iterable[FileStat]) -> None:
+        # A complete listing also answers "missing" for every other name in the folder.
+        stats = list(stats)
+        self.prime(stats)
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            self._listings[self._key(folder)] = (expires, {os.path.normcase(st.path.name) for st in stats})
+
+    def invalidate(self, paths: Optional[Iterable[Path]] = None) -> None:
+        with self._lock:
+            if paths is None:
+                self._paths.clear()
+                self._listings.clear()
+                return
+            for path in paths:
+                key = self._key(path)
+                self._paths.pop(key, None)
+                self._listings.pop(os.path.dirname(key), None)
+
+
+STAT_CACHE = StatCache()
+
+
+_CATALOG_SNAPSHOTS: dict[str, dict] = {}
+
+
+def _catalog_snapshot_path(cache_root: Path) -> Path:
+    return cache_root / CATALOG_SNAPSHOT_FILENAME
+
+
+def _load_catalog_snapshot(cache_root: Path, src_root: Path) -> dict:
+    key = str(cache_root)
+    snap = _CATALOG_SNAPSHOTS.get(key)
+    if snap is None:
+        snap = {}
+        try:
+            raw = json.loads(_catalog_snapshot_path(cache_root).read_text(encoding="utf-8"))
+            if isinstance(raw, dict) and raw.get("version") == CATALOG_SNAPSHOT_VERSION:
+                snap = raw
+        except Exception:
+            pass
+        _CATALOG_SNAPSHOTS[key] = snap
+    if snap.get("src_root") != str(src_root):
+        snap.clear()
+        snap.update({"version": CATALOG_SNAPSHOT_VERSION, "src_root": str(src_root), "entries": {}, "recipes": {}})
+    return snap
+
+
+def _save_catalog_snapshot(cache_root: Path, snap: dict) -> None:
+    path = _catalog_snapshot_path(cache_root)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps(snap, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            tmp.unlink()
+        except Exception:
+            pass
+
+
+def invalidate_catalog_snapshot(audio_dir: Path) -> None:
+    cache_root = audio_cache_root(audio_dir)
+    _CATALOG_SNAPSHOTS.pop(str(cache_root), None)
+    try:
+        _catalog_snapshot_path(cache_root).unlink()
+    except Exception:
+        pass
 
 
 def _locate_ffmpeg() -> Optional[str]:
@@ -951,15 +1808,17 @@ def _create_mix_with_soundfile(source_files: list[Path], out_path: Path) -> None
     with sf.SoundFile(
         str(out_path),
         mode="w",
-        samplerate=44100,
-        channels=2,
+        samplerate=MIX_RENDER_SAMPLE_RATE,
+        channels=MIX_RENDER_CHANNELS,
         format="OGG",
         subtype="VORBIS",
+        # libsndfile's Vorbis quality is 1 - compression_level, on a 0-1 scale.
+        compression_level=1.0 - MIX_RENDER_VORBIS_QUALITY / 10.0,
     ) as out_sf:
         _audio_trace(f"soundfile mix start: out={out_path} sources={len(source_files)}")
         for src in source_files:
             _audio_trace(f"decode start: {src}")
-            pcm, _ = _decode_to_pcm16(src, target_rate=44100, target_channels=2)
+            pcm, _ = _decode_to_pcm16(src, target_rate=MIX_RENDER_SAMPLE_RATE, target_channels=MIX_RENDER_CHANNELS)
             if pcm.shape[0] == 0:
                 _audio_trace(f"skip empty: {src}")
                 continue
@@ -1000,85 +1859,822 @@ def _candidate_binary_paths(binary_name: str) -> list[Path]:
     return out
 
 
-def refresh_song_catalog(audio_dir: Path) -> list[AudioTrackEntry]:
-    src_root, cache_root = ensure_audio_workspace(audio_dir)
-    raw_entries: list[AudioTrackEntry] = []
-
-    sources = _collect_audio_sources(src_root)
-    seen_oggs: set[Path] = set()
-
-    for src in sources:
-        target = cache_root / f"{src.stem}.ogg"
-        src_is_ogg = src.suffix.lower() == ".ogg"
-        seen_oggs.add(target.resolve())
-        if not target.exists():
-            if src_is_ogg:
-                status = "ready"
-                detail = "source ogg"
-                target = src
-                seen_oggs.add(src.resolve())
+def _evaluate_catalog_source(src: FileStat, target: Optional[FileStat]) -> tuple[str, str]:
+    if target is None:
+        if src.path.suffix.lower() == ".ogg":
+            return "ready", "source ogg"
+        return "needs convert", "not converted"
+    if target.mtime_ns >= src.mtime_ns:
+        return "ready", "up-to-date"
+    return "stale", "source newer"
+
+
+CATALOG_STATUS_RANK = {"ready": 3, "stale": 2, "mix recipe": 2, "needs convert": 1}
+
+
+class Catalog:
+    # One scan of an audio workspace, indexed for O(1) lookups and shared by the UI and builds.
+    def __init__(self, audio_dir: Path):
+        self.audio_dir = Path(audio_dir)
+        self.src_root, self.cache_root = ensure_audio_workspace(self.audio_dir)
+        self.same_root = self.src_root.resolve() == self.cache_root.resolve()
+        self.entries: list[AudioTrackEntry] = []
+        self.by_ogg_name: dict[str, AudioTrackEntry] = {}
+        self.by_source: dict[Path, AudioTrackEntry] = {}
+        self.by_hash: dict[str, list[AudioTrackEntry]] = {}
+        self.by_status: dict[str, list[AudioTrackEntry]] = {}
+        self.by_duplicate: dict[str, list[AudioTrackEntry]] = {}
+        self.generation = 0
+        self._by_key: dict[str, tuple[tuple, AudioTrackEntry]] = {}
+        self._src_files: dict[str, FileStat] = {}
+        self._cache_files: dict[str, FileStat] = {}
+        self._key_sources: dict[str, set[str]] = {}
+        self._recipe_hashes: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[AudioTrackEntry]:
+        return iter(self.entries)
+
+    def __contains__(self, ogg_name: object) -> bool:
+        return ogg_name in self.by_ogg_name
+
+    def get(self, ogg_name: str) -> Optional[AudioTrackEntry]:
+        return self.by_ogg_name.get(ogg_name)
+
+    def with_status(self, status: str) -> list[AudioTrackEntry]:
+        return list(self.by_status.get(status, ()))
+
+    def with_hash(self, digest: str) -> list[AudioTrackEntry]:
+        return list(self.by_hash.get(digest, ()))
+
+    def duplicates_of(self, ogg_name: str) -> list[AudioTrackEntry]:
+        return list(self.by_duplicate.get(ogg_name, ()))
+
+    def available_oggs(self) -> dict[str, Path]:
+        # Converted cache wins; top-level source OGGs fill in when nothing was converted yet.
+        by_name = {name: st.path for name, st in self._cache_files.items() if st.path.suffix.lower() == ".ogg"}
+        for rel, st in self._src_files.items():
+            if "/" not in rel and st.path.suffix.lower() == ".ogg" and st.path.name not in by_name:
+                by_name[st.path.name] = st.path
+        return by_name
+
+    def cache_oggs(self) -> list[Path]:
+        return sorted(st.path for st in self._cache_files.values() if st.path.suffix.lower() == ".ogg")
+
+    def file_stats(self) -> dict[Path, FileStat]:
+        stats = {st.path: st for st in self._src_files.values()}
+        stats.update({st.path: st for st in self._cache_files.values()})
+        return stats
+
+    def refresh(self, changed_paths: Optional[Iterable[Path]] = None) -> "Catalog":
+        snap = _load_catalog_snapshot(self.cache_root, self.src_root)
+        if changed_paths is None or self.generation == 0:
+            keys = self._rescan(snap)
+            self._evaluate(snap, keys, full=True)
+        else:
+            keys = self._apply_changes(changed_paths)
+            if keys is None:
+                return self.refresh()
+            self._evaluate(snap, keys, full=False)
+        self.generation += 1
+        return self
+
+    def _rescan(self, snap: dict) -> set[str]:
+        prev_dirs: dict = snap.get("dirs") or {}
+        next_dirs: dict[str, dict] = {}
+        src_files: dict[str, FileStat] = {}
+        for st in iter_library_files(
+            self.src_root,
+            exclude_dirs=_library_exclude_dirs(self.src_root, self.cache_root),
+            dir_cache=prev_dirs,
+            dir_cache_out=next_dirs,
+        ):
+            src_files[st.path.relative_to(self.src_root).as_posix()] = st
+        if next_dirs != prev_dirs:
+            snap["dirs"] = next_dirs
+            snap["_dirty"] = True
+        self._src_files = src_files
+        if self.same_root:
+            self._cache_files = {name: st for name, st in src_files.items() if "/" not in name}
+            STAT_CACHE.prime(src_files.values())
+        else:
+            self._cache_files = scan_dir_files(self.cache_root)
+            STAT_CACHE.prime(src_files.values())
+            STAT_CACHE.prime_listing(self.cache_root, self._cache_files.values())
+        self._key_sources = {}
+        for rel, st in src_files.items():
+            key = self.song_key(st.path)
+            if key is not None:
+                self._key_sources.setdefault(key, set()).add(rel)
+        keys = set(self._key_sources)
+        keys.update(name for name in self._cache_files if name.lower().endswith(".ogg"))
+        return keys
+
+    def song_key(self, path: Path) -> Optional[str]:
+        if path.parent == self.cache_root and path.suffix.lower() == ".ogg":
+            return f"{path.stem}.ogg"
+        if is_mix_recipe(path) or path.suffix.lower() in AUDIO_SOURCE_EXTENSIONS:
+            return library_song_key(self.src_root, path)
+        return None
+
+    def _apply_changes(self, changed_paths: Iterable[Path]) -> Optional[set[str]]:
+        keys: set[str] = set()
+        changed_paths = [Path(p) for p in changed_paths]
+        STAT_CACHE.invalidate(changed_paths)
+        for path in changed_paths:
+            try:
+                st = os.stat(path)
+                present = True
+            except OSError:
+                present = False
+                st = None
+            if present and not os.path.isfile(path):
+                return None
+            stat = FileStat(path=path, size=st.st_size, mtime_ns=st.st_mtime_ns) if st is not None else None
+            handled = False
+            in_cache = path.parent == self.cache_root
+            if in_cache:
+                handled = True
+                if stat is not None:
+                    self._cache_files[path.name] = stat
+                else:
+                    self._cache_files.pop(path.name, None)
+            try:
+                rel = path.relative_to(self.src_root).as_posix()
+            except ValueError:
+                rel = None
+            if rel is not None and "/" in rel:
+                # Nested paths only count when they would have been picked up by a full scan.
+                if not _scan_recursive_default() or any(part.startswith(".") for part in rel.split("/")[:-1]):
+                    rel = None
+            if rel is not None and (self.same_root or not in_cache):
+                handled = True
+                key = self.song_key(path)
+                if stat is not None:
+                    self._src_files[rel] = stat
+                    if key is not None:
+                        self._key_sources.setdefault(key, set()).add(rel)
+                else:
+                    self._src_files.pop(rel, None)
+                    if key is not None and key in self._key_sources:
+                        self._key_sources[key].discard(rel)
+                        if not self._key_sources[key]:
+                            del self._key_sources[key]
+            if not handled:
+                continue
+            key = self.song_key(path)
+            if key is not None:
+                keys.add(key)
+        return keys
+
+    def _entry_for_key(
+        self, snap: dict, key: str, next_entries: dict, next_recipes: dict
+    ) -> Optional[tuple[tuple, AudioTrackEntry]]:
+        prev_entries: dict = snap.get("entries") or {}
+        prev_recipes: dict = snap.get("recipes") or {}
+        candidates: list[tuple[AudioTrackEntry, float]] = []
+        rels = sorted(self._key_sources.get(key, ()))
+        has_audio_source = False
+        for rel in rels:
+            src = self._src_files.get(rel)
+            if src is None or src.path.suffix.lower() not in AUDIO_SOURCE_EXTENSIONS or is_mix_recipe(src.path):
+                continue
+            has_audio_source = True
+            target = self._cache_files.get(key)
+            # Snapshot rows are keyed by the stat signature of both ends; anything unchanged is reused as-is.
+            sig = [src.size, src.mtime_ns, target.size if target else None, target.mtime_ns if target else None]
+            # Nested .ogg sources are copied into the cache under their folded name, never used in place.
+            in_place = src.path.suffix.lower() == ".ogg" and "/" not in rel
+            cached = prev_entries.get(rel)
+            if isinstance(cached, dict) and cached.get("sig") == sig:
+                status, detail = str(cached.get("status")), str(cached.get("detail"))
+            elif target is None and src.path.suffix.lower() == ".ogg" and not in_place:
+                status, detail = "needs convert", "not copied"
             else:
-                status = "needs convert"
-                detail = "not converted"
+                status, detail = _evaluate_catalog_source(src, target)
+            next_entries[rel] = {"sig": sig, "status": status, "detail": detail}
+            if target is not None:
+                ogg_path = target.path
+            elif in_place:
+                ogg_path = src.path
+            else:
+                ogg_path = self.cache_root / key
+            candidates.append((AudioTrackEntry(source=src.path, ogg=ogg_path, status=status, detail=detail), src.mtime))
+
+        # Mix recipes show up as songs keyed by their eventual .ogg name.
+        for rel in rels:
+            rst = self._src_files.get(rel)
+            if rst is None or not is_mix_recipe(rst.path):
+                continue
+            sig = [rst.size, rst.mtime_ns]
+            cached = prev_recipes.get(rel)
+            if isinstance(cached, dict) and cached.get("sig") == sig:
+                digest = cached.get("hash")
+            else:
+                recipe = read_mix_recipe(rst.path)
+                digest = recipe.get("hash") if recipe is not None else None
+            next_recipes[rel] = {"sig": sig, "hash": digest}
+            if not digest:
+                continue
+            rendered = mix_recipe_render_path(rst.path, self.cache_root, {"hash": digest})
+            if rendered.exists():
+                status, detail = "ready", "mix (rendered)"
+            else:
+                status, detail = "mix recipe", "renders at build"
+            entry = AudioTrackEntry(source=rst.path, ogg=rendered, status=status, detail=detail)
+            self._recipe_hashes[str(rst.path)] = str(digest)
+            candidates.append((entry, rst.mtime))
+
+        # Include cache-only OGGs (keeps CLI usable when users only drop OGG into Conversions).
+        cache_ogg = self._cache_files.get(key)
+        if cache_ogg is not None and not has_audio_source:
+            candidates.append(
+                (AudioTrackEntry(source=cache_ogg.path, ogg=cache_ogg.path, status="ready", detail="cache-only"), cache_ogg.mtime)
+            )
+
+        # Canonicalize duplicate logical song keys that resolve to the same .ogg filename.
+        # This can happen when users have same-stem files (e.g. song.mp3 + song.ogg).
+        # Prefer source .ogg rows first, then better status.
+        best: Optional[tuple[tuple, AudioTrackEntry]] = None
+        for entry, mtime in candidates:
+            score = (
+                1 if entry.source.suffix.lower() == ".ogg" else 0,
+                CATALOG_STATUS_RANK.get(entry.status, 0),
+                mtime,
+            )
+            if best is None or score > best[0]:
+                best = (score, entry)
+        return best
+
+    def _evaluate(self, snap: dict, keys: set[str], full: bool) -> None:
+        prev_entries: dict = snap.get("entries") or {}
+        prev_recipes: dict = snap.get("recipes") or {}
+        if full:
+            next_entries: dict[str, dict] = {}
+            next_recipes: dict[str, dict] = {}
+            self._by_key = {}
         else:
-            src_mtime = src.stat().st_mtime
-            dst_mtime = target.stat().st_mtime
-            if dst_mtime >= src_mtime:
-                status = "ready"
-                detail = "up-to-date"
+            live = set(self._src_files)
+            next_entries = {rel: rec for rel, rec in prev_entries.items() if rel in live}
+            next_recipes = {rel: rec for rel, rec in prev_recipes.items() if rel in live}
+        for key in sorted(keys):
+            best = self._entry_for_key(snap, key, next_entries, next_recipes)
+            if best is None:
+                self._by_key.pop(key, None)
             else:
-                status = "stale"
-                detail = "source newer"
-        raw_entries.append(AudioTrackEntry(source=src, ogg=target, status=status, detail=detail))
-
-    # Include cache-only OGGs (keeps CLI usable when users only drop OGG into Conversions).
-    for ogg in sorted([p for p in cache_root.iterdir() if p.is_file() and p.suffix.lower() == ".ogg"]):
-        resolved = ogg.resolve()
-        if resolved in seen_oggs:
+                self._by_key[key] = best
+        if snap.pop("_dirty", False) or next_entries != prev_entries or next_recipes != prev_recipes:
+            snap["entries"] = next_entries
+            snap["recipes"] = next_recipes
+            _save_catalog_snapshot(self.cache_root, snap)
+        if full:
+            prune_mix_renders(self.cache_root, (str(rec["hash"]) for rec in next_recipes.values() if rec.get("hash")))
+
+        # Different keys can still land on one .ogg name (e.g. Song.OGG sources); keep the best-scored row.
+        deduped: dict[str, tuple[tuple, AudioTrackEntry]] = {}
+        for key in sorted(self._by_key):
+            score, entry = self._by_key[key]
+            keep = deduped.get(entry.ogg.name)
+            if keep is None or score > keep[0]:
+                deduped[entry.ogg.name] = (score, entry)
+        # Hand out copies so duplicate flags never leak into the per-key cache.
+        entries = sorted((replace(entry) for _, entry in deduped.values()), key=lambda e: e.source.name.lower())
+        # Exact layer from stored hashes plus the re-rip links the last fingerprint pass saved; reading files
+        # and comparing fingerprints is left to background checks and conversion.
+        find_duplicate_songs(entries, self.cache_root, fingerprint_mode="off", stats=self.file_stats(), hash_files=False)
+        self._index(entries)
+
+    def _index(self, entries: list[AudioTrackEntry]) -> None:
+        self.entries = entries
+        self.by_ogg_name = {e.ogg.name: e for e in entries}
+        self.by_source = {e.source: e for e in entries}
+        self.by_status = {}
+        self.by_duplicate = {}
+        self.by_hash = {}
+        records = (_load_fingerprint_cache(self.cache_root).get("files") or {})
+        for entry in entries:
+            self.by_status.setdefault(entry.status, []).append(entry)
+            if entry.duplicate_of:
+                self.by_duplicate.setdefault(entry.duplicate_of, []).append(entry)
+            digest = self._recipe_hashes.get(str(entry.source))
+            if digest is None:
+                rec = records.get(str(entry.source))
+                digest = rec.get("sha1") if isinstance(rec, dict) else None
+            if digest:
+                self.by_hash.setdefault(digest, []).append(entry)
+
+
+def refresh_song_catalog(audio_dir: Path) -> list[AudioTrackEntry]:
+    return Catalog(audio_dir).refresh().entries
+
+
+_FINGERPRINT_CACHES: dict[str, dict] = {}
+# Catalog refreshes (Tk thread) and background duplicate checks share these dicts; every write to a
+# record, and every dump of the cache, happens under this lock.
+_FINGERPRINT_LOCK = threading.RLock()
+
+
+def _load_fingerprint_cache(cache_root: Path) -> dict:
+    key = str(cache_root)
+    with _FINGERPRINT_LOCK:
+        cache = _FINGERPRINT_CACHES.get(key)
+        if cache is not None:
+            return cache
+        cache = {"version": FINGERPRINT_VERSION, "files": {}}
+        try:
+            raw = json.loads((cache_root / FINGERPRINT_CACHE_FILENAME).read_text(encoding="utf-8"))
+            if isinstance(raw, dict) and raw.get("version") == FINGERPRINT_VERSION and isinstance(raw.get("files"), dict):
+                cache = raw
+        except Exception:
+            pass
+        _FINGERPRINT_CACHES[key] = cache
+        return cache
+
+
+def _save_fingerprint_cache(cache_root: Path, cache: dict) -> None:
+    path = cache_root / FINGERPRINT_CACHE_FILENAME
+    tmp = path.with_name(path.name + ".tmp")
+    with _FINGERPRINT_LOCK:
+        try:
+            tmp.write_text(json.dumps(cache, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+def _fingerprint_backend_ready() -> bool:
+    return np is not None and (sf is not None or miniaudio is not None)
+
+
+def _fingerprint_pcm(mono: "np.ndarray") -> "np.ndarray":
+    # Banded spectral energy over time; each hop keeps the sign of the band-energy slope change as 16 bits.
+    if mono.shape[0] < FINGERPRINT_FRAME + FINGERPRINT_HOP:
+        return np.zeros(0, dtype=np.uint16)
+    frames = np.lib.stride_tricks.sliding_window_view(mono, FINGERPRINT_FRAME)[::FINGERPRINT_HOP]
+    spec = np.abs(np.fft.rfft(frames * np.hanning(FINGERPRINT_FRAME).astype(np.float32), axis=1)) ** 2
+    freqs = np.fft.rfftfreq(FINGERPRINT_FRAME, 1.0 / FINGERPRINT_RATE)
+    edges = np.geomspace(300.0, 3000.0, FINGERPRINT_BANDS + 1)
+    band_of_bin = np.searchsorted(edges, freqs, side="right") - 1
+    onehot = (band_of_bin[:, None] == np.arange(FINGERPRINT_BANDS)[None, :]).astype(np.float32)
+    energy = np.log(spec.astype(np.float32) @ onehot + 1e-6)
+    slope = energy[:, :-1] - energy[:, 1:]
+    bits = (slope[1:] - slope[:-1]) > 0
+    weights = (1 << np.arange(FINGERPRINT_BANDS - 1)).astype(np.uint32)
+    return (bits.astype(np.uint32) @ weights).astype(np.uint16)
+
+
+def compute_audio_fingerprint(path: Path) -> Optional[dict]:
+    if not _fingerprint_backend_ready():
+        return None
+    try:
+        pcm, sr = _decode_to_pcm16(path, target_rate=FINGERPRINT_RATE, target_channels=1)
+    except (Exception, SystemExit):
+        return None
+    duration = pcm.shape[0] / float(sr or FINGERPRINT_RATE)
+    mono = pcm[: FINGERPRINT_MAX_SECONDS * FINGERPRINT_RATE, 0].astype(np.float32) / 32768.0
+    bits = _fingerprint_pcm(mono)
+    return {"duration": round(duration, 3), "bits": base64.b64encode(bits.tobytes()).decode("ascii")}
+
+
+def _fingerprint_bits(fp: dict) -> "np.ndarray":
+    return np.frombuffer(base64.b64decode(fp.get("bits") or ""), dtype=np.uint16)
+
+
+def fingerprint_distance(a: dict, b: dict) -> float:
+    # Bit error rate at the best alignment within a couple of seconds either way.
+    if np is None:
+        return 1.0
+    bits_a = _fingerprint_bits(a)
+    bits_b = _fingerprint_bits(b)
+    shorter = min(bits_a.shape[0], bits_b.shape[0])
+    if shorter < 8:
+        return 1.0
+    best = 1.0
+    for shift in range(-FINGERPRINT_MAX_SHIFT, FINGERPRINT_MAX_SHIFT + 1):
+        xa = bits_a[max(0, shift):]
+        xb = bits_b[max(0, -shift):]
+        n = min(xa.shape[0], xb.shape[0])
+        if n < shorter // 2:
+            continue
+        diff = np.bitwise_xor(xa[:n], xb[:n])
+        ber = np.unpackbits(diff.view(np.uint8)).sum() / float(n * 16)
+        best = min(best, float(ber))
+    return best
+
+
+def fingerprint_candidate_pairs(prints: list[tuple[float, "np.ndarray"]]) -> list[tuple[int, int]]:
+    # Inverted index over 16-bit sub-fingerprints: only pairs that share enough exact words at one alignment
+    # (within FINGERPRINT_MAX_SHIFT hops) and sit inside the duration window go on to fingerprint_distance.
+    # Words are keyed by (word, position block); a second "ghost" posting in the next block lets pairs that
+    # straddle a block boundary meet exactly once. The join runs over word ranges to bound memory.
+    if np is None or len(prints) < 2:
+        return []
+    count = len(prints)
+    word = np.concatenate([bits.astype(np.uint16) for _, bits in prints])
+    song = np.repeat(np.arange(count, dtype=np.int32), [bits.shape[0] for _, bits in prints])
+    pos = np.concatenate([np.arange(bits.shape[0], dtype=np.int32) for _, bits in prints])
+    durations = np.array([d for d, _ in prints], dtype=np.float64)
+    block_len = FINGERPRINT_MAX_SHIFT + 1
+    blocks = int(pos.max(initial=0)) // block_len + 2
+    stride = 2 * FINGERPRINT_MAX_SHIFT + 1
+    by_word = np.argsort(word, kind="stable")
+    bounds = np.searchsorted(word[by_word], np.arange(0, (1 << 16) + 1, FINGERPRINT_INDEX_CHUNK_WORDS))
+    votes: list["np.ndarray"] = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        idx = by_word[start:stop]
+        if idx.shape[0] < 2:
             continue
-        raw_entries.append(AudioTrackEntry(source=ogg, ogg=ogg, status="ready", detail="cache-only"))
+        w, sg, ps = word[idx].astype(np.int64), song[idx], pos[idx]
+        key = np.concatenate([w * blocks + ps // block_len, w * blocks + ps // block_len + 1])
+        sg = np.concatenate([sg, sg])
+        ps = np.concatenate([ps, ps])
+        ghost = np.repeat(np.array([False, True]), idx.shape[0])
+        order = np.argsort(key, kind="stable")
+        key, sg, ps, ghost = key[order], sg[order], ps[order], ghost[order]
+        # Over-full lists (silence, stop words) are what would make the join quadratic; skip them.
+        heads = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        sizes = np.diff(np.r_[heads, key.shape[0]])
+        keep = np.repeat(sizes <= FINGERPRINT_INDEX_MAX_POSTINGS, sizes)
+        key, sg, ps, ghost = key[keep], sg[keep], ps[keep], ghost[keep]
+        for lag in range(1, FINGERPRINT_INDEX_MAX_POSTINGS):
+            a = np.flatnonzero(key[lag:] == key[:-lag])
+            if a.shape[0] == 0:
+                break
+            b = a + lag
+            ok = (sg[a] != sg[b]) & ~(ghost[a] & ghost[b]) & (np.abs(ps[a] - ps[b]) <= FINGERPRINT_MAX_SHIFT)
+            a, b = a[ok], b[ok]
+            lo = np.minimum(sg[a], sg[b]).astype(np.int64)
+            hi = np.maximum(sg[a], sg[b]).astype(np.int64)
+            shift = np.where(sg[a] == lo, ps[b] - ps[a], ps[a] - ps[b])
+            dur_lo, dur_hi = durations[lo], durations[hi]
+            near = np.abs(dur_hi - dur_lo) <= np.maximum(1.0, np.minimum(dur_lo, dur_hi) * FINGERPRINT_DURATION_TOLERANCE)
+            votes.append(((lo * count + hi) * stride + shift + FINGERPRINT_MAX_SHIFT)[near])
+    if not votes:
+        return []
+    cells, hits = np.unique(np.concatenate(votes), return_counts=True)
+    pairs = np.unique(cells[hits >= FINGERPRINT_INDEX_MIN_VOTES] // stride)
+    return [(int(p // count), int(p % count)) for p in pairs]
+
+
+def find_duplicate_songs(
+    entries: list[AudioTrackEntry],
+    cache_root: Optional[Path] = None,
+    fingerprint_mode: str = "full",
+    stats: Optional[dict[Path, FileStat]] = None,
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+    hash_files: bool = True,
+) -> dict[str, str]:
+    # fingerprint_mode: "off" (exact hashes + stored fingerprint links), "cached" (compare stored fingerprints),
+    # "full" (decode as needed). Only "cached"/"full" compare fingerprints; they belong off the Tk thread.
+    # hash_files=False never reads audio: same-size files only match through sha1s already in the cache.
+    cache = _load_fingerprint_cache(cache_root) if cache_root is not None else {"files": {}}
+    records: dict = cache.setdefault("files", {})
+    dirty = False
+    candidates: list[tuple[AudioTrackEntry, list[int]]] = []
+    for entry in entries:
+        entry.duplicate_of = None
+        if is_mix_recipe(entry.source):
+            continue
+        st = (stats or {}).get(entry.source)
+        if st is None:
+            try:
+                raw = entry.source.stat()
+            except OSError:
+                continue
+            st = FileStat(path=entry.source, size=raw.st_size, mtime_ns=raw.st_mtime_ns)
+        candidates.append((entry, [st.size, st.mtime_ns]))
+
+    def record_for(entry: AudioTrackEntry, sig: list[int]) -> dict:
+        nonlocal dirty
+        key = str(entry.source)
+        with _FINGERPRINT_LOCK:
+            rec = records.get(key)
+            if not isinstance(rec, dict) or rec.get("sig") != sig:
+                rec = {"sig": sig}
+                records[key] = rec
+                dirty = True
+        return rec
+
+    def stored(entry: AudioTrackEntry, sig: list[int]) -> Optional[dict]:
+        rec = records.get(str(entry.source))
+        return rec if isinstance(rec, dict) and rec.get("sig") == sig else None
 
-    # Canonicalize duplicate logical song keys that resolve to the same .ogg filename.
-    # This can happen when users have same-stem files (e.g. song.mp3 + song.ogg).
-    # Prefer source .ogg rows first, then better status.
     status_rank = {"ready": 3, "stale": 2, "needs convert": 1}
-    deduped: dict[str, AudioTrackEntry] = {}
-    for entry in raw_entries:
-        key = entry.ogg.name
-        keep = deduped.get(key)
-        if keep is None:
-            deduped[key] = entry
+    parent: dict[str, str] = {}
+    how: dict[str, str] = {}
+
+    def root(key: str) -> str:
+        while parent.get(key, key) != key:
+            key = parent[key]
+        return key
+
+    def union(a: AudioTrackEntry, b: AudioTrackEntry, kind: str) -> None:
+        ra, rb = root(a.ogg.name), root(b.ogg.name)
+        if ra == rb:
+            return
+        keep, drop = sorted((ra, rb), key=lambda k: (-status_rank.get(by_key[k].status, 0), k.lower()))
+        parent[drop] = keep
+        how[drop] = kind
+
+    by_key = {entry.ogg.name: entry for entry, _ in candidates}
+
+    # Layer 1: identical bytes. Only files sharing a size are ever hashed.
+    by_size: dict[int, list[tuple[AudioTrackEntry, list[int]]]] = {}
+    for entry, sig in candidates:
+        by_size.setdefault(sig[0], []).append((entry, sig))
+    for group in by_size.values():
+        if len(group) < 2:
             continue
-        entry_score = (
-            1 if entry.source.suffix.lower() == ".ogg" else 0,
-            status_rank.get(entry.status, 0),
-            entry.source.stat().st_mtime if entry.source.exists() else 0.0,
-        )
-        keep_score = (
-            1 if keep.source.suffix.lower() == ".ogg" else 0,
-            status_rank.get(keep.status, 0),
-            keep.source.stat().st_mtime if keep.source.exists() else 0.0,
-        )
-        if entry_score > keep_score:
-            deduped[key] = entry
+        by_hash: dict[str, AudioTrackEntry] = {}
+        for entry, sig in group:
+            rec = record_for(entry, sig) if hash_files else stored(entry, sig)
+            if rec is None:
+                continue
+            if not rec.get("sha1"):
+                if not hash_files:
+                    continue
+                try:
+                    digest = _file_sha1(entry.source)
+                except OSError:
+                    continue
+                with _FINGERPRINT_LOCK:
+                    rec["sha1"] = digest
+                dirty = True
+            first = by_hash.setdefault(rec["sha1"], entry)
+            if first is not entry:
+                union(first, entry, "exact")
+
+    # Layer 2: decoded-audio fingerprints catch re-rips and format changes.
+    if fingerprint_mode == "off":
+        # Matches from the last fingerprint pass, kept as [source, size, mtime_ns] links on the record; a link
+        # only counts while both files still have the stat they were fingerprinted with.
+        by_source = {str(e.source): (e, sig) for e, sig in candidates}
+        for entry, sig in candidates:
+            rec = stored(entry, sig)
+            for link in (rec or {}).get("fp_links") or ():
+                other = by_source.get(link[0]) if isinstance(link, list) and len(link) == 3 else None
+                if other is not None and other[1] == link[1:]:
+                    union(entry, other[0], "fingerprint")
+    elif np is not None:
+        pending = [(e, sig) for e, sig in candidates if root(e.ogg.name) == e.ogg.name]
+        prints: list[tuple[float, AudioTrackEntry, dict, dict, list[int]]] = []
+        for i, (entry, sig) in enumerate(pending):
+            if fingerprint_mode == "full":
+                rec = record_for(entry, sig)
+            else:
+                rec = stored(entry, sig)
+                if rec is None:
+                    continue
+            fp = rec.get("fp")
+            if fp is None and fingerprint_mode == "full" and _fingerprint_backend_ready():
+                fp = compute_audio_fingerprint(entry.source) or {}
+                with _FINGERPRINT_LOCK:
+                    rec["fp"] = fp
+                dirty = True
+            if progress_cb:
+                progress_cb(i + 1, len(pending))
+            if fp and fp.get("bits"):
+                prints.append((float(fp.get("duration") or 0.0), entry, fp, rec, sig))
+        prints.sort(key=lambda item: (item[0], item[1].ogg.name.lower()))
+        links: dict[int, list[list]] = {}
+        for i, j in fingerprint_candidate_pairs([(item[0], _fingerprint_bits(item[2])) for item in prints]):
+            _, entry_a, fp_a, _, sig_a = prints[i]
+            _, entry_b, fp_b, _, _ = prints[j]
+            if root(entry_a.ogg.name) == root(entry_b.ogg.name):
+                continue
+            if fingerprint_distance(fp_a, fp_b) <= FINGERPRINT_MATCH_BER:
+                union(entry_a, entry_b, "fingerprint")
+                links.setdefault(j, []).append([str(entry_a.source), *sig_a])
+        for j, (_, _, _, rec, _) in enumerate(prints):
+            with _FINGERPRINT_LOCK:
+                if (rec.get("fp_links") or []) != links.get(j, []):
+                    if j in links:
+                        rec["fp_links"] = links[j]
+                    else:
+                        rec.pop("fp_links", None)
+                    dirty = True
 
-    return sorted(deduped.values(), key=lambda e: e.source.name.lower())
+    if dirty and cache_root is not None:
+        _save_fingerprint_cache(cache_root, cache)
 
+    duplicates: dict[str, str] = {}
+    for key in parent:
+        keep = root(key)
+        if keep == key:
+            continue
+        entry = by_key[key]
+        canonical = by_key[keep]
+        # status stays the real conversion state; the duplicate flag lives in duplicate_of/detail only.
+        entry.duplicate_of = keep
+        if how.get(key) == "exact":
+            entry.detail = f"same file as {canonical.source.name}"
+        else:
+            entry.detail = f"likely same audio as {canonical.source.name}"
+        duplicates[key] = keep
+    return duplicates
 
-def collect_available_oggs(audio_dir: Path) -> list[Path]:
-    src_root, cache_root = ensure_audio_workspace(audio_dir)
-    by_name: dict[str, Path] = {}
 
-    # Prefer converted cache when present.
-    for p in sorted([x for x in cache_root.iterdir() if x.is_file() and x.suffix.lower() == ".ogg"]):
-        by_name[p.name] = p
+@dataclass
+class CatalogChange:
+    kind: str  # "added" | "removed" | "changed"
+    path: Path
+
+
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
 
-    # Fall back to source-root OGG files when no cache entry exists yet.
-    for p in sorted([x for x in src_root.iterdir() if x.is_file() and x.suffix.lower() == ".ogg"]):
-        if p.name not in by_name:
-            by_name[p.name] = p
 
-    return sorted(by_name.values(), key=lambda x: x.name.lower())
+def _watch_backend_mode() -> str:
+    mode = os.environ.get("SMB_WATCH_BACKEND", "auto").strip().lower()
+    if mode in ("auto", "inotify", "poll", "off"):
+        return mode
+    return "auto"
+
+
+def _inotify_open(paths: list[Path]) -> Optional[int]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    except Exception:
+        return None
+    if fd < 0:
+        return None
+    mask = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+    for p in paths:
+        if libc.inotify_add_watch(fd, os.fsencode(str(p)), mask) < 0:
+            os.close(fd)
+            return None
+    return fd
+
+
+def _is_watched_song_file(path: Path) -> bool:
+    if path.name.startswith("."):
+        return False
+    return path.suffix.lower() in AUDIO_SOURCE_EXTENSIONS or is_mix_recipe(path)
+
+
+class CatalogWatcher:
+    # Watches the source and _ogg roots and reports settled added/removed/changed song files.
+    def __init__(
+        self,
+        audio_dir: Path,
+        on_changes: Callable[[list[CatalogChange]], None],
+        poll_interval: float = 2.0,
+        settle_delay: float = 0.5,
+    ):
+        self.audio_dir = Path(audio_dir)
+        self.on_changes = on_changes
+        self.poll_interval = poll_interval
+        self.settle_delay = settle_delay
+        src_root, cache_root = ensure_audio_workspace(self.audio_dir)
+        self.roots: list[Path] = [src_root]
+        if cache_root.resolve() != src_root.resolve():
+            self.roots.append(cache_root)
+        self.backend = "poll"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._fd: Optional[int] = None
+        self._reported: dict[Path, tuple[int, int]] = {}
+        self._pending: dict[Path, tuple[int, int]] = {}
+        self._dir_mtimes: dict[Path, int] = {}
+
+    def start(self) -> "CatalogWatcher":
+        mode = _watch_backend_mode()
+        if mode == "off":
+            return self
+        if mode in ("auto", "inotify"):
+            self._fd = _inotify_open(self.roots)
+            if self._fd is not None:
+                self.backend = "inotify"
+        self._reported = self._scan()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        # The worker closes the inotify fd itself so stop never blocks the caller.
+        self._stop.set()
+        self._thread = None
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        out: dict[Path, tuple[int, int]] = {}
+        for root in self.roots:
+            try:
+                self._dir_mtimes[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+            for st in scan_dir_files(root).values():
+                if _is_watched_song_file(st.path):
+                    out[st.path] = (st.size, st.mtime_ns)
+        return out
+
+    def _dirs_moved(self) -> bool:
+        for root in self.roots:
+            try:
+                if os.stat(root).st_mtime_ns != self._dir_mtimes.get(root):
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _wait_inotify(self, timeout: float) -> bool:
+        fd = self._fd
+        if fd is None:
+            return False
+        try:
+            ready, _, _ = select.select([fd], [], [], timeout)
+        except (OSError, ValueError):
+            return False
+        if not ready:
+            return False
+        # Event payloads are not parsed; any activity just triggers a diff of the roots.
+        try:
+            while os.read(fd, 65536):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        return True
+
+    def _diff(self, current: dict[Path, tuple[int, int]]) -> list[CatalogChange]:
+        changes: list[CatalogChange] = []
+        for path in sorted(set(self._reported) - set(current)):
+            self._reported.pop(path, None)
+            self._pending.pop(path, None)
+            changes.append(CatalogChange("removed", path))
+        for path in sorted(current):
+            sig = current[path]
+            if self._reported.get(path) == sig:
+                self._pending.pop(path, None)
+                continue
+            # Files still being copied keep moving; only report once two scans agree.
+            if self._pending.get(path) != sig:
+                self._pending[path] = sig
+                continue
+            self._pending.pop(path, None)
+            changes.append(CatalogChange("changed" if path in self._reported else "added", path))
+            self._reported[path] = sig
+        return changes
+
+    def _run(self) -> None:
+        try:
+            self._watch_loop()
+        finally:
+            if self._fd is not None:
+                try:
+                    os.close(self._fd)
+                except OSError:
+                    pass
+                self._fd = None
+
+    def _watch_loop(self) -> None:
+        polls = 0
+        while not self._stop.is_set():
+            timeout = self.settle_delay if self._pending else self.poll_interval
+            if self.backend == "inotify":
+                triggered = self._wait_inotify(min(timeout, 0.5))
+                if not triggered and not self._pending:
+                    continue
+                if triggered:
+                    self._stop.wait(self.settle_delay)
+            else:
+                if self._stop.wait(timeout):
+                    break
+                polls += 1
+                # Cheap path: only the root dirs are stat'ed, with a full rescan every few polls
+                # to catch in-place rewrites that do not touch the directory mtime.
+                if not self._pending and not self._dirs_moved() and polls % 5:
+                    continue
+            if self._stop.is_set():
+                break
+            try:
+                changes = self._diff(self._scan())
+            except Exception:
+                continue
+            if changes:
+                STAT_CACHE.invalidate(change.path for change in changes)
+                try:
+                    self.on_changes(changes)
+                except Exception:
+                    pass
+
+
+def collect_available_oggs(audio_dir: Path, catalog: Optional[Catalog] = None) -> list[Path]:
+    catalog = catalog if catalog is not None else Catalog(audio_dir).refresh()
+    return sorted(catalog.available_oggs().values(), key=lambda x: x.name.lower())
 
 
 def convert_audio_library(
@@ -1087,7 +2683,9 @@ def convert_audio_library(
     progress_cb: Optional[Callable[[AudioTrackEntry], None]] = None,
 ) -> dict[str, int]:
     src_root, cache_root = ensure_audio_workspace(audio_dir)
-    sources = _collect_audio_sources(src_root)
+    cache_files = scan_dir_files(cache_root)
+    source_stats = list(iter_audio_sources(src_root, exclude_dirs=_library_exclude_dirs(src_root, cache_root)))
+    sources = [st.path for st in source_stats]
     backend_mode = _audio_backend_mode()
     prefer_soundfile = backend_mode != "ffmpeg"
     ffmpeg = _locate_ffmpeg()
@@ -1098,11 +2696,17 @@ def convert_audio_library(
         "copied": 0,
         "skipped": 0,
         "failed": 0,
+        "duplicates": 0,
     }
-
-    for src in sources:
-        target = cache_root / f"{src.stem}.ogg"
-        up_to_date = target.exists() and target.stat().st_mtime >= src.stat().st_mtime
+    catalog = Catalog(audio_dir).refresh()
+    find_duplicate_songs(catalog.entries, cache_root, fingerprint_mode="cached", stats=catalog.file_stats())
+    duplicates = {e.source: e for e in catalog.entries if e.duplicate_of}
+
+    for src_st in source_stats:
+        src = src_st.path
+        target = cache_root / library_song_key(src_root, src)
+        target_st = cache_files.get(target.name)
+        up_to_date = target_st is not None and target_st.mtime_ns >= src_st.mtime_ns
         if not force and up_to_date:
             entry = AudioTrackEntry(source=src, ogg=target, status="ready", detail="up-to-date")
             summary["skipped"] += 1
@@ -1110,6 +2714,13 @@ def convert_audio_library(
                 progress_cb(entry)
             continue
 
+        dup = duplicates.get(src)
+        if dup is not None:
+            summary["duplicates"] += 1
+            if progress_cb:
+                progress_cb(dup)
+            continue
+
         if src.suffix.lower() == ".ogg":
             if src.resolve() != target.resolve():
                 shutil.copy2(src, target)
@@ -1171,43 +2782,17 @@ def convert_audio_library(
         if progress_cb:
             progress_cb(entry)
 
+    STAT_CACHE.invalidate()
     return summary
 
 
-def create_song_from_sources(
-    song_name: str,
-    source_files: list[Path],
-    audio_dir: Path,
-    overwrite_existing: bool = False,
-) -> Path:
-    if not source_files:
-        raise SystemExit("No source files were provided to create the song.")
+def _render_mix_audio(resolved_sources: list[Path], out_path: Path) -> None:
     backend_mode = _audio_backend_mode()
     prefer_soundfile = backend_mode != "ffmpeg"
     ffmpeg = _locate_ffmpeg()
     if backend_mode == "ffmpeg" and not ffmpeg:
         raise SystemExit("ffmpeg was not found; cannot create a stitched song.")
 
-    resolved_sources: list[Path] = []
-    for src in source_files:
-        p = Path(src).resolve()
-        if not p.exists() or not p.is_file():
-            raise SystemExit(f"Source file not found: {p}")
-        resolved_sources.append(p)
-
-    src_root = ensure(audio_source_root(Path(audio_dir).resolve()))
-    cache_root = ensure(audio_cache_root(Path(audio_dir).resolve()))
-
-    out_stem = _safe_song_stem(song_name)
-    out_path = src_root / f"{out_stem}.ogg"
-    if not overwrite_existing:
-        n = 2
-        while out_path.exists():
-            out_path = src_root / f"{out_stem} ({n}).ogg"
-            n += 1
-    elif out_path.exists():
-        out_path.unlink()
-
     created = False
     soundfile_ready = _soundfile_backend_ready()
     soundfile_err: Exception | None = None
@@ -1246,10 +2831,14 @@ def create_song_from_sources(
                 "-map",
                 "[outa]",
                 "-vn",
+                "-ar",
+                str(MIX_RENDER_SAMPLE_RATE),
+                "-ac",
+                str(MIX_RENDER_CHANNELS),
                 "-c:a",
                 "libvorbis",
                 "-q:a",
-                "5",
+                str(MIX_RENDER_VORBIS_QUALITY),
                 str(out_path),
             ]
         )
@@ -1258,14 +2847,49 @@ def create_song_from_sources(
             err = (result.stderr or result.stdout or "ffmpeg failed").strip()
             raise SystemExit(f"ffmpeg failed creating song: {err}")
 
-    cache_out = cache_root / out_path.name
-    try:
-        shutil.copy2(out_path, cache_out)
-    except Exception:
-        pass
-    _write_mix_metadata(out_path, resolved_sources)
-    _write_mix_metadata(cache_out, resolved_sources)
-    return out_path
+
+def create_song_from_sources(
+    song_name: str,
+    source_files: list[Path],
+    audio_dir: Path,
+    overwrite_existing: bool = False,
+) -> Path:
+    if not source_files:
+        raise SystemExit("No source files were provided to create the song.")
+    if _audio_backend_mode() == "ffmpeg" and not _locate_ffmpeg():
+        raise SystemExit("ffmpeg was not found; cannot create a stitched song.")
+
+    resolved_sources: list[Path] = []
+    for src in source_files:
+        p = Path(src).resolve()
+        if not p.exists() or not p.is_file():
+            raise SystemExit(f"Source file not found: {p}")
+        resolved_sources.append(p)
+
+    src_root = ensure(audio_source_root(Path(audio_dir).resolve()))
+    cache_root = ensure(audio_cache_root(Path(audio_dir).resolve()))
+
+    # Mixes are stored as recipes; the stitched audio is rendered (once, by recipe hash)
+    # only when a build actually ships the mix. The recipe file is returned, since the audio
+    # does not exist yet; its song key is f"{mix_recipe_stem(path)}.ogg".
+    out_stem = _safe_song_stem(song_name)
+    stem = out_stem
+    if not overwrite_existing:
+        n = 2
+        while mix_recipe_path(src_root, stem).exists() or (src_root / f"{stem}.ogg").exists():
+            stem = f"{out_stem} ({n})"
+            n += 1
+    else:
+        # Drop a previously stitched song of the same name so it cannot shadow the recipe.
+        for legacy in {src_root / f"{stem}.ogg", cache_root / f"{stem}.ogg"}:
+            for p in (legacy, _mix_meta_path(legacy)):
+                if p.exists():
+                    p.unlink()
+
+    recipe_path = mix_recipe_path(src_root, stem)
+    previous = read_mix_recipe(recipe_path) if recipe_path.exists() else None
+    write_mix_recipe(recipe_path, resolved_sources, previous=previous)
+    return recipe_path
 
 
 def convert_single_audio_file(source_file: Path, audio_dir: Path, force: bool = True) -> AudioTrackEntry:
@@ -1274,21 +2898,36 @@ def convert_single_audio_file(source_file: Path, audio_dir: Path, force: bool =
     if not src.exists() or not src.is_file():
         raise SystemExit(f"Source file not found: {src}")
 
-    # Native .ogg sources should be used in place; avoid duplicating them into _ogg.
-    if src.suffix.lower() == ".ogg":
+    # Mix recipes are rendered by the build that ships them, not by conversion.
+    if is_mix_recipe(src):
+        recipe = read_mix_recipe(src)
+        rendered = mix_recipe_render_path(src, cache_root, recipe)
+        if rendered.exists():
+            return AudioTrackEntry(source=src, ogg=rendered, status="ready", detail="mix (rendered)")
+        return AudioTrackEntry(source=src, ogg=rendered, status="mix recipe", detail="renders at build")
+
+    # Native top-level .ogg sources are used in place; avoid duplicating them into _ogg.
+    if src.suffix.lower() == ".ogg" and src.parent == src_root:
         return AudioTrackEntry(source=src, ogg=src, status="ready", detail="source ogg")
 
     backend_mode = _audio_backend_mode()
     prefer_soundfile = backend_mode != "ffmpeg"
     ffmpeg = _locate_ffmpeg()
-    target = cache_root / f"{src.stem}.ogg"
+    target = cache_root / library_song_key(src_root, src)
     up_to_date = target.exists() and target.stat().st_mtime >= src.stat().st_mtime
     if not force and up_to_date:
         return AudioTrackEntry(source=src, ogg=target, status="ready", detail="up-to-date")
 
+    # Nested .ogg sources only need copying under their folded cache name.
+    if src.suffix.lower() == ".ogg":
+        shutil.copy2(src, target)
+        STAT_CACHE.invalidate([target])
+        return AudioTrackEntry(source=src, ogg=target, status="ready", detail="copied")
+
     if prefer_soundfile and _soundfile_backend_ready():
         try:
             _convert_with_soundfile(src, target)
+            STAT_CACHE.invalidate([target])
             return AudioTrackEntry(source=src, ogg=target, status="ready", detail="converted (soundfile)")
         except Exception as e:
             if backend_mode == "soundfile":
@@ -1317,110 +2956,229 @@ def convert_single_audio_file(source_file: Path, audio_dir: Path, force: bool =
         str(target),
     ]
     completed = subprocess.run(cmd, capture_output=True, text=True)
+    STAT_CACHE.invalidate([target])
     if completed.returncode != 0:
         detail = (completed.stderr or completed.stdout or "ffmpeg failed").strip()
         raise SystemExit(f"ffmpeg conversion failed: {detail}")
     return AudioTrackEntry(source=src, ogg=target, status="ready", detail="converted (ffmpeg)")
 
 
-def rename_song_asset(
-    ogg_name: str,
-    new_title: str,
+def _move_song_records(src_root: Path, cache_root: Path, moved: list[tuple[Path, Path]]) -> None:
+    # Renames keep size/mtime, so snapshot and fingerprint records can follow the file instead of being rebuilt.
+    snap = _load_catalog_snapshot(cache_root, src_root)
+    fp_cache = _load_fingerprint_cache(cache_root)
+    fp_records: dict = fp_cache.setdefault("files", {})
+    snap_dirty = fp_dirty = False
+    for old, new in moved:
+        with _FINGERPRINT_LOCK:
+            rec = fp_records.pop(str(old), None)
+            if rec is not None:
+                fp_records[str(new)] = rec
+                fp_dirty = True
+        try:
+            old_rel = old.relative_to(src_root).as_posix()
+            new_rel = new.relative_to(src_root).as_posix()
+        except ValueError:
+            continue
+        for section in ("entries", "recipes"):
+            records = snap.get(section) or {}
+            if old_rel in records:
+                records[new_rel] = records.pop(old_rel)
+                snap_dirty = True
+    if snap_dirty:
+        _save_catalog_snapshot(cache_root, snap)
+    if fp_dirty:
+        _save_fingerprint_cache(cache_root, fp_cache)
+
+
+def rename_song_assets(
+    mapping: dict[str, str],
     audio_dir: Path,
     overwrite_existing: bool = False,
-) -> str:
-    if not ogg_name:
-        raise SystemExit("Missing source song key.")
-    new_stem = _safe_song_stem(new_title)
-    if not new_stem:
-        raise SystemExit("Song name cannot be empty.")
-
+) -> dict[str, str]:
     src_root, cache_root = ensure_audio_workspace(Path(audio_dir).resolve())
-    old_ogg = cache_root / ogg_name
-    old_stem = Path(ogg_name).stem
-
-    src_candidates = sorted(
-        [p for p in src_root.iterdir() if p.is_file() and p.stem == old_stem],
-        key=lambda p: 0 if p.suffix.lower() == ".ogg" else 1,
-    )
-    source_file = src_candidates[0] if src_candidates else None
-
-    def _next_free(path: Path) -> Path:
-        if not path.exists():
-            return path
-        n = 2
+    same_root = src_root.resolve() == cache_root.resolve()
+
+    # One scandir per folder; every lookup below is a dict hit.
+    listings: dict[Path, dict[str, FileStat]] = {src_root: scan_dir_files(src_root)}
+    if not same_root:
+        listings[cache_root] = scan_dir_files(cache_root)
+
+    def listing(folder: Path) -> dict[str, FileStat]:
+        if folder not in listings:
+            listings[folder] = scan_dir_files(folder)
+        return listings[folder]
+
+    # Sources come from the same (optionally recursive) listing the catalog uses, keyed by song key.
+    src_by_key: dict[str, list[tuple[Path, str]]] = {}
+    for st in iter_library_files(src_root, exclude_dirs=_library_exclude_dirs(src_root, cache_root)):
+        if is_mix_recipe(st.path):
+            suffix = MIX_RECIPE_SUFFIX
+        elif st.path.suffix.lower() in AUDIO_SOURCE_EXTENSIONS:
+            suffix = st.path.suffix
+        else:
+            continue
+        src_by_key.setdefault(library_song_key(src_root, st.path), []).append((st.path, suffix))
+
+    # Resolve every song to the files that carry its name before touching anything.
+    plans: list[tuple[str, str, tuple[str, ...], list[tuple[Path, str]]]] = []
+    for ogg_name, new_title in mapping.items():
+        if not ogg_name:
+            raise SystemExit("Missing source song key.")
+        new_stem = _safe_song_stem(new_title)
+        if not new_stem:
+            raise SystemExit("Song name cannot be empty.")
+        files: dict[Path, str] = {}
+        folders: tuple[str, ...] = ()
+        for path, suffix in src_by_key.get(f"{Path(ogg_name).stem}.ogg", []):
+            files[path] = suffix
+            folders = path.relative_to(src_root).parts[:-1]
+            if suffix == MIX_RECIPE_SUFFIX:
+                recipe = read_mix_recipe(path)
+                if recipe is not None:
+                    render = mix_recipe_render_path(path, cache_root, recipe)
+                    if render.name in listing(render.parent):
+                        files[render] = ".ogg"
+                    if _mix_meta_path(render).name in listing(render.parent):
+                        files[_mix_meta_path(render)] = MIX_META_SUFFIX
+        cache_ogg = cache_root / ogg_name
+        if cache_ogg.name in listing(cache_root):
+            files[cache_ogg] = ".ogg"
+        meta = _mix_meta_path(cache_ogg)
+        if meta.name in listing(cache_root):
+            files[meta] = MIX_META_SUFFIX
+        if not files:
+            raise SystemExit(f"Could not locate song asset for key: {ogg_name}")
+        plans.append((ogg_name, new_stem, folders, sorted(files.items())))
+
+    def norm(path: Path) -> str:
+        return os.path.normcase(str(path))
+
+    vacated = {norm(path) for _, _, _, files in plans for path, _ in files}
+    reserved: set[str] = set()
+    moves: list[tuple[Path, Path]] = []
+    displaced: dict[str, Path] = {}
+    result: dict[str, str] = {}
+
+    folded: dict[Path, dict[str, Path]] = {}
+
+    def occupant(target: Path) -> Optional[Path]:
+        if target.parent not in folded:
+            folded[target.parent] = {os.path.normcase(name): st.path for name, st in listing(target.parent).items()}
+        hit = folded[target.parent].get(os.path.normcase(target.name))
+        if hit is None or norm(hit) in vacated:
+            return None
+        return hit
+
+    # Collision suffixes are planned up front, and one stem is picked that is free in every folder the song touches.
+    for ogg_name, new_stem, folders, files in plans:
+        n = 1
         while True:
-            candidate = path.with_name(f"{path.stem} ({n}){path.suffix}")
-            if not candidate.exists():
-                return candidate
+            stem = new_stem if n == 1 else f"{new_stem} ({n})"
+            # Sources are renamed in their own folder; cache files of a nested song keep the folded folder prefix.
+            song_stem = " - ".join([*folders, stem])
+            targets = [
+                (path, path.with_name(f"{song_stem if path.parent == cache_root else stem}{suffix}"))
+                for path, suffix in files
+            ]
+            # The song key is its cache .ogg name, so that name must be free even when nothing is cached yet.
+            probe = cache_root / f"{song_stem}.ogg"
+            blocked = False
+            for _, target in targets + [(probe, probe)]:
+                if norm(target) in reserved:
+                    blocked = True
+                elif occupant(target) is not None and not overwrite_existing:
+                    blocked = True
+            if not blocked:
+                break
             n += 1
+        for path, target in targets + [(probe, probe)]:
+            reserved.add(norm(target))
+            hit = occupant(target)
+            if hit is not None:
+                displaced[norm(hit)] = hit
+            if norm(path) != norm(target) or path.name != target.name:
+                moves.append((path, target))
+        result[ogg_name] = f"{song_stem}.ogg"
+
+    token = f".smbrename-{os.getpid()}-{time.time_ns()}"
+    done: list[tuple[Path, Path]] = []
+    parked: list[tuple[Path, Path]] = []
+    trash: list[Path] = []
+    try:
+        # Park displaced files and every mover under temporary names first, so swaps and chains cannot clash.
+        for i, victim in enumerate(displaced.values()):
+            tmp = victim.with_name(f"{token}-x{i}")
+            os.rename(victim, tmp)
+            done.append((victim, tmp))
+            trash.append(tmp)
+        for i, (path, target) in enumerate(moves):
+            tmp = path.with_name(f"{token}-{i}")
+            os.rename(path, tmp)
+            done.append((path, tmp))
+            parked.append((tmp, target))
+        for tmp, target in parked:
+            os.rename(tmp, target)
+            done.append((tmp, target))
+    except OSError as e:
+        for before, after in reversed(done):
+            try:
+                os.rename(after, before)
+            except OSError:
+                pass
+        raise SystemExit(f"Rename failed, no files were changed: {e}")
+    for tmp in trash:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+    STAT_CACHE.invalidate([p for move in moves for p in move] + list(displaced.values()))
+    _move_song_records(src_root, cache_root, moves)
+    return result
 
-    if source_file is not None:
-        src_target = source_file.with_name(f"{new_stem}{source_file.suffix}")
-        if source_file.resolve() != src_target.resolve():
-            if src_target.exists():
-                if overwrite_existing:
-                    src_target.unlink()
-                else:
-                    src_target = _next_free(src_target)
-        if source_file.resolve() != src_target.resolve():
-            source_file.rename(src_target)
-        source_file = src_target
-
-    new_ogg_name = f"{new_stem}.ogg"
-    ogg_target = cache_root / new_ogg_name
-    if old_ogg.resolve() != ogg_target.resolve() and ogg_target.exists():
-        if overwrite_existing:
-            ogg_target.unlink()
-        else:
-            ogg_target = _next_free(ogg_target)
-    if old_ogg.exists():
-        if old_ogg.resolve() != ogg_target.resolve():
-            old_ogg.rename(ogg_target)
-    elif source_file is not None and source_file.suffix.lower() == ".ogg":
-        if source_file.resolve() != ogg_target.resolve():
-            shutil.copy2(source_file, ogg_target)
-    elif source_file is not None:
-        convert_single_audio_file(source_file, src_root, force=True)
-        generated = cache_root / f"{source_file.stem}.ogg"
-        if generated.exists() and generated.resolve() != ogg_target.resolve():
-            generated.rename(ogg_target)
-    else:
-        raise SystemExit(f"Could not locate song asset for key: {ogg_name}")
 
-    return ogg_target.name
+def rename_song_asset(
+    ogg_name: str,
+    new_title: str,
+    audio_dir: Path,
+    overwrite_existing: bool = False,
+) -> str:
+    return rename_song_assets({ogg_name: new_title}, audio_dir, overwrite_existing=overwrite_existing)[ogg_name]
 
 
-def find_oggs(audio_dir: Path) -> list[Path]:
+def find_oggs(audio_dir: Path, catalog: Optional[Catalog] = None) -> list[Path]:
     # Prefer converted cache in the new audio workspace convention.
-    cache = audio_cache_root(audio_dir)
-    if cache.exists():
-        cached = sorted([p for p in cache.iterdir() if p.is_file() and p.suffix.lower() == ".ogg"])
-        if cached:
-            return cached
-    # Backward compatibility for legacy folders containing direct OGG files.
-    if audio_dir.exists():
-        return sorted([p for p in audio_dir.iterdir() if p.is_file() and p.suffix.lower() == ".ogg"])
-    return []
+    if catalog is not None:
+        cached = catalog.cache_oggs()
+    else:
+        cached = sorted(st.path for st in scan_dir_files(audio_cache_root(audio_dir)).values() if st.path.suffix.lower() == ".ogg")
+    if not cached:
+        # Backward compatibility for legacy folders containing direct OGG files.
+        cached = sorted(st.path for st in scan_dir_files(audio_dir).values() if st.path.suffix.lower() == ".ogg")
+    # Mix recipes have no audio until a build ships them; render the pending ones so CLI builds keep them.
+    if catalog is not None:
+        recipes = [e.source for e in catalog.entries if is_mix_recipe(e.source)]
+    else:
+        recipes = sorted(st.path for st in scan_dir_files(audio_source_root(audio_dir)).values() if is_mix_recipe(st.path))
+    names = {p.name for p in cached}
+    mixes = [render_mix_recipe(r, audio_dir) for r in recipes if f"{mix_recipe_stem(r)}.ogg" not in names]
+    if not mixes:
+        return cached
+    return sorted(cached + mixes, key=lambda p: p.name)
 
 
 def detect_template_mask_and_bbox(template: Image.Image):
     tpl = template.convert("RGBA")
     w, h = tpl.size
-    pix = tpl.load()
-    mask = Image.new("L", (w, h), 0)
-    mpx = mask.load()
-    found = False
-    for y in range(h):
-        for x in range(w):
-            r, g, b, a = pix[x, y]
-            if a > 0 and max(r, g, b) <= 40:
-                mpx[x, y] = 255
-                found = True
-    if found:
-        return mask, mask.getbbox()
-    alpha = tpl.split()[-1]
+    r, g, b, alpha = tpl.split()
+    # Band ops instead of a per-pixel loop: dark (max channel <= 40) and not fully transparent.
     non_trans = alpha.point(lambda a: 255 if a > 0 else 0)
+    dark = ImageChops.lighter(ImageChops.lighter(r, g), b).point(lambda v: 255 if v <= 40 else 0)
+    mask = ImageChops.multiply(dark, non_trans)
+    bbox = mask.getbbox()
+    if bbox:
+        return mask, bbox
     bbox = non_trans.getbbox()
     if bbox:
         return non_trans, bbox
@@ -1428,13 +3186,12 @@ def detect_template_mask_and_bbox(template: Image.Image):
     return full, (0, 0, w, h)
 
 
-def compose_with_template(source: Image.Image, template: Image.Image, rotate_source_degrees: float = 0.0) -> Image.Image:
-    tpl = template.convert("RGBA")
-    mask, bbox = detect_template_mask_and_bbox(tpl)
-    bx0, by0, bx1, by1 = bbox
-    box_w = max(1, bx1 - bx0)
-    box_h = max(1, by1 - by0)
+def _template_box(template: Image.Image | TemplateAsset) -> tuple[int, int, int, int]:
+    bx0, by0, bx1, by1 = _template_mask_and_bbox(template)[1]
+    return bx0, by0, max(1, bx1 - bx0), max(1, by1 - by0)
+
 
+def _template_cover_crop(source: Image.Image, box_w: int, box_h: int, rotate_source_degrees: float = 0.0) -> Image.Image:
     src = source.convert("RGBA")
     if rotate_source_degrees:
         src = src.rotate(rotate_source_degrees, resample=Image.BICUBIC, expand=True)
@@ -1445,7 +3202,14 @@ def compose_with_template(source: Image.Image, template: Image.Image, rotate_sou
 
     left = (new_w - box_w) // 2
     top = (new_h - box_h) // 2
-    crop = resized.crop((left, top, left + box_w, top + box_h))
+    return resized.crop((left, top, left + box_w, top + box_h))
+
+
+def compose_with_template(source: Image.Image, template: Image.Image | TemplateAsset, rotate_source_degrees: float = 0.0) -> Image.Image:
+    tpl = _template_image(template)
+    mask = _template_mask_and_bbox(template)[0]
+    bx0, by0, box_w, box_h = _template_box(template)
+    crop = _template_cover_crop(source, box_w, box_h, rotate_source_degrees)
 
     fg = Image.new("RGBA", tpl.size, (0, 0, 0, 0))
     fg.paste(crop, (bx0, by0), crop)
@@ -1495,8 +3259,10 @@ def _column_warp_trapezoid(source: Image.Image, bl_up_px: int, tr_down_px: int)
     # - bottom-left moves up by bl_up_px
     # - top-right moves down by tr_down_px
     # - bottom-right stays
-    out = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    # Every output column is a band that maps back onto the full source column; all bands go
+    # through a single MESH transform instead of a crop/resize/paste per column.
     max_x = max(1, w - 1)
+    mesh = []
     for x in range(w):
         t = x / max_x
         top_y = tr_down_px * t
@@ -1504,17 +3270,25 @@ def _column_warp_trapezoid(source: Image.Image, bl_up_px: int, tr_down_px: int)
         # Use floor/ceil bounds to avoid subpixel rounding holes along edges.
         y0 = int(top_y // 1)
         y1 = int(-(-bottom_y // 1))  # ceil for positive values without importing math
-        band_h = y1 - y0 + 1
-        if band_h <= 0:
+        if y1 < y0:
             continue
-        col = src.crop((x, 0, x + 1, h)).resize((1, band_h), Image.BICUBIC)
-        out.paste(col, (x, y0), col)
+        mesh.append(((x, y0, x + 1, y1 + 1), (x, 0, x, h, x + 1, h, x + 1, 0)))
+    warped = src.transform((w, h), Image.MESH, mesh, Image.BICUBIC, fillcolor=(0, 0, 0, 0))
+    out = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    out.paste(warped, (0, 0), warped)
     return out
 
 
-def compose_item_album_with_skew(source: Image.Image, template: Image.Image, target_w: int = 23, target_h: int = 32, bl_up_px: int = 9, tr_down_px: int = 9) -> Image.Image:
-    tpl = template.convert("RGBA")
-    mask, bbox = detect_template_mask_and_bbox(tpl)
+def compose_item_album_with_skew(
+    source: Image.Image,
+    template: Image.Image | TemplateAsset,
+    target_w: int = 23,
+    target_h: int = 32,
+    bl_up_px: int = 9,
+    tr_down_px: int = 9,
+) -> Image.Image:
+    tpl = _template_image(template)
+    mask, bbox = _template_mask_and_bbox(template)
     bx0, by0, bx1, by1 = bbox
     box_w = max(1, bx1 - bx0)
     box_h = max(1, by1 - by0)
@@ -1532,12 +3306,7 @@ def compose_item_album_with_skew(source: Image.Image, template: Image.Image, tar
 
 def _red_key_dual_masks(mask_img: Image.Image) -> tuple[Image.Image, Image.Image]:
     src = mask_img.convert("RGBA")
-    w, h = src.size
-    main_mask = Image.new("L", (w, h), 0)
-    trim_mask = Image.new("L", (w, h), 0)
-    spx = src.load()
-    mpx = main_mask.load()
-    tpx = trim_mask.load()
+    r, g, b, a = src.split()
     # Strict keys:
     # - Main: #FF00FF (magenta)
     # - Trim: #00FFFF (cyan)
@@ -1545,18 +3314,26 @@ def _red_key_dual_masks(mask_img: Image.Image) -> tuple[Image.Image, Image.Image
     trim_targets = [(0x00, 0xFF, 0xFF)]
     main_tol = 24
     trim_tol = 24
-    for y in range(h):
-        for x in range(w):
-            r, g, b, a = spx[x, y]
-            # Ignore near-transparent antialias fringe noise in key masks.
-            if a < 8:
-                continue
-            d_trim = min(abs(r - tr) + abs(g - tg) + abs(b - tb) for tr, tg, tb in trim_targets)
-            d_main = min(abs(r - tr) + abs(g - tg) + abs(b - tb) for tr, tg, tb in main_targets)
-            if d_trim <= trim_tol:
-                tpx[x, y] = max(tpx[x, y], a)
-            elif d_main <= main_tol:
-                mpx[x, y] = max(mpx[x, y], a)
+
+    def key_hits(targets: list[tuple[int, int, int]], tol: int) -> Image.Image:
+        # Manhattan distance to the nearest key colour. ImageChops.add clamps at 255, which cannot
+        # change a "<= tol" comparison for any tol below 255.
+        dist = None
+        for target in targets:
+            d = None
+            for band, value in zip((r, g, b), target):
+                diff = ImageChops.difference(band, Image.new("L", src.size, value))
+                d = diff if d is None else ImageChops.add(d, diff)
+            dist = d if dist is None else ImageChops.darker(dist, d)
+        return dist.point(lambda v: 255 if v <= tol else 0)
+
+    # Ignore near-transparent antialias fringe noise in key masks.
+    opaque = a.point(lambda v: 255 if v >= 8 else 0)
+    trim_hit = ImageChops.multiply(key_hits(trim_targets, trim_tol), opaque)
+    main_hit = ImageChops.multiply(key_hits(main_targets, main_tol), ImageChops.invert(trim_hit))
+    # multiply() by a 0/255 mask keeps alpha exactly where the key matched.
+    trim_mask = ImageChops.multiply(a, trim_hit)
+    main_mask = ImageChops.multiply(a, ImageChops.multiply(main_hit, opaque))
     return main_mask, trim_mask
 
 
@@ -1572,14 +3349,8 @@ def _letterbox_square_image(source: Image.Image) -> Image.Image:
 
 def _clear_low_alpha_noise(img: Image.Image, alpha_threshold: int = 8) -> Image.Image:
     out = img.convert("RGBA")
-    px = out.load()
-    w, h = out.size
-    for y in range(h):
-        for x in range(w):
-            r, g, b, a = px[x, y]
-            if a < alpha_threshold:
-                px[x, y] = (0, 0, 0, 0)
-    return out
+    keep = out.getchannel("A").point(lambda a: 255 if a >= alpha_threshold else 0)
+    return Image.composite(out, Image.new("RGBA", out.size, (0, 0, 0, 0)), keep)
 
 
 def _apply_softlight_rgba(base_img: Image.Image, softlight_img: Image.Image) -> Image.Image:
@@ -1597,61 +3368,894 @@ def _apply_softlight_rgba(base_img: Image.Image, softlight_img: Image.Image) ->
     return blended
 
 
+@dataclass
+class _RecordPlan:
+    # Template-only half of the fused record compose. Everything outside the key-mask bbox is the
+    # same for every cover (backdrop); inside it, the template layers are kept as planar int32 rows
+    # with the per-pixel constants of the blend formulas already worked out. Colour rows are
+    # (3, 1, n) so they broadcast over a stack of covers.
+    bbox: tuple[int, int, int, int]
+    mask: "np.ndarray"
+    trim: Optional["np.ndarray"]
+    over_rgb: "np.ndarray"
+    over_a255: "np.ndarray"
+    over_inv: "np.ndarray"
+    over_coef: "np.ndarray"
+    opaque_coef: "np.ndarray"
+    opaque_alpha: "np.ndarray"
+    soft: Optional["np.ndarray"]
+    soft_inv: Optional["np.ndarray"]
+    soft_alpha: Optional["np.ndarray"]
+    backdrop: Optional[Image.Image] = None
+    sources: tuple = ()
+
+
+def _div255(v: "np.ndarray") -> "np.ndarray":
+    # Pillow's DIV255 rounding, in place: ((v + 128) + ((v + 128) >> 8)) >> 8.
+    v += 128
+    v += v >> 8
+    v >>= 8
+    return v
+
+
+def _record_kernel(src: "np.ndarray", plan: _RecordPlan, mul: Optional[int]) -> "np.ndarray":
+    # compose_record_with_mask_overlay's paste, composite, multiply, alpha_composite and soft_light
+    # steps in Pillow's integer arithmetic, over planar (4, covers, n) int32 pixels of the mask bbox.
+    # Crop pasted onto a transparent layer with itself as mask; a no-op for opaque covers, whose
+    # composite alpha then only depends on the template (plan.opaque_*).
+    opaque = bool(src[3].min() == 255)
+    layer = src if opaque else _div255(src * src[3])
+    if plan.trim is not None and mul is not None:
+        # ImageChops.multiply by (mul, mul, mul, 255) floors; 255 leaves main-key pixels unchanged.
+        layer[:3] *= np.where(plan.trim, mul, 255)
+        layer[:3] //= 255
+    # Main and trim keys never overlap (_red_key_dual_masks), so both composites onto the empty
+    # base collapse into one masked paste.
+    layer *= plan.mask
+    base = _div255(layer)
+
+    # Image.alpha_composite (AlphaComposite.c, 7 precision bits). Where the overlay is transparent
+    # the coefficient is 0 and both formulas hand back the base pixel unchanged.
+    if opaque:
+        coef = plan.opaque_coef
+        base[3] = plan.opaque_alpha
+    else:
+        outa255 = base[3] * plan.over_inv
+        outa255 += plan.over_a255
+        coef = plan.over_coef // np.maximum(outa255, 1)
+        base[3] = _div255(outa255)
+    rgb = base[:3]
+    rgb *= 255 * 128 - coef
+    rgb += plan.over_rgb * coef
+    rgb += 0x80 << 7
+    rgb += rgb >> 8
+    rgb >>= 15
+
+    if plan.soft is not None:
+        # ImageChops.soft_light, clipped like CHOP2; base alpha is kept.
+        inv = 255 - rgb
+        screen = inv * plan.soft_inv
+        screen //= 255
+        np.subtract(255, screen, out=screen)
+        screen *= rgb
+        screen //= 255
+        lit = rgb * plan.soft
+        lit *= inv
+        lit >>= 16
+        lit += screen
+        np.clip(lit, 0, 255, out=lit)
+        if plan.soft_alpha is None:
+            rgb[...] = lit
+        else:
+            rgb *= 255 - plan.soft_alpha
+            lit *= plan.soft_alpha
+            rgb += lit
+            _div255(rgb)
+    return base
+
+
+def _record_plan(
+    mask_img: Image.Image | TemplateAsset,
+    overlay_img: Image.Image | TemplateAsset,
+    softlight_img: Optional[Image.Image | TemplateAsset],
+    bbox: tuple[int, int, int, int],
+) -> _RecordPlan:
+    # Plans live on the mask asset, keyed by the overlay/soft-light objects they were built from.
+    plans = mask_img.plans if isinstance(mask_img, TemplateAsset) else {}
+    key = ("record", id(overlay_img), id(softlight_img))
+    plan = plans.get(key)
+    if plan is not None and plan.sources[0] is overlay_img and plan.sources[1] is softlight_img:
+        return plan
+
+    main_mask, trim_mask = _template_key_masks(mask_img)
+    w, h = main_mask.size
+
+    def planar(img: Image.Image, box: tuple[int, int, int, int]) -> "np.ndarray":
+        arr = np.asarray(img.crop(box), dtype=np.int32)
+        return np.ascontiguousarray(arr.reshape(arr.shape[0] * arr.shape[1], -1).T)[:, None]
+
+    def layers(box: tuple[int, int, int, int]) -> _RecordPlan:
+        main = planar(main_mask, box)[0, 0]
+        trim = planar(trim_mask, box)[0, 0]
+        over = planar(_template_cleaned_overlay(overlay_img), box)
+        soft = soft_alpha = None
+        if soft_src is not None:
+            soft = planar(soft_src, box)
+            # _apply_softlight_rgba only blends by the soft-light alpha when it has any coverage.
+            soft_alpha = soft[3, 0] if soft_any else None
+        mask = main + trim
+        # With an opaque cover the composited base alpha is DIV255(255 * key) == key.
+        over_a = over[3, 0]
+        opaque_a255 = mask * (255 - over_a) + over_a * 255
+        return _RecordPlan(
+            bbox=box,
+            mask=mask,
+            trim=trim > 0 if trim.any() else None,
+            over_rgb=over[:3],
+            over_a255=over_a * 255,
+            over_inv=255 - over_a,
+            over_coef=over_a * (255 * 255 * 128),
+            opaque_coef=over_a * (255 * 255 * 128) // np.maximum(opaque_a255, 1),
+            opaque_alpha=_div255(opaque_a255),
+            soft=soft[:3] if soft is not None else None,
+            soft_inv=255 - soft[:3] if soft is not None else None,
+            soft_alpha=soft_alpha,
+        )
+
+    soft_src = None
+    soft_any = False
+    if softlight_img is not None:
+        soft_src = _template_image(softlight_img).convert("RGBA")
+        if soft_src.size != (w, h):
+            soft_src = soft_src.resize((w, h), Image.LANCZOS)
+        soft_any = bool(soft_src.getchannel("A").getbbox())
+
+    # The backdrop is the kernel's answer for an empty label over the whole frame.
+    full = layers((0, 0, w, h))
+    backdrop = _record_kernel(np.zeros((4, 1, w * h), dtype=np.int32), full, None)
+    plan = layers(bbox)
+    plan.backdrop = Image.fromarray(np.ascontiguousarray(backdrop[:, 0].T.reshape(h, w, 4)).astype(np.uint8), "RGBA")
+    plan.sources = (overlay_img, softlight_img)
+    plans[key] = plan
+    return plan
+
+
+def _stack_chunks(crops: "np.ndarray") -> Iterator["np.ndarray"]:
+    # Slices of about COMPOSE_BATCH_PIXELS pixels, so kernel temporaries stay cache-sized for big stacks.
+    step = max(1, COMPOSE_BATCH_PIXELS // max(1, crops.shape[1] * crops.shape[2]))
+    for i in range(0, crops.shape[0], step):
+        yield crops[i : i + step]
+
+
+def _stack_planar(crops: "np.ndarray") -> Iterator["np.ndarray"]:
+    # (covers, h, w, 4) uint8 -> planar (4, covers, h * w) int32, chunk by chunk.
+    for chunk in _stack_chunks(crops):
+        yield chunk.reshape(chunk.shape[0], -1, 4).transpose(2, 0, 1).astype(np.int32, order="C")
+
+
+def _paste_stack_rows(rows: "np.ndarray", backdrop: Image.Image, box: tuple[int, int, int, int]) -> list[Image.Image]:
+    # Planar (4, covers, bw * bh) results pasted over a copy of the backdrop at box (x, y, w, h).
+    x, y, bw, bh = box
+    rows = rows.astype(np.uint8)
+    out = []
+    for i in range(rows.shape[1]):
+        img = backdrop.copy()
+        img.paste(Image.merge("RGBA", [Image.fromarray(band.reshape(bh, bw)) for band in rows[:, i]]), (x, y))
+        out.append(img)
+    return out
+
+
+def _compose_record_stack(
+    crops: "np.ndarray",
+    mask_img: Image.Image | TemplateAsset,
+    overlay_img: Image.Image | TemplateAsset,
+    mul: Optional[int],
+    softlight_img: Optional[Image.Image | TemplateAsset],
+    bbox: tuple[int, int, int, int],
+) -> list[Image.Image]:
+    # Only the mask bbox depends on the cover; the rest of the frame is the plan's backdrop.
+    plan = _record_plan(mask_img, overlay_img, softlight_img, bbox)
+    bx0, by0, bx1, by1 = bbox
+    out = []
+    for src in _stack_planar(crops):
+        out.extend(_paste_stack_rows(_record_kernel(src, plan, mul), plan.backdrop, (bx0, by0, bx1 - bx0, by1 - by0)))
+    return out
+
+
+def _record_cover_crop(source: Image.Image, tw: int, th: int, pixelate_to: Optional[int] = None) -> Image.Image:
+    src = source.convert("RGBA")
+    if pixelate_to is not None and pixelate_to > 0:
+        # Build a tiny square color sample, then scale up with nearest-neighbor
+        # to keep blocky 6x6-like cover colors.
+        sampled = _letterbox_square_image(src).resize((pixelate_to, pixelate_to), Image.LANCZOS)
+        sampled = ImageEnhance.Color(sampled).enhance(1.2)
+        sampled = ImageEnhance.Brightness(sampled).enhance(1.08)
+        return sampled.resize((tw, th), Image.NEAREST)
+    # Use cover+crop fitting (not contain) so non-square covers always fill
+    # the label region without transparent bands.
+    scale = max(tw / max(1, src.width), th / max(1, src.height))
+    nw = max(1, int(src.width * scale))
+    nh = max(1, int(src.height * scale))
+    resized = src.resize((nw, nh), Image.LANCZOS)
+    cx = max(0, (nw - tw) // 2)
+    cy = max(0, (nh - th) // 2)
+    return resized.crop((cx, cy, cx + tw, cy + th))
+
+
+def _record_trim_mul(trim_mask: Image.Image, trim_darken_factor: float) -> Optional[int]:
+    if not trim_mask.getbbox():
+        return None
+    return max(0, min(255, int(round(255.0 * trim_darken_factor))))
+
+
+def _record_label_box(mask_img: Image.Image | TemplateAsset) -> Optional[tuple[int, int, int, int]]:
+    return ImageChops.lighter(*_template_key_masks(mask_img)).getbbox()
+
+
 def compose_record_with_mask_overlay(
     source: Image.Image,
-    mask_img: Image.Image,
-    overlay_img: Image.Image,
+    mask_img: Image.Image | TemplateAsset,
+    overlay_img: Image.Image | TemplateAsset,
     pixelate_to: Optional[int] = None,
     trim_darken_factor: float = (214.0 / 255.0),
-    softlight_img: Optional[Image.Image] = None,
+    softlight_img: Optional[Image.Image | TemplateAsset] = None,
 ) -> Image.Image:
     base = Image.new("RGBA", overlay_img.size, (0, 0, 0, 0))
-    main_mask, trim_mask = _red_key_dual_masks(mask_img)
-    region_mask = ImageChops.lighter(main_mask, trim_mask)
-    bbox = region_mask.getbbox()
+    main_mask, trim_mask = _template_key_masks(mask_img)
+    bbox = _record_label_box(mask_img)
     if not bbox:
         return compose_with_template(source, overlay_img)
 
     bx0, by0, bx1, by1 = bbox
-    tw, th = bx1 - bx0, by1 - by0
-    src = source.convert("RGBA")
-    if pixelate_to is not None and pixelate_to > 0:
-        # Build a tiny square color sample, then scale up with nearest-neighbor
-        # to keep blocky 6x6-like cover colors.
-        sampled = _letterbox_square_image(src).resize((pixelate_to, pixelate_to), Image.LANCZOS)
-        sampled = ImageEnhance.Color(sampled).enhance(1.2)
-        sampled = ImageEnhance.Brightness(sampled).enhance(1.08)
-        crop = sampled.resize((tw, th), Image.NEAREST)
-    else:
-        # Use cover+crop fitting (not contain) so non-square covers always fill
-        # the label region without transparent bands.
-        scale = max(tw / max(1, src.width), th / max(1, src.height))
-        nw = max(1, int(src.width * scale))
-        nh = max(1, int(src.height * scale))
-        resized = src.resize((nw, nh), Image.LANCZOS)
-        cx = max(0, (nw - tw) // 2)
-        cy = max(0, (nh - th) // 2)
-        crop = resized.crop((cx, cy, cx + tw, cy + th))
+    crop = _record_cover_crop(source, bx1 - bx0, by1 - by0, pixelate_to)
+
+    mul = _record_trim_mul(trim_mask, trim_darken_factor)
+    if np is not None:
+        return _compose_record_stack(np.asarray(crop.convert("RGBA"))[None], mask_img, overlay_img, mul, softlight_img, bbox)[0]
 
     layer = Image.new("RGBA", overlay_img.size, (0, 0, 0, 0))
     layer.paste(crop, (bx0, by0), crop)
 
     base = Image.composite(layer, base, main_mask)
-    if trim_mask.getbbox():
-        mul = max(0, min(255, int(round(255.0 * trim_darken_factor))))
+    if mul is not None:
         gray_mul = Image.new("RGBA", layer.size, (mul, mul, mul, 255))
         dark_layer = ImageChops.multiply(layer, gray_mul)
         base = Image.composite(dark_layer, base, trim_mask)
-    cleaned_overlay = _clear_low_alpha_noise(overlay_img, alpha_threshold=8)
-    base.alpha_composite(cleaned_overlay)
+    base.alpha_composite(_template_cleaned_overlay(overlay_img))
     if softlight_img is not None:
-        base = _apply_softlight_rgba(base, softlight_img)
+        base = _apply_softlight_rgba(base, _template_image(softlight_img))
     return base
 
 
+def stack_record_crops(
+    sources: Iterable[Image.Image],
+    mask_img: Image.Image | TemplateAsset,
+    pixelate_to: Optional[int] = None,
+) -> "np.ndarray":
+    # Covers fitted to a record mask's label box, stacked for compose_record_batch.
+    bbox = _record_label_box(mask_img)
+    if not bbox:
+        raise ValueError("Record mask has no key-colour region")
+    bx0, by0, bx1, by1 = bbox
+    return np.stack([np.asarray(_record_cover_crop(src, bx1 - bx0, by1 - by0, pixelate_to).convert("RGBA")) for src in sources])
+
+
+def compose_record_batch(
+    crops: "np.ndarray",
+    mask_img: Image.Image | TemplateAsset,
+    overlay_img: Image.Image | TemplateAsset,
+    trim_darken_factor: float = (214.0 / 255.0),
+    softlight_img: Optional[Image.Image | TemplateAsset] = None,
+) -> list[Image.Image]:
+    # compose_record_with_mask_overlay for N covers already fitted to the label box ((N, h, w, 4)
+    # uint8, see stack_record_crops). Template work is shared through the cached _RecordPlan and
+    # the whole stack runs through the kernel at once.
+    bbox = _record_label_box(mask_img)
+    if not bbox:
+        raise ValueError("Record mask has no key-colour region")
+    bx0, by0, bx1, by1 = bbox
+    if crops.ndim != 4 or crops.shape[1:] != (by1 - by0, bx1 - bx0, 4):
+        raise ValueError(f"Expected crops of shape (N, {by1 - by0}, {bx1 - bx0}, 4), got {crops.shape}")
+    mul = _record_trim_mul(_template_key_masks(mask_img)[1], trim_darken_factor)
+    return _compose_record_stack(crops, mask_img, overlay_img, mul, softlight_img, bbox)
+
+
+@dataclass
+class TemplateAsset:
+    # One template PNG in RGBA plus whatever derived data its role needs. Compose helpers fill
+    # missing fields on first use, so an asset is only ever analysed once per build.
+    image: Image.Image
+    mask: Optional[Image.Image] = None
+    bbox: Optional[tuple[int, int, int, int]] = None
+    main_mask: Optional[Image.Image] = None
+    trim_mask: Optional[Image.Image] = None
+    cleaned: Optional[Image.Image] = None
+    digest: str = ""
+    name: str = ""
+    plans: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.image.size
+
+
+_TEMPLATE_ASSET_FIELDS = ("image", "mask", "main_mask", "trim_mask", "cleaned")
+_TEMPLATE_BUNDLES: dict[str, dict[str, TemplateAsset]] = {}
+
+
+def _template_image(tpl: Image.Image | TemplateAsset) -> Image.Image:
+    return tpl.image if isinstance(tpl, TemplateAsset) else tpl.convert("RGBA")
+
+
+def _template_mask_and_bbox(tpl: Image.Image | TemplateAsset):
+    if not isinstance(tpl, TemplateAsset):
+        return detect_template_mask_and_bbox(tpl)
+    if tpl.mask is None or tpl.bbox is None:
+        tpl.mask, tpl.bbox = detect_template_mask_and_bbox(tpl.image)
+    return tpl.mask, tpl.bbox
+
+
+def _template_key_masks(tpl: Image.Image | TemplateAsset) -> tuple[Image.Image, Image.Image]:
+    if not isinstance(tpl, TemplateAsset):
+        return _red_key_dual_masks(tpl)
+    if tpl.main_mask is None or tpl.trim_mask is None:
+        tpl.main_mask, tpl.trim_mask = _red_key_dual_masks(tpl.image)
+    return tpl.main_mask, tpl.trim_mask
+
+
+def _template_cleaned_overlay(tpl: Image.Image | TemplateAsset) -> Image.Image:
+    if not isinstance(tpl, TemplateAsset):
+        return _clear_low_alpha_noise(tpl, alpha_threshold=8)
+    if tpl.cleaned is None:
+        tpl.cleaned = _clear_low_alpha_noise(tpl.image, alpha_threshold=8)
+    return tpl.cleaned
+
+
+def _compile_template_asset(path: Path) -> TemplateAsset:
+    with Image.open(path) as im:
+        return _compile_template_image(im.convert("RGBA"), path.stem.lower())
+
+
+def _compile_template_image(image: Image.Image, role: str) -> TemplateAsset:
+    asset = TemplateAsset(image=image)
+    if role.endswith("_mask"):
+        _template_key_masks(asset)
+    elif role.endswith("_overlay"):
+        _template_cleaned_overlay(asset)
+    elif not role.endswith("_softlight"):
+        _template_mask_and_bbox(asset)
+    return asset
+
+
+def _scaled_template(tpl: TemplateAsset, size: tuple[int, int]) -> TemplateAsset:
+    # The template resampled to an output size and compiled like a loaded one, kept on the source
+    # asset. Key masks and UV maps use nearest neighbour so their key colours survive the resize.
+    if tpl.size == size:
+        return tpl
+    scaled = tpl.plans.get(("scaled", size))
+    if scaled is None:
+        role = Path(tpl.name).stem.lower()
+        resample = Image.LANCZOS if role.endswith(("_overlay", "_softlight")) else Image.NEAREST
+        scaled = _compile_template_image(tpl.image.resize(size, resample), role)
+        scaled.name = tpl.name
+        scaled.digest = f"{tpl.digest}@{size[0]}x{size[1]}"
+        tpl.plans[("scaled", size)] = scaled
+    return scaled
+
+
+def _template_bundle_path(tpl_dir: Path, key: str) -> Path:
+    folder_tag = hashlib.sha1(os.path.normcase(str(tpl_dir.resolve())).encode("utf-8")).hexdigest()[:8]
+    return app_root() / TEMPLATE_BUNDLE_FOLDER_NAME / f"{folder_tag}-{key[:20]}.smbtpl"
+
+
+def _encode_image_info(info: dict) -> dict:
+    # Image.info travels with composites into saved PNGs (icc_profile, gamma, ...), so keep it.
+    out = {}
+    for k, v in info.items():
+        if isinstance(v, bytes):
+            out[k] = ["b", base64.b64encode(v).decode("ascii")]
+        elif isinstance(v, tuple):
+            out[k] = ["t", list(v)]
+        elif isinstance(v, (str, int, float)):
+            out[k] = ["v", v]
+    return out
+
+
+def _decode_image_info(raw: dict) -> dict:
+    info = {}
+    for k, (kind, v) in raw.items():
+        info[k] = base64.b64decode(v) if kind == "b" else tuple(v) if kind == "t" else v
+    return info
+
+
+def _pack_template_bundle(key: str, assets: dict[str, TemplateAsset]) -> bytes:
+    # Header JSON describes every layer; the raw pixel bytes follow as one zlib stream.
+    header: dict = {"version": TEMPLATE_BUNDLE_VERSION, "key": key, "assets": {}}
+    chunks: list[bytes] = []
+    offset = 0
+    for name, asset in assets.items():
+        layers = {}
+        for layer in _TEMPLATE_ASSET_FIELDS:
+            img = getattr(asset, layer)
+            if img is None:
+                continue
+            raw = img.tobytes()
+            layers[layer] = [img.mode, img.width, img.height, offset, len(raw), _encode_image_info(img.info)]
+            chunks.append(raw)
+            offset += len(raw)
+        header["assets"][name] = {"bbox": list(asset.bbox) if asset.bbox else None, "layers": layers}
+    head = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return TEMPLATE_BUNDLE_MAGIC + len(head).to_bytes(4, "little") + head + zlib.compress(b"".join(chunks), 6)
+
+
+def _unpack_template_bundle(data: bytes, key: str) -> Optional[dict[str, TemplateAsset]]:
+    try:
+        if not data.startswith(TEMPLATE_BUNDLE_MAGIC):
+            return None
+        pos = len(TEMPLATE_BUNDLE_MAGIC)
+        head_len = int.from_bytes(data[pos : pos + 4], "little")
+        header = json.loads(data[pos + 4 : pos + 4 + head_len].decode("utf-8"))
+        if header.get("version") != TEMPLATE_BUNDLE_VERSION or header.get("key") != key:
+            return None
+        blob = zlib.decompress(data[pos + 4 + head_len :])
+        assets: dict[str, TemplateAsset] = {}
+        for name, rec in header["assets"].items():
+            layers = {}
+            for layer, (mode, w, h, off, length, info) in rec["layers"].items():
+                img = Image.frombytes(mode, (w, h), blob[off : off + length])
+                img.info.update(_decode_image_info(info))
+                layers[layer] = img
+            bbox = rec.get("bbox")
+            assets[name] = TemplateAsset(bbox=tuple(bbox) if bbox else None, **layers)
+        return assets
+    except Exception:
+        return None
+
+
+def load_template_bundle(tpl_dir: Path, names: Iterable[str], required: Iterable[str] = ()) -> dict[str, TemplateAsset]:
+    # Compiled templates for one build, keyed by file name. Only files that exist are returned.
+    # The bundle is keyed by the files' content hashes, kept in memory for the process and on disk
+    # under the app folder so later builds skip decoding and mask analysis entirely.
+    for name in required:
+        if not (tpl_dir / name).is_file():
+            raise SystemExit(f"Template not found: {tpl_dir / name}")
+    present: dict[str, Path] = {}
+    file_digests: dict[str, str] = {}
+    digest = hashlib.sha1(f"smbtpl{TEMPLATE_BUNDLE_VERSION}".encode("ascii"))
+    for name in sorted(set(names)):
+        path = tpl_dir / name
+        try:
+            data = path.read_bytes()
+        except OSError:
+            continue
+        present[name] = path
+        file_digests[name] = hashlib.sha1(data).hexdigest()
+        digest.update(name.encode("utf-8") + b"\0" + bytes.fromhex(file_digests[name]))
+    key = digest.hexdigest()
+    cached = _TEMPLATE_BUNDLES.get(key)
+    if cached is not None:
+        return cached
+    bundle_path = _template_bundle_path(tpl_dir, key)
+    assets = None
+    try:
+        assets = _unpack_template_bundle(bundle_path.read_bytes(), key)
+    except OSError:
+        pass
+    if assets is None or set(assets) != set(present):
+        assets = {name: _compile_template_asset(path) for name, path in present.items()}
+        tmp = bundle_path.with_name(bundle_path.name + ".tmp")
+        try:
+            bundle_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(_pack_template_bundle(key, assets))
+            os.replace(tmp, bundle_path)
+            # Drop bundles compiled from older versions of the same template folder.
+            prefix = bundle_path.name.split("-", 1)[0] + "-"
+            for old in bundle_path.parent.glob(prefix + "*.smbtpl"):
+                if old != bundle_path:
+                    old.unlink()
+        except Exception:
+            try:
+                tmp.unlink()
+            except Exception:
+                pass
+    for name, asset in assets.items():
+        asset.digest = file_digests[name]
+        asset.name = name
+    _TEMPLATE_BUNDLES[key] = assets
+    return assets
+
+
+def _texture_cache_enabled() -> bool:
+    return os.environ.get("SMB_TEXTURE_CACHE", "").strip().lower() not in ("0", "off", "false", "no")
+
+
+class TextureCache:
+    # Content-addressed store of generated texture PNGs shared by all builds. Keys cover everything
+    # that shapes the output (source hashes, template hashes, compose function and parameters), so a
+    # hit is copied into the pack instead of composing the image again.
+    def __init__(self, root: Optional[Path] = None, enabled: Optional[bool] = None):
+        self.root = root or (app_root() / TEXTURE_CACHE_FOLDER_NAME)
+        self.enabled = _texture_cache_enabled() if enabled is None else enabled
+        self.hits = 0
+        self.misses = 0
+        self._file_digests: dict[Path, str] = {}
+
+    def file_digest(self, path: Path) -> str:
+        digest = self._file_digests.get(path)
+        if digest is None:
+            indexed = COVER_INDEX.cached(path)
+            digest = indexed.sha1 if indexed is not None else _file_sha1(path)
+            self._file_digests[path] = digest
+        return digest
+
+    @staticmethod
+    def key(kind: str, *parts) -> str:
+        norm = [TEXTURE_CACHE_VERSION, Image.__version__, kind]
+        for part in parts:
+            if isinstance(part, TemplateAsset):
+                norm.append(part.digest)
+            elif part is None:
+                norm.append("")
+            else:
+                norm.append(part)
+        return hashlib.sha1(json.dumps(norm, separators=(",", ":"), sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.png"
+
+    def fetch(self, target: Path, key: str) -> bool:
+        # Outputs are copied, never linked, so later edits to a pack cannot reach the cache.
+        if not self.enabled:
+            return False
+        entry = self._entry(key)
+        try:
+            shutil.copyfile(entry, target)
+        except OSError:
+            return False
+        self.hits += 1
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return True
+
+    def store(self, target: Path, key: str) -> None:
+        self.misses += 1
+        if not self.enabled:
+            return
+        entry = self._entry(key)
+        tmp = entry.with_name(entry.name + f".{os.getpid()}.tmp")
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(target, tmp)
+            os.replace(tmp, entry)
+        except Exception:
+            try:
+                tmp.unlink()
+            except Exception:
+                pass
+
+    def prune(self, max_bytes: int = TEXTURE_CACHE_MAX_BYTES) -> None:
+        # Least recently used entries go first once the cache grows past max_bytes.
+        if not self.enabled or not self.root.is_dir():
+            return
+        entries: list[FileStat] = []
+        for folder in _scan_dir_entries(self.root)[1]:
+            entries.extend(st for st in scan_dir_files(self.root / folder).values() if st.path.suffix == ".png")
+        total = sum(st.size for st in entries)
+        for st in sorted(entries, key=lambda st: st.mtime_ns):
+            if total <= max_bytes:
+                break
+            try:
+                st.path.unlink()
+            except OSError:
+                continue
+            total -= st.size
+
+    def report(self) -> None:
+        if self.enabled and (self.hits or self.misses):
+            _safe_console_print(f"Texture cache: {self.hits} reused, {self.misses} generated")
+
+
+class CoverCache:
+    # Decoded cover working copies for one build. Once their pixel bytes pass max_bytes the least
+    # recently used go first; the newest cover always stays, so a budget of 0 keeps just that one.
+    def __init__(self, max_bytes: int = COVER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.loads = 0
+        self._images: OrderedDict[Path, Image.Image] = OrderedDict()
+
+    def open(self, path: Path) -> Image.Image:
+        img = self._images.get(path)
+        if img is not None:
+            self._images.move_to_end(path)
+            return img
+        img = load_cover_image(path)
+        self.loads += 1
+        self._images[path] = img
+        self.bytes += img.width * img.height * len(img.getbands())
+        while self.bytes > self.max_bytes and len(self._images) > 1:
+            self.release(next(iter(self._images)))
+        return img
+
+    def release(self, path: Path) -> None:
+        # Dropped rather than closed: a compose running on this cover may still hold it.
+        img = self._images.pop(path, None)
+        if img is not None:
+            self.bytes -= img.width * img.height * len(img.getbands())
+
+    def clear(self) -> None:
+        self._images.clear()
+        self.bytes = 0
+
+
+def _cover_cache_bytes(args) -> int:
+    try:
+        return max(0, int(getattr(args, "cover_cache_mb", None) or COVER_CACHE_MAX_BYTES // (1024 * 1024))) * 1024 * 1024
+    except (TypeError, ValueError):
+        return COVER_CACHE_MAX_BYTES
+
+
+def _open_cover(cover_cache: CoverCache, cover_path: Path) -> Image.Image:
+    return cover_cache.open(cover_path)
+
+
+@dataclass
+class TextureJob:
+    # One generated PNG, described by template names and plain parameters so it can cross into a
+    # worker process. An optional "size" param resizes the composite to a square before saving.
+    # Kind "copy" duplicates an earlier job's output (params["source"]) inside the pack.
+    kind: str
+    target: Path
+    templates: tuple[str, ...] = ()
+    params: dict = field(default_factory=dict)
+
+
+def _parse_texture_size(value: str, default: str = "native") -> str:
+    raw = str(value or "").strip().lower()
+    return raw if raw in TEXTURE_SIZE_POLICIES else default
+
+
+def _next_pow2(n: int) -> int:
+    return 1 << max(0, n - 1).bit_length()
+
+
+def _pad_pow2(img: Image.Image) -> Image.Image:
+    size = (_next_pow2(img.width), _next_pow2(img.height))
+    if size == img.size:
+        return img
+    out = Image.new("RGBA", size, (0, 0, 0, 0))
+    out.paste(img, ((size[0] - img.width) // 2, (size[1] - img.height) // 2))
+    out.info.update(img.info)
+    return out
+
+
+def apply_texture_size(jobs: list[TextureJob], policy: str, world_dir: Path) -> None:
+    # Power-of-two policies compose world textures from templates scaled to policy x policy (they are
+    # UV mapped, so the aspect ratio is free) and centre item icons on the next power-of-two canvas.
+    if policy == "native":
+        return
+    for job in jobs:
+        if job.target.parent == world_dir:
+            job.params.pop("size", None)
+            job.params["template_size"] = int(policy)
+        elif job.kind != "copy":
+            job.params["pad_pow2"] = True
+
+
+def _texture_vram_bytes(w: int, h: int) -> int:
+    # RGBA8 plus a full mip chain, about a third on top of the base level.
+    return w * h * 4 * 4 // 3
+
+
+_TEXTURE_WORKER_TEMPLATES: dict[str, TemplateAsset] = {}
+# Workers keep only their latest cover; songs sharing art are submitted back to back.
+_TEXTURE_WORKER_COVERS = CoverCache(max_bytes=0)
+
+
+def _texture_worker_count() -> int:
+    raw = os.environ.get("SMB_TEXTURE_WORKERS", "").strip()
+    if raw.isdigit():
+        return int(raw)
+    return max(1, min(8, (os.cpu_count() or 1) - 1))
+
+
+def _render_texture_jobs(
+    cover_path: Path,
+    jobs: list[TextureJob],
+    templates: dict[str, TemplateAsset],
+    cover_cache: CoverCache,
+    png_profile: str = "default",
+) -> tuple[int, int]:
+    written = baseline = 0
+    for job in jobs:
+        params = dict(job.params)
+        if job.kind == "hr_cover":
+            w, b = _save_hr_cover(
+                cover_path, job.target, image=_open_cover(cover_cache, cover_path), png_profile=png_profile, **params
+            )
+            written += w
+            baseline += b
+            continue
+        tpls = [templates[name] if name else None for name in job.templates]
+        size = params.pop("size", None)
+        side = params.pop("template_size", None)
+        pad = params.pop("pad_pow2", False)
+        if side:
+            tpls = [_scaled_template(tpl, (side, side)) if tpl is not None else None for tpl in tpls]
+        cover = _open_cover(cover_cache, cover_path)
+        if job.kind == "with_template":
+            img = compose_with_template(cover, tpls[0])
+        elif job.kind == "record_mask_overlay":
+            img = compose_record_with_mask_overlay(cover, tpls[0], tpls[1], softlight_img=tpls[2], **params)
+        elif job.kind == "item_album_with_skew":
+            img = compose_item_album_with_skew(cover, tpls[0], **params)
+        else:
+            raise ValueError(f"Unknown texture job: {job.kind}")
+        if size:
+            img = img.resize((size, size), Image.LANCZOS)
+        if pad:
+            img = _pad_pow2(img)
+        w, b = save_png(img, job.target, png_profile)
+        written += w
+        baseline += b
+    return written, baseline
+
+
+def _texture_worker_init(tpl_dir: Optional[Path], names: list[str]) -> None:
+    if tpl_dir is not None and names:
+        _TEXTURE_WORKER_TEMPLATES.update(load_template_bundle(tpl_dir, names))
+
+
+def _texture_worker_run(cover_path: Path, jobs: list[TextureJob], png_profile: str) -> tuple[int, int]:
+    return _render_texture_jobs(cover_path, jobs, _TEXTURE_WORKER_TEMPLATES, _TEXTURE_WORKER_COVERS, png_profile)
+
+
+class TexturePipeline:
+    # Per-song texture jobs for a build. Cache hits are copied on the calling thread and misses are
+    # composed by a process pool whose workers load the same compiled template bundle. Completion
+    # callbacks always run on the calling thread in submission order, so track events keep song order.
+    def __init__(
+        self,
+        textures: TextureCache,
+        cover_cache: CoverCache,
+        tpl_dir: Optional[Path] = None,
+        templates: Optional[dict[str, TemplateAsset]] = None,
+        workers: Optional[int] = None,
+        png_profile: str = "default",
+        ship_hr: bool = True,
+    ):
+        self.textures = textures
+        self.cover_cache = cover_cache
+        self.tpl_dir = tpl_dir
+        self.templates = templates or {}
+        self.workers = _texture_worker_count() if workers is None else workers
+        self.png_profile = _parse_png_profile(png_profile)
+        self.ship_hr = ship_hr
+        self.png_written = 0
+        self.png_baseline = 0
+        # Estimated GPU memory per group ("textures" / "hr"): [files, bytes, bytes if padded to power-of-two].
+        # HR covers written outside the pack are not loaded by the game and count in no group.
+        self.vram: dict[str, list[int]] = {}
+        self._groups: dict[Path, str] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: deque[
+            tuple[Optional[Future], list[tuple[Path, str]], list[TextureJob], list[Path], Callable[[], None]]
+        ] = deque()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_texture_worker_init,
+                initargs=(self.tpl_dir, list(self.templates)),
+            )
+        return self._pool
+
+    def submit(self, cover_path: Optional[Path], jobs: list[TextureJob], on_done: Callable[[], None]) -> None:
+        misses: list[tuple[TextureJob, str]] = []
+        # Copies wait in the queue: their source belongs to an earlier submission, which has
+        # finished by the time this entry reaches the head.
+        for job in jobs:
+            if job.kind == "copy":
+                self._groups[job.target] = self._groups.get(Path(job.params["source"]), "textures")
+            else:
+                self._groups[job.target] = ("hr" if self.ship_hr else "") if job.kind == "hr_cover" else "textures"
+        targets = [job.target for job in jobs]
+        copies = [job for job in jobs if job.kind == "copy"]
+        jobs = [job for job in jobs if job.kind != "copy"]
+        if jobs:
+            cover_digest = self.textures.file_digest(cover_path)
+            for job in jobs:
+                tpls = [self.templates.get(name) if name else None for name in job.templates]
+                key = self.textures.key(job.kind, cover_digest, *tpls, job.params, self.png_profile)
+                if not self.textures.fetch(job.target, key):
+                    misses.append((job, key))
+        future = None
+        if misses:
+            todo = [job for job, _ in misses]
+            if self.workers > 1:
+                future = self._executor().submit(_texture_worker_run, cover_path, todo, self.png_profile)
+            else:
+                self._count(_render_texture_jobs(cover_path, todo, self.templates, self.cover_cache, self.png_profile))
+        self._pending.append((future, [(job.target, key) for job, key in misses], copies, targets, on_done))
+        self.pump()
+
+    def pump(self, wait: bool = False) -> None:
+        while self._pending:
+            future, stored, copies, targets, on_done = self._pending[0]
+            if future is not None:
+                if not wait and not future.done():
+                    return
+                try:
+                    self._count(future.result())
+                except BaseException:
+                    self.close()
+                    raise
+            self._pending.popleft()
+            for target, key in stored:
+                self.textures.store(target, key)
+            for job in copies:
+                shutil.copyfile(job.params["source"], job.target)
+            self._measure(targets)
+            on_done()
+
+    def release(self, cover_path: Path) -> None:
+        # In-process jobs are composed inside submit(), so a cover can go once its last song is in.
+        self.cover_cache.release(cover_path)
+
+    def _count(self, sizes: tuple[int, int]) -> None:
+        self.png_written += sizes[0]
+        self.png_baseline += sizes[1]
+
+    def _measure(self, targets: list[Path]) -> None:
+        for target in targets:
+            group = self._groups.get(target, "textures")
+            if not group:
+                continue
+            try:
+                with Image.open(target) as im:
+                    w, h = im.size
+            except (OSError, ValueError):
+                continue
+            totals = self.vram.setdefault(group, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += _texture_vram_bytes(w, h)
+            totals[2] += _texture_vram_bytes(_next_pow2(w), _next_pow2(h))
+
+    def finish(self) -> None:
+        self.pump(wait=True)
+        self.close()
+
+    def report(self) -> None:
+        if self.vram:
+            parts = []
+            for group, label in (("textures", "textures"), ("hr", "HR covers")):
+                files, size, padded = self.vram.get(group, (0, 0, 0))
+                if files:
+                    part = f"{label} {size / (1024 * 1024):.1f} MB ({files} files)"
+                    if padded != size:
+                        part += f", {padded / (1024 * 1024):.1f} MB if padded to power-of-two"
+                    parts.append(part)
+            _safe_console_print("Estimated VRAM: " + "; ".join(parts))
+        if not self.png_written or self.png_profile == "default":
+            return
+        line = f"PNG {self.png_profile} profile: {self.png_written // 1024} KB written"
+        if self.png_baseline:
+            saved = self.png_baseline - self.png_written
+            line += f", {saved // 1024} KB ({saved * 100 / self.png_baseline:.1f}%) saved vs default"
+        _safe_console_print(line)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
 def build_cassette(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = None) -> Path:
     ordered_oggs = [Path(p) for p in (getattr(args, "ordered_oggs", None) or [])]
-    oggs = [p for p in ordered_oggs if p.exists() and p.is_file() and p.suffix.lower() == ".ogg"] or find_oggs(args.audio_dir)
+    oggs = [p for p in ordered_oggs if p.exists() and p.is_file() and p.suffix.lower() == ".ogg"] or find_oggs(args.audio_dir, getattr(args, "catalog", None))
     if not oggs:
         raise SystemExit(f"No .ogg files found in: {args.audio_dir}")
     if args.custom_cassettes and (not getattr(args, "cover", None) or not args.cover.is_file()) and not getattr(args, "song_covers", None):
@@ -1660,7 +4264,10 @@ def build_cassette(args, on_track: Optional[Callable[[BuildTrackEvent], None]] =
     if args.seed is not None:
         random.seed(args.seed)
 
-    paths = build_mod_layout(args.out_dir, args.mod_id)
+    hr_policy = resolve_hr_policy(getattr(args, "hr_textures", "auto"), getattr(args, "png_profile", "default"))
+    hr_size = _hr_max_size(hr_policy, getattr(args, "hr_size", HR_DOWNSAMPLE_SIZE))
+    paths = build_mod_layout(args.out_dir, args.mod_id, hr_policy)
+    _report_hr_policy(paths, hr_policy, hr_size)
     write_mod_info(
         paths["mod_base"],
         paths["v42"],
@@ -1684,6 +4291,7 @@ def build_cassette(args, on_track: Optional[Callable[[BuildTrackEvent], None]] =
         args.workshop_cover,
         args.name,
         add_name_overlay=bool(getattr(args, "add_name_to_poster", True)),
+        hr_max_size=hr_size,
     )
     standalone_defs_module = "TCMusicDefenitions"
     if bool(getattr(args, "standalone_bundle", False)):
@@ -1695,8 +4303,12 @@ def build_cassette(args, on_track: Optional[Callable[[BuildTrackEvent], None]] =
     models = [f"module {args.mod_id}", "{", "\timports", "\t{", "\t\tBase", "\t}", ""]
     musicdefs = [f'require "{standalone_defs_module}"', ""]
     cassette_assignments: list[tuple[str, int]] = []
-    cover_cache: dict[Path, Image.Image] = {}
+    texture_sets: dict[str, str] = {}
+    cover_cache = CoverCache(_cover_cache_bytes(args))
+    textures = TextureCache()
 
+    tpl_dir: Optional[Path] = None
+    templates: dict[str, TemplateAsset] = {}
     t_item_uv = None
     t_item_mask = None
     t_item_overlay = None
@@ -1709,16 +4321,50 @@ def build_cassette(args, on_track: Optional[Callable[[BuildTrackEvent], None]] =
         if not tpl_base.exists():
             tpl_base = args.assets_root / "templatte"
         tpl_dir = tpl_base / "cassette" if (tpl_base / "cassette").exists() else tpl_base
-        t_item_uv = Image.open(tpl_dir / "item_TMCassette_uv.png")
-        t_world_uv = Image.open(tpl_dir / "TMCassette_uv.png")
-        t_item_mask = Image.open(tpl_dir / "item_TMCassette_Mask.png") if (tpl_dir / "item_TMCassette_Mask.png").exists() else None
-        t_item_overlay = Image.open(tpl_dir / "item_TMCassette_Overlay.png") if (tpl_dir / "item_TMCassette_Overlay.png").exists() else None
-        t_world_mask = Image.open(tpl_dir / "TMCassette_Mask.png") if (tpl_dir / "TMCassette_Mask.png").exists() else None
-        t_world_overlay = Image.open(tpl_dir / "TMCassette_Overlay.png") if (tpl_dir / "TMCassette_Overlay.png").exists() else None
+        uv_names = ["item_TMCassette_uv.png", "TMCassette_uv.png"]
+        templates = load_template_bundle(
+            tpl_dir,
+            uv_names
+            + ["item_TMCassette_Mask.png", "item_TMCassette_Overlay.png", "TMCassette_Mask.png", "TMCassette_Overlay.png"],
+            required=uv_names,
+        )
+        t_item_uv = templates["item_TMCassette_uv.png"]
+        t_world_uv = templates["TMCassette_uv.png"]
+        t_item_mask = templates.get("item_TMCassette_Mask.png")
+        t_item_overlay = templates.get("item_TMCassette_Overlay.png")
+        t_world_mask = templates.get("TMCassette_Mask.png")
+        t_world_overlay = templates.get("TMCassette_Overlay.png")
 
     song_b_sides = getattr(args, "song_b_sides", {}) or {}
     song_display_names = getattr(args, "song_display_names", {}) or {}
+    pipeline = TexturePipeline(
+        textures,
+        cover_cache,
+        tpl_dir,
+        templates,
+        png_profile=getattr(args, "png_profile", "default"),
+        ship_hr=hr_policy in ("ship", "downsample"),
+    )
+
+    def song_done(index: int, title: str, thumb: Optional[Path], generated: Optional[Path]) -> None:
+        if generated is not None and generated.exists():
+            thumb = generated
+        if on_track:
+            on_track(BuildTrackEvent(index=index, total=total_tracks, title=title, thumbnail=thumb))
+
     song_use_random_cassette = set(getattr(args, "song_use_random_cassette", []) or [])
+    cover_aliases: dict[Path, Path] = {}
+    cover_last_song: dict[Path, int] = {}
+    if args.custom_cassettes:
+        song_covers = getattr(args, "song_covers", None) or {}
+        planned = {idx: song_covers.get(ogg.name, args.cover) for idx, ogg in enumerate(oggs, start=1) if ogg.name not in song_use_random_cassette}
+        cover_aliases = plan_cover_aliases(
+            planned.values(),
+            collapse=bool(getattr(args, "collapse_similar_covers", False)),
+        )
+        # Each decoded cover is released after the last song using it.
+        for idx, cover in planned.items():
+            cover_last_song[cover_aliases.get(cover, cover)] = idx
     total_tracks = len(oggs)
     used_item_ids: set[str] = set()
     for idx, ogg in enumerate(oggs, start=1):
@@ -1728,6 +4374,9 @@ def build_cassette(args, on_track: Optional[Callable[[BuildTrackEvent], None]] =
         icon = ""
         model_name = ""
         thumb_path: Optional[Path] = None
+        generated_thumb: Optional[Path] = None
+        cover_path: Optional[Path] = None
+        song_jobs: list[TextureJob] = []
         side_b_path = None
         side_b_out_name: str | None = None
         use_random_for_song = (not args.custom_cassettes) or (ogg.name in song_use_random_cassette)
@@ -1746,48 +4395,61 @@ def build_cassette(args, on_track: Optional[Callable[[BuildTrackEvent], None]] =
             if getattr(args, "song_covers", None):
                 cover_path = args.song_covers.get(ogg.name, args.cover)
             thumb_path = cover_path
-            if cover_path not in cover_cache:
-                cover_cache[cover_path] = Image.open(cover_path).convert("RGBA")
-            cover = cover_cache[cover_path]
-            _save_hr_cover(cover_path, paths["hr"] / f"Cassette_{iid}.png")
+            cover_path = cover_aliases.get(cover_path, cover_path)
+            # Songs sharing a cover share one texture set, named after the first of them. HR covers
+            # are looked up per item, so those keep per-song names and are copied rather than redrawn.
+            tex_id = texture_sets.setdefault(textures.file_digest(cover_path), iid)
+            if "hr" in paths:
+                hr_png = paths["hr"] / f"Cassette_{iid}.png"
+                if tex_id == iid:
+                    song_jobs.append(TextureJob("hr_cover", hr_png, params={"max_size": hr_size}))
+                else:
+                    song_jobs.append(TextureJob("copy", hr_png, params={"source": str(paths["hr"] / f"Cassette_{tex_id}.png")}))
 
-            icon = f"TMCassette_{iid}"
+            icon = f"TMCassette_{tex_id}"
             model_name = f"TMCassette_{iid}"
             cassette_assignments.append((disp, -1))
 
-            item_png = f"item_TMCassette_{iid}.png"
-            world_png = f"TMCassette_{iid}.png"
+            item_png = f"item_TMCassette_{tex_id}.png"
+            world_png = f"TMCassette_{tex_id}.png"
+            set_jobs: list[TextureJob] = []
 
             if t_item_mask is not None and t_item_overlay is not None:
-                compose_record_with_mask_overlay(
-                    cover,
-                    t_item_mask,
-                    t_item_overlay,
-                    trim_darken_factor=0.5,
-                ).save(paths["textures"] / item_png)
+                set_jobs.append(
+                    TextureJob(
+                        "record_mask_overlay",
+                        paths["textures"] / item_png,
+                        (t_item_mask.name, t_item_overlay.name, ""),
+                        {"trim_darken_factor": 0.5},
+                    )
+                )
             else:
-                compose_with_template(cover, t_item_uv).save(paths["textures"] / item_png)
+                set_jobs.append(TextureJob("with_template", paths["textures"] / item_png, (t_item_uv.name,)))
 
             if t_world_mask is not None and t_world_overlay is not None:
-                compose_record_with_mask_overlay(
-                    cover,
-                    t_world_mask,
-                    t_world_overlay,
-                    trim_darken_factor=0.5,
-                ).save(paths["wtextures"] / world_png)
+                set_jobs.append(
+                    TextureJob(
+                        "record_mask_overlay",
+                        paths["wtextures"] / world_png,
+                        (t_world_mask.name, t_world_overlay.name, ""),
+                        {"trim_darken_factor": 0.5},
+                    )
+                )
             else:
-                compose_with_template(cover, t_world_uv).save(paths["wtextures"] / world_png)
+                set_jobs.append(TextureJob("with_template", paths["wtextures"] / world_png, (t_world_uv.name,)))
+
+            if tex_id == iid:
+                apply_texture_size(set_jobs, getattr(args, "texture_size", "native"), paths["wtextures"])
+                song_jobs.extend(set_jobs)
 
             generated_thumb = paths["wtextures"] / world_png
-            if generated_thumb.exists():
-                thumb_path = generated_thumb
 
             models.extend(
                 [
                     f"\tmodel {model_name}",
                     "\t{",
                     "\t\tmesh = WorldItems/TCTape,",
-                    f"\t\ttexture = WorldItems/TMCassette_{iid},",
+                    f"\t\ttexture = WorldItems/TMCassette_{tex_id},",
                     "\t\tscale = 0.0005,",
                     "\t}",
                     "",
@@ -1869,8 +4531,9 @@ def build_cassette(args, on_track: Optional[Callable[[BuildTrackEvent], None]] =
             )
             musicdefs.append(f'GlobalMusic["Cassette{iid}SideB"] = "{CASSETTE_TILE}"')
 
-        if on_track:
-            on_track(BuildTrackEvent(index=idx, total=total_tracks, title=disp_script, thumbnail=thumb_path))
+        pipeline.submit(cover_path, song_jobs, partial(song_done, idx, disp_script, thumb_path, generated_thumb))
+        if cover_path is not None and cover_last_song.get(cover_path) == idx:
+            pipeline.release(cover_path)
 
     sounds.append("}")
     items.append("}")
@@ -1906,33 +4569,28 @@ def build_cassette(args, on_track: Optional[Callable[[BuildTrackEvent], None]] =
         _safe_console_print("----------------------")
         for idx, (name, _) in enumerate(cassette_assignments, start=1):
             _safe_console_print(f"{idx:>2}. {name}: generated from selected cover")
+    pipeline.finish()
+    pipeline.report()
+    textures.report()
+    textures.prune()
 
-    for im in cover_cache.values():
-        try:
-            im.close()
-        except Exception:
-            pass
-    for im in (t_item_uv, t_item_mask, t_item_overlay, t_world_uv, t_world_mask, t_world_overlay):
-        if im is None:
-            continue
-        try:
-            im.close()
-        except Exception:
-            pass
-
+    cover_cache.clear()
     prune_empty_dirs(paths["media"])
     return paths["root"]
 
 
 def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = None) -> Path:
     ordered_oggs = [Path(p) for p in (getattr(args, "ordered_oggs", None) or [])]
-    oggs = [p for p in ordered_oggs if p.exists() and p.is_file() and p.suffix.lower() == ".ogg"] or find_oggs(args.audio_dir)
+    oggs = [p for p in ordered_oggs if p.exists() and p.is_file() and p.suffix.lower() == ".ogg"] or find_oggs(args.audio_dir, getattr(args, "catalog", None))
     if not oggs:
         raise SystemExit(f"No .ogg files found in: {args.audio_dir}")
     if args.custom_vinyls and (not getattr(args, "cover", None) or not args.cover.is_file()):
         raise SystemExit(f"Cover not found: {args.cover}")
 
-    paths = build_mod_layout(args.out_dir, args.mod_id)
+    hr_policy = resolve_hr_policy(getattr(args, "hr_textures", "auto"), getattr(args, "png_profile", "default"))
+    hr_size = _hr_max_size(hr_policy, getattr(args, "hr_size", HR_DOWNSAMPLE_SIZE))
+    paths = build_mod_layout(args.out_dir, args.mod_id, hr_policy)
+    _report_hr_policy(paths, hr_policy, hr_size)
     write_mod_info(
         paths["mod_base"],
         paths["v42"],
@@ -1956,6 +4614,7 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
         args.workshop_cover,
         args.name,
         add_name_overlay=bool(getattr(args, "add_name_to_poster", True)),
+        hr_max_size=hr_size,
     )
     standalone_defs_module = "TCMusicDefenitions"
     if bool(getattr(args, "standalone_bundle", False)):
@@ -1966,13 +4625,15 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
     vinyl_art_placement = _parse_vinyl_art_placement(getattr(args, "vinyl_art_placement", "inside"), default="inside")
     song_vinyl_art_placement = getattr(args, "song_vinyl_art_placement", {}) or {}
     song_use_random_vinyl = set(getattr(args, "song_use_random_vinyl", []) or [])
-    cover_cache: dict[Path, Image.Image] = {}
+    cover_cache = CoverCache(_cover_cache_bytes(args))
+    textures = TextureCache()
 
     tpl_base = args.assets_root / "template"
     if not tpl_base.exists():
         tpl_base = args.assets_root / "templatte"
     tpl_dir = tpl_base / "vinyl" if (tpl_base / "vinyl").exists() else tpl_base
 
+    templates: dict[str, TemplateAsset] = {}
     t_item_album = None
     t_item_record = None
     t_item_record_inside_mask = None
@@ -1991,31 +4652,38 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
     needs_random_pool = (not args.custom_vinyls) or bool(song_use_random_vinyl)
 
     if args.custom_vinyls:
-        item_album_new = tpl_dir / "item_TMVinylalbum_uv_new.png"
-        t_item_album = Image.open(item_album_new if item_album_new.exists() else (tpl_dir / "item_TMVinylalbum_uv.png"))
-        t_item_record = Image.open(tpl_dir / "item_TMVinylrecord_uv.png")
-        t_album = Image.open(tpl_dir / "TMVinylalbum_uv.png")
-        t_record = Image.open(tpl_dir / "TMVinylrecord_uv.png")
-        t_item_record_inside_mask = Image.open(tpl_dir / "item_TMVinylrecord_Mask.png") if (tpl_dir / "item_TMVinylrecord_Mask.png").exists() else None
-        t_item_record_inside_overlay = Image.open(tpl_dir / "item_TMVinylrecord_Overlay.png") if (tpl_dir / "item_TMVinylrecord_Overlay.png").exists() else None
-        t_record_inside_mask = Image.open(tpl_dir / "TMVinylrecord_Mask.png") if (tpl_dir / "TMVinylrecord_Mask.png").exists() else None
-        t_record_inside_overlay = Image.open(tpl_dir / "TMVinylrecord_Overlay.png") if (tpl_dir / "TMVinylrecord_Overlay.png").exists() else None
-
-        world_outer_mask = tpl_dir / "TMVinylrecord_Outer_Mask.png"
-        world_outer_overlay = tpl_dir / "TMVinylrecord_Outer_Overlay.png"
-        world_outer_softlight = tpl_dir / "TMVinylrecord_Outer_SoftLight.png"
-        if world_outer_mask.exists() and world_outer_overlay.exists():
-            t_record_outside_mask = Image.open(world_outer_mask)
-            t_record_outside_overlay = Image.open(world_outer_overlay)
-            t_record_outside_softlight = Image.open(world_outer_softlight) if world_outer_softlight.exists() else None
-
-        item_outer_mask = tpl_dir / "item_TMVinylrecord_Outer_Mask.png"
-        item_outer_overlay = tpl_dir / "item_TMVinylrecord_Outer_Overlay.png"
-        item_outer_softlight = tpl_dir / "item_TMVinylrecord_Outer_SoftLight.png"
-        if item_outer_mask.exists() and item_outer_overlay.exists():
-            t_item_record_outside_mask = Image.open(item_outer_mask)
-            t_item_record_outside_overlay = Image.open(item_outer_overlay)
-            t_item_record_outside_softlight = Image.open(item_outer_softlight) if item_outer_softlight.exists() else t_record_outside_softlight
+        item_album_name = "item_TMVinylalbum_uv_new.png"
+        if not (tpl_dir / item_album_name).exists():
+            item_album_name = "item_TMVinylalbum_uv.png"
+        uv_names = [item_album_name, "item_TMVinylrecord_uv.png", "TMVinylalbum_uv.png", "TMVinylrecord_uv.png"]
+        templates = load_template_bundle(
+            tpl_dir,
+            uv_names
+            + [
+                f"{prefix}TMVinylrecord_{part}.png"
+                for prefix in ("item_", "")
+                for part in ("Mask", "Overlay", "Outer_Mask", "Outer_Overlay", "Outer_SoftLight")
+            ],
+            required=uv_names,
+        )
+        t_item_album = templates[item_album_name]
+        t_item_record = templates["item_TMVinylrecord_uv.png"]
+        t_album = templates["TMVinylalbum_uv.png"]
+        t_record = templates["TMVinylrecord_uv.png"]
+        t_item_record_inside_mask = templates.get("item_TMVinylrecord_Mask.png")
+        t_item_record_inside_overlay = templates.get("item_TMVinylrecord_Overlay.png")
+        t_record_inside_mask = templates.get("TMVinylrecord_Mask.png")
+        t_record_inside_overlay = templates.get("TMVinylrecord_Overlay.png")
+
+        if "TMVinylrecord_Outer_Mask.png" in templates and "TMVinylrecord_Outer_Overlay.png" in templates:
+            t_record_outside_mask = templates["TMVinylrecord_Outer_Mask.png"]
+            t_record_outside_overlay = templates["TMVinylrecord_Outer_Overlay.png"]
+            t_record_outside_softlight = templates.get("TMVinylrecord_Outer_SoftLight.png")
+
+        if "item_TMVinylrecord_Outer_Mask.png" in templates and "item_TMVinylrecord_Outer_Overlay.png" in templates:
+            t_item_record_outside_mask = templates["item_TMVinylrecord_Outer_Mask.png"]
+            t_item_record_outside_overlay = templates["item_TMVinylrecord_Outer_Overlay.png"]
+            t_item_record_outside_softlight = templates.get("item_TMVinylrecord_Outer_SoftLight.png", t_record_outside_softlight)
     if needs_random_pool:
         assets_tex = args.assets_root / "textures"
         rec_icon = _collect_numbered_variants(assets_tex / "Icons" / "Vinyl", "Item_TCVinylrecord")
@@ -2051,9 +4719,38 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
     models = [f"module {module_name}", "{", "\timports", "\t{", "\t\tBase", "\t}", ""]
     musicdefs = [f'require "{standalone_defs_module}"', ""]
     random_assignments: list[tuple[str, int, int]] = []
+    texture_sets: dict[str, str] = {}
+    hr_sets: dict[str, str] = {}
 
     song_b_sides = getattr(args, "song_b_sides", {}) or {}
     song_display_names = getattr(args, "song_display_names", {}) or {}
+    pipeline = TexturePipeline(
+        textures,
+        cover_cache,
+        tpl_dir,
+        templates,
+        png_profile=getattr(args, "png_profile", "default"),
+        ship_hr=hr_policy in ("ship", "downsample"),
+    )
+
+    def song_done(index: int, title: str, thumb: Optional[Path], generated: Optional[Path]) -> None:
+        if generated is not None and generated.exists():
+            thumb = generated
+        if on_track:
+            on_track(BuildTrackEvent(index=index, total=total_tracks, title=title, thumbnail=thumb))
+
+    cover_aliases: dict[Path, Path] = {}
+    cover_last_song: dict[Path, int] = {}
+    if args.custom_vinyls:
+        song_covers = getattr(args, "song_covers", None) or {}
+        planned = {idx: song_covers.get(ogg.name, args.cover) for idx, ogg in enumerate(oggs, start=1) if ogg.name not in song_use_random_vinyl}
+        cover_aliases = plan_cover_aliases(
+            planned.values(),
+            collapse=bool(getattr(args, "collapse_similar_covers", False)),
+        )
+        # Each decoded cover is released after the last song using it.
+        for idx, cover in planned.items():
+            cover_last_song[cover_aliases.get(cover, cover)] = idx
     total_tracks = len(oggs)
     used_item_ids: set[str] = set()
     for idx, ogg in enumerate(oggs, start=1):
@@ -2061,6 +4758,9 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
         disp = str(song_display_names.get(ogg.name) or display_name_from_file(ogg))
         disp_script = _pz_safe_display_text(disp)
         thumb_path: Optional[Path] = None
+        generated_thumb: Optional[Path] = None
+        cover_path: Optional[Path] = None
+        song_jobs: list[TextureJob] = []
         use_random_for_song = (not args.custom_vinyls) or (ogg.name in song_use_random_vinyl)
         side_b_path = None
         side_b_out_name: str | None = None
@@ -2077,10 +4777,15 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
             if getattr(args, "song_covers", None):
                 cover_path = args.song_covers.get(ogg.name, args.cover)
             thumb_path = cover_path
-            if cover_path not in cover_cache:
-                cover_cache[cover_path] = Image.open(cover_path).convert("RGBA")
-            cover = cover_cache[cover_path]
-            _save_hr_cover(cover_path, paths["hr"] / f"VinylAlbum_{iid}.png")
+            cover_path = cover_aliases.get(cover_path, cover_path)
+            # HR covers are looked up per item, so shared covers are copied rather than redrawn.
+            if "hr" in paths:
+                hr_id = hr_sets.setdefault(textures.file_digest(cover_path), iid)
+                hr_png = paths["hr"] / f"VinylAlbum_{iid}.png"
+                if hr_id == iid:
+                    song_jobs.append(TextureJob("hr_cover", hr_png, params={"max_size": hr_size}))
+                else:
+                    song_jobs.append(TextureJob("copy", hr_png, params={"source": str(paths["hr"] / f"VinylAlbum_{hr_id}.png")}))
         else:
             record_n = random.choice(record_variants)
             album_n = random.choice(album_variants)
@@ -2096,28 +4801,34 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
         ogg_out_name = _safe_audio_output_name(ogg.name)
         shutil.copy2(ogg, paths["sound"] / ogg_out_name)
 
-        item_album_png = f"item_TMVinylalbum_{iid}.png"
-        item_record_png = f"item_TMVinylrecord_{iid}.png"
-        album_png = f"TMVinylalbum_{iid}.png"
-        record_png = f"TMVinylrecord_{iid}.png"
-        item_album_icon = f"TMVinylalbum_{iid}"
-        item_record_icon = f"TMVinylrecord_{iid}"
-        album_texture_id = f"WorldItems/{album_png[:-4]}"
-        record_texture_id = f"WorldItems/{record_png[:-4]}"
-
+        # Songs sharing a cover and placement share one texture set, named after the first of them.
+        tex_id = iid
         if not use_random_for_song:
             per_song_placement = _parse_vinyl_art_placement(
                 song_vinyl_art_placement.get(ogg.name, vinyl_art_placement),
                 default=vinyl_art_placement,
             )
-            compose_item_album_with_skew(
-                cover,
-                t_item_album,
-                target_w=23,
-                target_h=32,
-                bl_up_px=9,
-                tr_down_px=9,
-            ).save(paths["textures"] / item_album_png)
+            tex_id = texture_sets.setdefault(f"{textures.file_digest(cover_path)}:{per_song_placement}", iid)
+
+        item_album_png = f"item_TMVinylalbum_{tex_id}.png"
+        item_record_png = f"item_TMVinylrecord_{tex_id}.png"
+        album_png = f"TMVinylalbum_{tex_id}.png"
+        record_png = f"TMVinylrecord_{tex_id}.png"
+        item_album_icon = f"TMVinylalbum_{tex_id}"
+        item_record_icon = f"TMVinylrecord_{tex_id}"
+        album_texture_id = f"WorldItems/{album_png[:-4]}"
+        record_texture_id = f"WorldItems/{record_png[:-4]}"
+
+        if not use_random_for_song:
+            set_jobs: list[TextureJob] = []
+            set_jobs.append(
+                TextureJob(
+                    "item_album_with_skew",
+                    paths["textures"] / item_album_png,
+                    (t_item_album.name,),
+                    {"target_w": 23, "target_h": 32, "bl_up_px": 9, "tr_down_px": 9},
+                )
+            )
             item_mask = t_item_record_inside_mask
             item_overlay = t_item_record_inside_overlay
             world_mask = t_record_inside_mask
@@ -2144,29 +4855,33 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
                     item_softlight = world_softlight
 
             if item_mask is not None and item_overlay is not None:
-                compose_record_with_mask_overlay(
-                    cover,
-                    item_mask,
-                    item_overlay,
-                    pixelate_to=6,
-                    softlight_img=item_softlight,
-                ).resize((32, 32), Image.LANCZOS).save(paths["textures"] / item_record_png)
+                set_jobs.append(
+                    TextureJob(
+                        "record_mask_overlay",
+                        paths["textures"] / item_record_png,
+                        (item_mask.name, item_overlay.name, item_softlight.name if item_softlight is not None else ""),
+                        {"pixelate_to": 6, "size": 32},
+                    )
+                )
             else:
-                compose_with_template(cover, t_item_record).resize((32, 32), Image.LANCZOS).save(paths["textures"] / item_record_png)
-            compose_with_template(cover, t_album).resize((150, 150), Image.LANCZOS).save(paths["wtextures"] / album_png)
+                set_jobs.append(TextureJob("with_template", paths["textures"] / item_record_png, (t_item_record.name,), {"size": 32}))
+            set_jobs.append(TextureJob("with_template", paths["wtextures"] / album_png, (t_album.name,), {"size": 150}))
             if world_mask is not None and world_overlay is not None:
-                compose_record_with_mask_overlay(
-                    cover,
-                    world_mask,
-                    world_overlay,
-                    softlight_img=world_softlight,
-                ).resize((150, 150), Image.LANCZOS).save(paths["wtextures"] / record_png)
+                set_jobs.append(
+                    TextureJob(
+                        "record_mask_overlay",
+                        paths["wtextures"] / record_png,
+                        (world_mask.name, world_overlay.name, world_softlight.name if world_softlight is not None else ""),
+                        {"size": 150},
+                    )
+                )
             else:
-                compose_with_template(cover, t_record).resize((150, 150), Image.LANCZOS).save(paths["wtextures"] / record_png)
+                set_jobs.append(TextureJob("with_template", paths["wtextures"] / record_png, (t_record.name,), {"size": 150}))
+            if tex_id == iid:
+                apply_texture_size(set_jobs, getattr(args, "texture_size", "native"), paths["wtextures"])
+                song_jobs.extend(set_jobs)
 
             generated_thumb = paths["wtextures"] / record_png
-            if generated_thumb.exists():
-                thumb_path = generated_thumb
         else:
             item_album_icon = f"TCAlbum{album_n}"
             item_record_icon = f"TCVinylrecord{record_n}"
@@ -2268,8 +4983,9 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
             )
             musicdefs.append(f'GlobalMusic["Vinyl{iid}SideB"] = "{VINYL_TILE}"')
 
-        if on_track:
-            on_track(BuildTrackEvent(index=idx, total=total_tracks, title=disp_script, thumbnail=thumb_path))
+        pipeline.submit(cover_path, song_jobs, partial(song_done, idx, disp_script, thumb_path, generated_thumb))
+        if cover_path is not None and cover_last_song.get(cover_path) == idx:
+            pipeline.release(cover_path)
 
     sounds.append("}")
     items.append("}")
@@ -2289,35 +5005,12 @@ def build_vinyl(args, on_track: Optional[Callable[[BuildTrackEvent], None]] = No
     if args.custom_vinyls and any(name not in song_use_random_vinyl for name in [p.name for p in oggs]):
         _safe_console_print("")
         _safe_console_print(f"Custom Vinyl Art Placement: {vinyl_art_placement}")
+    pipeline.finish()
+    pipeline.report()
+    textures.report()
+    textures.prune()
 
-    for im in cover_cache.values():
-        try:
-            im.close()
-        except Exception:
-            pass
-    for im in (
-        t_item_album,
-        t_item_record,
-        t_item_record_inside_mask,
-        t_item_record_inside_overlay,
-        t_item_record_outside_mask,
-        t_item_record_outside_overlay,
-        t_item_record_outside_softlight,
-        t_album,
-        t_record,
-        t_record_inside_mask,
-        t_record_inside_overlay,
-        t_record_outside_mask,
-        t_record_outside_overlay,
-        t_record_outside_softlight,
-    ):
-        if im is None:
-            continue
-        try:
-            im.close()
-        except Exception:
-            pass
-
+    cover_cache.clear()
     prune_empty_dirs(paths["media"])
     return paths["root"]
 
@@ -2364,6 +5057,10 @@ def build_mod_from_config(config: dict, on_track: Optional[Callable[[BuildTrackE
         args.ordered_oggs = [Path(p).resolve() for p in args.ordered_oggs]
     args.parent_mod_id = str(getattr(args, "parent_mod_id", "TrueMoozic") or "").strip()
     args.standalone_bundle = bool(getattr(args, "standalone_bundle", False))
+    args.png_profile = _parse_png_profile(getattr(args, "png_profile", "default"))
+    args.collapse_similar_covers = bool(getattr(args, "collapse_similar_covers", False))
+    args.texture_size = _parse_texture_size(getattr(args, "texture_size", "native"))
+    args.hr_textures = resolve_hr_policy(getattr(args, "hr_textures", "auto"), args.png_profile)
 
     args.audio_dir = audio_cache_root(args.audio_dir)
     if mode == "vinyl":
@@ -2376,15 +5073,21 @@ def build_mod_from_config(config: dict, on_track: Optional[Callable[[BuildTrackE
     return build_cassette(args, on_track=on_track)
 
 
-def build_mixed_from_config(config: dict, on_track: Optional[Callable[[BuildTrackEvent], None]] = None) -> Path:
+def build_mixed_from_config(
+    config: dict,
+    on_track: Optional[Callable[[BuildTrackEvent], None]] = None,
+    catalog: Optional[Catalog] = None,
+) -> Path:
     base_audio_dir = Path(config.get("audio_dir", default_audio_root())).resolve()
     workshop_cover_raw = config.get("workshop_cover")
     fallback_cover = Path(workshop_cover_raw).resolve() if workshop_cover_raw else (default_poster_root() / "poster.png").resolve()
     if not fallback_cover.exists():
         raise SystemExit(f"Fallback cover not found: {fallback_cover}")
 
-    all_oggs = collect_available_oggs(base_audio_dir)
-    ogg_by_name = {p.name: p for p in all_oggs}
+    # Reuse the caller's catalog (the UI keeps one live) instead of rescanning the audio folders.
+    if catalog is None or catalog.audio_dir.resolve() != base_audio_dir:
+        catalog = Catalog(base_audio_dir).refresh()
+    ogg_by_name = catalog.available_oggs()
 
     track_modes = config.get("track_modes") or {}
     cassette_oggs: list[Path] = []
@@ -2406,12 +5109,22 @@ def build_mixed_from_config(config: dict, on_track: Optional[Callable[[BuildTrac
 
     for ogg_name, mode_cfg in track_modes.items():
         ogg_path = ogg_by_name.get(ogg_name)
+        if ogg_path is not None and not ogg_path.exists():
+            ogg_path = None
+        # Songs flagged as duplicates are built like any other if they stay ticked; Find Duplicates offers to untick them.
+        if ogg_path is None:
+            # Catalog mixes that were never rendered get rendered here, with or without a source_path.
+            entry = catalog.get(ogg_name)
+            if entry is not None and is_mix_recipe(entry.source):
+                ogg_path = render_mix_recipe(entry.source, base_audio_dir)
         if ogg_path is None:
             source_override = mode_cfg.get("source_path")
             if source_override:
                 src = Path(source_override)
                 if src.exists() and src.is_file():
-                    if src.suffix.lower() == ".ogg":
+                    if is_mix_recipe(src):
+                        ogg_path = render_mix_recipe(src, base_audio_dir)
+                    elif src.suffix.lower() == ".ogg":
                         ogg_path = src
                     else:
                         try:
@@ -2598,6 +5311,36 @@ def parse_args() -> argparse.Namespace:
     )
     common.add_argument("--convert-audio", action="store_true", help="Convert supported audio into Conversions cache before build")
     common.add_argument("--force-rebuild-ogg", action="store_true", help="Force rebuild all cached OGG files")
+    common.add_argument(
+        "--png-profile",
+        choices=PNG_PROFILES,
+        default="default",
+        help="Texture PNG encoding: draft (fast), default, release (max compression, palette icons)",
+    )
+    common.add_argument(
+        "--texture-size",
+        choices=TEXTURE_SIZE_POLICIES,
+        default="native",
+        help="World texture size: native template sizes, or 128/256 power-of-two squares (item icons are padded to power-of-two)",
+    )
+    common.add_argument(
+        "--hr-textures",
+        choices=HR_TEXTURE_POLICIES,
+        default="auto",
+        help="HR covers: ship (full size), downsample (ship at --hr-size), side (folder next to the pack, not uploaded), off; auto = ship, off for draft PNG builds",
+    )
+    common.add_argument("--hr-size", type=int, default=HR_DOWNSAMPLE_SIZE, help="Max HR cover side for --hr-textures downsample")
+    common.add_argument(
+        "--cover-cache-mb",
+        type=int,
+        default=COVER_CACHE_MAX_BYTES // (1024 * 1024),
+        help="Memory budget for decoded covers during a build (least recently used covers are dropped first)",
+    )
+    common.add_argument(
+        "--collapse-similar-covers",
+        action="store_true",
+        help="Build look-alike covers (re-encodes, rescaled copies) from one canonical cover so they share textures",
+    )
 
     c = sub.add_parser("cassette", parents=[common], help="Build cassette pack")
     c.add_argument("--seed", type=int, help="Random seed for cassette texture picks")
@@ -2647,7 +5390,7 @@ def parse_args() -> argparse.Namespace:
             print(
                 "Conversion summary: "
                 f"total={summary['total']} converted={summary['converted']} copied={summary['copied']} "
-                f"skipped={summary['skipped']} failed={summary['failed']}"
+                f"skipped={summary['skipped']} failed={summary['failed']} duplicates={summary['duplicates']}"
             )
 
         proceed = input("Proceed? (y/n): ").strip().lower()
@@ -2773,7 +5516,7 @@ def main() -> int:
         print(
             "Conversion summary: "
             f"total={summary['total']} converted={summary['converted']} copied={summary['copied']} "
-            f"skipped={summary['skipped']} failed={summary['failed']}"
+            f"skipped={summary['skipped']} failed={summary['failed']} duplicates={summary['duplicates']}"
         )
 
     if args.mode == "cassette":
@@ -2786,6 +5529,7 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     interactive_launch = len(sys.argv) == 1
     try:
         code = main()
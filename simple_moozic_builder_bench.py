@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Cover-composition micro-benchmark and equivalence check.
+
+Generates synthetic covers (several sizes, aspect ratios, with and without alpha),
+times every texture compose function per call and a full synthetic pack, and
+compares pixel digests against a saved reference so faster kernels can land
+without visual regressions.
+
+Typical flow:
+- python simple_moozic_builder_bench.py --save-reference   (on the known-good tree)
+- python simple_moozic_builder_bench.py --check            (after changing a kernel)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import random
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from PIL import Image, ImageDraw
+
+import simple_moozic_builder as smb
+
+BENCH_FOLDER_NAME = ".smb_bench"
+BENCH_REFERENCE_VERSION = 1
+BENCH_SEED = 20240601
+
+# (name, width, height, mode, file format)
+SYNTHETIC_COVERS = (
+    ("square_640", 640, 640, "RGB", "PNG"),
+    ("square_3000_jpeg", 3000, 3000, "RGB", "JPEG"),
+    ("wide_1800x1200_jpeg", 1800, 1200, "RGB", "JPEG"),
+    ("tall_300x500_alpha", 300, 500, "RGBA", "PNG"),
+    ("banner_2400x600", 2400, 600, "RGB", "PNG"),
+    ("tiny_48_alpha", 48, 48, "RGBA", "PNG"),
+)
+
+
+@dataclass
+class BenchCase:
+    name: str
+    run: Callable[[Path, Image.Image, Path], Image.Image]
+
+
+@dataclass
+class BenchResult:
+    case: str
+    cover: str
+    calls: int
+    best_ms: float
+    median_ms: float
+    digest: str
+
+
+def default_reference_path() -> Path:
+    return smb.app_root() / BENCH_FOLDER_NAME / "reference.json"
+
+
+def make_synthetic_cover(name: str, width: int, height: int, mode: str) -> Image.Image:
+    # Smooth colour field plus hard-edged shapes, so resampling, edges and flat regions all get
+    # exercised. Seeded per cover name so every run produces the same pixels.
+    rng = random.Random(f"{BENCH_SEED}:{name}")
+    bands = 4 if mode == "RGBA" else 3
+    gw, gh = max(2, width // 64), max(2, height // 64)
+    grid = Image.new(mode, (gw, gh))
+    grid.putdata([tuple(rng.randrange(256) for _ in range(bands)) for _ in range(gw * gh)])
+    img = grid.resize((width, height), Image.BILINEAR)
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x0, y0 = rng.randrange(width), rng.randrange(height)
+        x1, y1 = x0 + rng.randrange(1, max(2, width // 3)), y0 + rng.randrange(1, max(2, height // 3))
+        fill = tuple(rng.randrange(256) for _ in range(bands))
+        if rng.random() < 0.5:
+            draw.ellipse((x0, y0, x1, y1), fill=fill)
+        else:
+            draw.rectangle((x0, y0, x1, y1), fill=fill)
+    if mode == "RGBA":
+        # Transparent border and a soft-alpha band, the cases masks and letterboxing care about.
+        alpha = Image.new("L", (width, height), 0)
+        ImageDraw.Draw(alpha).rectangle((width // 10, height // 10, width - width // 10, height - height // 10), fill=255)
+        alpha.paste(128, (0, height // 2, width, height // 2 + max(1, height // 12)))
+        img.putalpha(alpha)
+    return img
+
+
+def write_synthetic_covers(folder: Path) -> list[tuple[str, Path]]:
+    folder.mkdir(parents=True, exist_ok=True)
+    covers: list[tuple[str, Path]] = []
+    for name, width, height, mode, fmt in SYNTHETIC_COVERS:
+        path = folder / f"{name}.{'jpg' if fmt == 'JPEG' else 'png'}"
+        img = make_synthetic_cover(name, width, height, mode)
+        if fmt == "JPEG":
+            img.convert("RGB").save(path, format="JPEG", quality=92)
+        else:
+            img.save(path, format="PNG")
+        covers.append((name, path))
+    return covers
+
+
+def image_digest(img: Image.Image) -> str:
+    h = hashlib.sha256()
+    h.update(f"{img.mode}:{img.width}x{img.height}:".encode("ascii"))
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def _template_dir(assets_root: Path, kind: str) -> Path:
+    tpl_base = assets_root / "template"
+    if not tpl_base.exists():
+        tpl_base = assets_root / "templatte"
+    return tpl_base / kind if (tpl_base / kind).exists() else tpl_base
+
+
+@dataclass
+class BenchTemplates:
+    cassette_dir: Path
+    cassette: dict[str, smb.TemplateAsset]
+    vinyl_dir: Path
+    vinyl: dict[str, smb.TemplateAsset]
+    item_album: str
+
+
+def _load_templates(assets_root: Path) -> BenchTemplates:
+    cassette_dir = _template_dir(assets_root, "cassette")
+    cassette = smb.load_template_bundle(
+        cassette_dir,
+        ["item_TMCassette_uv.png", "TMCassette_uv.png"]
+        + [f"{prefix}TMCassette_{part}.png" for prefix in ("item_", "") for part in ("Mask", "Overlay")],
+        required=["item_TMCassette_uv.png", "TMCassette_uv.png"],
+    )
+    vinyl_dir = _template_dir(assets_root, "vinyl")
+    item_album = "item_TMVinylalbum_uv_new.png" if (vinyl_dir / "item_TMVinylalbum_uv_new.png").exists() else "item_TMVinylalbum_uv.png"
+    vinyl_uv = [item_album, "item_TMVinylrecord_uv.png", "TMVinylalbum_uv.png", "TMVinylrecord_uv.png"]
+    vinyl = smb.load_template_bundle(
+        vinyl_dir,
+        vinyl_uv
+        + [
+            f"{prefix}TMVinylrecord_{part}.png"
+            for prefix in ("item_", "")
+            for part in ("Mask", "Overlay", "Outer_Mask", "Outer_Overlay", "Outer_SoftLight")
+        ],
+        required=vinyl_uv,
+    )
+    return BenchTemplates(cassette_dir, cassette, vinyl_dir, vinyl, item_album)
+
+
+def build_cases(assets_root: Path, name_overlay: str = "Bench Pack") -> list[BenchCase]:
+    tpls = _load_templates(assets_root)
+    cassette, vinyl = tpls.cassette, tpls.vinyl
+    cases = [
+        BenchCase("with_template/cassette_item", lambda p, c, t: smb.compose_with_template(c, cassette["item_TMCassette_uv.png"])),
+        BenchCase("with_template/cassette_world", lambda p, c, t: smb.compose_with_template(c, cassette["TMCassette_uv.png"])),
+        BenchCase("with_template/vinyl_album", lambda p, c, t: smb.compose_with_template(c, vinyl["TMVinylalbum_uv.png"])),
+        BenchCase("with_template/vinyl_record", lambda p, c, t: smb.compose_with_template(c, vinyl["TMVinylrecord_uv.png"])),
+        BenchCase("item_album_with_skew", lambda p, c, t: smb.compose_item_album_with_skew(c, vinyl[tpls.item_album])),
+    ]
+
+    def record_case(name: str, mask: str, overlay: str, softlight: Optional[str], **params) -> None:
+        tm, to = vinyl.get(mask) or cassette.get(mask), vinyl.get(overlay) or cassette.get(overlay)
+        if tm is None or to is None:
+            return
+        ts = vinyl.get(softlight) if softlight else None
+        cases.append(
+            BenchCase(
+                f"record_mask_overlay/{name}",
+                lambda p, c, t: smb.compose_record_with_mask_overlay(c, tm, to, softlight_img=ts, **params),
+            )
+        )
+
+    record_case("cassette_item_trim", "item_TMCassette_Mask.png", "item_TMCassette_Overlay.png", None, trim_darken_factor=0.5)
+    record_case("cassette_world_trim", "TMCassette_Mask.png", "TMCassette_Overlay.png", None, trim_darken_factor=0.5)
+    record_case("inside_item_pixelate", "item_TMVinylrecord_Mask.png", "item_TMVinylrecord_Overlay.png", None, pixelate_to=6)
+    record_case("inside_world", "TMVinylrecord_Mask.png", "TMVinylrecord_Overlay.png", None)
+    record_case("outside_world", "TMVinylrecord_Outer_Mask.png", "TMVinylrecord_Outer_Overlay.png", None)
+    record_case(
+        "outside_world_softlight", "TMVinylrecord_Outer_Mask.png", "TMVinylrecord_Outer_Overlay.png", "TMVinylrecord_Outer_SoftLight.png"
+    )
+    record_case(
+        "outside_item_softlight",
+        "item_TMVinylrecord_Outer_Mask.png",
+        "item_TMVinylrecord_Outer_Overlay.png",
+        # build_vinyl falls back to the world soft-light layer when there is no item one.
+        "TMVinylrecord_Outer_SoftLight.png",
+        pixelate_to=6,
+    )
+
+    def hr_cover(path: Path, cover: Image.Image, tmp: Path) -> Image.Image:
+        target = tmp / "hr.png"
+        smb._save_hr_cover(path, target, max_size=2048, image=cover)
+        with Image.open(target) as out:
+            return out.copy()
+
+    cases.append(BenchCase("save_hr_cover", hr_cover))
+    cases.append(BenchCase("workshop_square/plain", lambda p, c, t: smb.render_workshop_square_image(p, 1024, name_overlay, False)))
+    cases.append(BenchCase("workshop_square/name_overlay", lambda p, c, t: smb.render_workshop_square_image(p, 1024, name_overlay, True)))
+    return cases
+
+
+def run_cases(
+    cases: list[BenchCase],
+    covers: list[tuple[str, Path]],
+    tmp: Path,
+    repeat: int,
+    only: Optional[str] = None,
+) -> list[BenchResult]:
+    results: list[BenchResult] = []
+    for cover_name, path in covers:
+        cover = smb.load_cover_image(path)
+        for case in cases:
+            if only and only not in case.name:
+                continue
+            times: list[float] = []
+            digest = ""
+            for i in range(max(1, repeat)):
+                start = time.perf_counter()
+                out = case.run(path, cover, tmp)
+                times.append((time.perf_counter() - start) * 1000.0)
+                if i == 0:
+                    digest = image_digest(out)
+            results.append(BenchResult(case.name, cover_name, len(times), min(times), statistics.median(times), digest))
+        cover.close()
+    return results
+
+
+def _pack_jobs(root: Path, index: int, item_album: str, outside: bool) -> tuple[list[smb.TextureJob], list[smb.TextureJob]]:
+    # Same job sets build_cassette and build_vinyl queue for one custom-art song.
+    sid = f"Song{index}"
+    part = "Outer_" if outside else ""
+    soft = "TMVinylrecord_Outer_SoftLight.png" if outside else ""
+    cassette_jobs = [
+        smb.TextureJob("hr_cover", root / f"HR_Cassette_{sid}.png", params={"max_size": 2048}),
+        smb.TextureJob(
+            "record_mask_overlay",
+            root / f"item_TMCassette_{sid}.png",
+            ("item_TMCassette_Mask.png", "item_TMCassette_Overlay.png", ""),
+            {"trim_darken_factor": 0.5},
+        ),
+        smb.TextureJob(
+            "record_mask_overlay",
+            root / f"TMCassette_{sid}.png",
+            ("TMCassette_Mask.png", "TMCassette_Overlay.png", ""),
+            {"trim_darken_factor": 0.5},
+        ),
+    ]
+    vinyl_jobs = [
+        smb.TextureJob("hr_cover", root / f"HR_VinylAlbum_{sid}.png", params={"max_size": 2048}),
+        smb.TextureJob(
+            "item_album_with_skew",
+            root / f"item_TMVinylalbum_{sid}.png",
+            (item_album,),
+            {"target_w": 23, "target_h": 32, "bl_up_px": 9, "tr_down_px": 9},
+        ),
+        smb.TextureJob(
+            "record_mask_overlay",
+            root / f"item_TMVinylrecord_{sid}.png",
+            (f"item_TMVinylrecord_{part}Mask.png", f"item_TMVinylrecord_{part}Overlay.png", soft),
+            {"pixelate_to": 6, "size": 32},
+        ),
+        smb.TextureJob("with_template", root / f"TMVinylalbum_{sid}.png", ("TMVinylalbum_uv.png",), {"size": 150}),
+        smb.TextureJob(
+            "record_mask_overlay",
+            root / f"TMVinylrecord_{sid}.png",
+            (f"TMVinylrecord_{part}Mask.png", f"TMVinylrecord_{part}Overlay.png", soft),
+            {"size": 150},
+        ),
+    ]
+    return cassette_jobs, vinyl_jobs
+
+
+def run_pack(
+    assets_root: Path,
+    covers: list[tuple[str, Path]],
+    tmp: Path,
+    songs: int,
+    workers: Optional[int],
+    png_profile: str,
+) -> tuple[float, int]:
+    # Whole-pack timing through the real TexturePipeline with the texture cache off: one custom
+    # cover per song, a cassette pass then a vinyl pass, alternating inside/outside placement.
+    tpls = _load_templates(assets_root)
+    root = tmp / "pack"
+    root.mkdir(parents=True, exist_ok=True)
+    plans = [_pack_jobs(root, i, tpls.item_album, outside=bool(i % 2)) for i in range(songs)]
+    done = 0
+
+    def on_done() -> None:
+        nonlocal done
+        done += 1
+
+    start = time.perf_counter()
+    for side, tpl_dir, templates in ((0, tpls.cassette_dir, tpls.cassette), (1, tpls.vinyl_dir, tpls.vinyl)):
+        cover_cache = smb.CoverCache()
+        pipeline = smb.TexturePipeline(
+            smb.TextureCache(enabled=False), cover_cache, tpl_dir, templates, workers=workers, png_profile=png_profile
+        )
+        for i, plan in enumerate(plans):
+            pipeline.submit(covers[i % len(covers)][1], plan[side], on_done)
+        pipeline.finish()
+        pipeline.report()
+        cover_cache.clear()
+    return time.perf_counter() - start, done
+
+
+def run_batches(assets_root: Path, covers: list[tuple[str, Path]], stack: int, repeat: int) -> list[str]:
+    # Batch API against one call per cover on the same pre-fitted crops. Batch outputs must match
+    # the regular compose of the original cover pixel for pixel; mismatches are returned.
+    tpls = _load_templates(assets_root)
+    cassette, vinyl = tpls.cassette, tpls.vinyl
+    images = [smb.load_cover_image(path) for _, path in covers]
+    sources = [images[i % len(images)] for i in range(max(1, stack))]
+    failures: list[str] = []
+    rows: list[tuple[str, float, float]] = []
+
+    def measure(name: str, single: Callable[[Image.Image], Image.Image], crops, batch: Callable, fitted: list[Image.Image]) -> None:
+        expected = [image_digest(single(src)) for src in sources]
+        got = [image_digest(img) for img in batch(crops)]
+        if got != expected:
+            failures.append(f"batch/{name}: differs from per-cover compose")
+        per_call = min(_timed(lambda: [single(img) for img in fitted]) for _ in range(max(1, repeat)))
+        batched = min(_timed(lambda: batch(crops)) for _ in range(max(1, repeat)))
+        rows.append((name, per_call / len(sources), batched / len(sources)))
+
+    for name, mask, overlay, soft, params in (
+        ("cassette_world_trim", cassette.get("TMCassette_Mask.png"), cassette.get("TMCassette_Overlay.png"), None, {"trim_darken_factor": 0.5}),
+        ("inside_world", vinyl.get("TMVinylrecord_Mask.png"), vinyl.get("TMVinylrecord_Overlay.png"), None, {}),
+        (
+            "outside_world_softlight",
+            vinyl.get("TMVinylrecord_Outer_Mask.png"),
+            vinyl.get("TMVinylrecord_Outer_Overlay.png"),
+            vinyl.get("TMVinylrecord_Outer_SoftLight.png"),
+            {},
+        ),
+    ):
+        if mask is None or overlay is None:
+            continue
+        crops = smb.stack_record_crops(sources, mask)
+        fitted = [Image.fromarray(c, "RGBA") for c in crops]
+        measure(
+            f"record_mask_overlay/{name}",
+            lambda src, m=mask, o=overlay, sl=soft, kw=params: smb.compose_record_with_mask_overlay(src, m, o, softlight_img=sl, **kw),
+            crops,
+            lambda c, m=mask, o=overlay, sl=soft, kw=params: smb.compose_record_batch(c, m, o, softlight_img=sl, **kw),
+            fitted,
+        )
+    for im in images:
+        im.close()
+
+    width = max(len(name) for name, _, _ in rows)
+    print(f"{'batch of ' + str(len(sources)) + ' covers':<{width}}  {'call ms':>9}  {'batch ms':>9}  (per cover, crops pre-fitted)")
+    for name, per_call, batched in rows:
+        print(f"{name:<{width}}  {per_call:9.3f}  {batched:9.3f}")
+    return failures
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000.0
+
+
+def save_reference(path: Path, results: list[BenchResult]) -> None:
+    data = {
+        "version": BENCH_REFERENCE_VERSION,
+        "pillow": Image.__version__,
+        "digests": {f"{r.case}@{r.cover}": r.digest for r in results},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def check_reference(path: Path, results: list[BenchResult]) -> list[str]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise SystemExit(f"No reference at {path}. Run with --save-reference on a known-good tree first.")
+    except Exception as e:
+        raise SystemExit(f"Unreadable reference {path}: {e}")
+    if data.get("version") != BENCH_REFERENCE_VERSION:
+        raise SystemExit(f"Reference {path} was written by a different bench version; save it again.")
+    if data.get("pillow") != Image.__version__:
+        smb._safe_console_print(
+            f"WARNING: reference was recorded with Pillow {data.get('pillow')}, running {Image.__version__}; "
+            "resampling differences may show up as mismatches."
+        )
+    expected = data.get("digests", {})
+    failures = []
+    for r in results:
+        want = expected.get(f"{r.case}@{r.cover}")
+        if want is None:
+            failures.append(f"{r.case}@{r.cover}: not in reference")
+        elif want != r.digest:
+            failures.append(f"{r.case}@{r.cover}: pixels differ")
+    return failures
+
+
+def print_results(results: list[BenchResult]) -> None:
+    width = max((len(r.case) for r in results), default=10)
+    cover_w = max((len(r.cover) for r in results), default=10)
+    print(f"{'case':<{width}}  {'cover':<{cover_w}}  {'best ms':>9}  {'median ms':>9}")
+    for r in results:
+        print(f"{r.case:<{width}}  {r.cover:<{cover_w}}  {r.best_ms:9.2f}  {r.median_ms:9.2f}")
+    totals: dict[str, float] = {}
+    for r in results:
+        totals[r.case] = totals.get(r.case, 0.0) + r.median_ms
+    print("")
+    print(f"{'case (all covers, median)':<{width}}  {'total ms':>9}")
+    for case, total in totals.items():
+        print(f"{case:<{width}}  {total:9.2f}")
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark and verify Simple Moozic Builder texture composition")
+    p.add_argument("--assets-root", type=Path, default=smb.default_assets_root(), help="Builder assets folder (templates)")
+    p.add_argument("--repeat", type=int, default=5, help="Timed calls per case and cover")
+    p.add_argument("--only", default="", help="Only run cases whose name contains this text")
+    p.add_argument("--pack-songs", type=int, default=24, help="Songs in the synthetic pack run (0 skips it)")
+    p.add_argument("--batch", type=int, default=32, help="Covers per stack in the batch API run (0 skips it)")
+    p.add_argument("--workers", type=int, default=None, help="Texture workers for the pack run (default: SMB_TEXTURE_WORKERS rules)")
+    p.add_argument("--png-profile", choices=smb.PNG_PROFILES, default="default", help="PNG profile for the pack run")
+    p.add_argument("--reference", type=Path, default=None, help="Reference digest file (default: .smb_bench/reference.json)")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument("--save-reference", action="store_true", help="Record current outputs as the reference")
+    mode.add_argument("--check", action="store_true", help="Fail if any output differs from the reference")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    reference = args.reference or default_reference_path()
+    with tempfile.TemporaryDirectory(prefix="smb_bench_") as tmp_name:
+        tmp = Path(tmp_name)
+        covers = write_synthetic_covers(tmp / "covers")
+        cases = build_cases(args.assets_root)
+        results = run_cases(cases, covers, tmp, args.repeat, args.only or None)
+        print_results(results)
+
+        batch_failures: list[str] = []
+        if args.batch > 0 and not args.only:
+            print("")
+            batch_failures = run_batches(args.assets_root, covers, args.batch, args.repeat)
+
+        if args.pack_songs > 0 and not args.only:
+            print("")
+            elapsed, done = run_pack(args.assets_root, covers, tmp, args.pack_songs, args.workers, args.png_profile)
+            songs = max(1, args.pack_songs)
+            print(
+                f"Pack: {songs} songs ({done} cassette and vinyl texture sets) in {elapsed:.2f}s, "
+                f"{elapsed * 1000.0 / songs:.1f} ms/song, png={args.png_profile}"
+            )
+
+    if args.save_reference:
+        if args.only:
+            raise SystemExit("--save-reference needs the full case set; drop --only.")
+        save_reference(reference, results)
+        print(f"Saved reference: {reference}")
+    elif args.check:
+        failures = check_reference(reference, results) + batch_failures
+        if failures:
+            print("")
+            print(f"Equivalence check FAILED ({len(failures)} of {len(results)}):")
+            for line in failures:
+                print(f"  {line}")
+            return 1
+        print(f"Equivalence check passed: {len(results)} outputs match {reference}")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    raise SystemExit(main())
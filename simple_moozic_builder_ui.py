@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
 import os
+import queue
 import random
 import shutil
 import subprocess
@@ -31,22 +33,35 @@ except Exception:
 
 from simple_moozic_builder import (
     _safe_song_stem,
+    STAT_CACHE,
+    COVER_INDEX,
+    COVER_SIMILAR_MAX_DISTANCE,
     AudioTrackEntry,
     BuildTrackEvent,
+    Catalog,
+    CatalogChange,
+    CatalogWatcher,
     audio_cache_root,
     app_root,
     bundled_resource_root,
     bootstrap_runtime_folders,
     build_mixed_from_config,
     convert_single_audio_file,
+    cover_hash_distance,
     create_song_from_sources,
     default_assets_root,
     default_audio_root,
     default_cover_root,
     default_output_root,
+    find_duplicate_songs,
+    is_mix_recipe,
     locate_ffplay,
+    mix_recipe_path,
+    mix_recipe_stem,
+    HR_TEXTURE_POLICIES,
+    PNG_PROFILES,
+    TEXTURE_SIZE_POLICIES,
     render_workshop_square_image,
-    refresh_song_catalog,
     ensure_audio_workspace,
 )
 
@@ -251,6 +266,8 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         self.poster_path: Path | None = self.default_poster_path if self.default_poster_path.exists() else None
         self.final_output_dir: Path | None = None
         self.track_rows: list[dict] = []
+        self._rows_by_key: dict[str, dict] = {}
+        self.catalog: Catalog | None = None
         self.track_settings: dict[str, dict] = {}
         self.excluded_oggs: set[str] = set()
         self.preview_images: list[ctk.CTkImage] = []
@@ -267,6 +284,11 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         if os.environ.get("SMB_PREVIEW_BACKEND", "").strip().lower() == "ffplay":
             self.preview_backend = "ffplay"
         self._aux_preview_procs: list[object] = []
+        self.catalog_watcher: CatalogWatcher | None = None
+        self._auto_convert_queue: queue.Queue = queue.Queue()
+        self._auto_convert_pending: set[Path] = set()
+        self._auto_convert_thread: threading.Thread | None = None
+        self._duplicate_check_token: object | None = None
         self._hover_tip_window: tk.Toplevel | None = None
         self._window_icon_image: tk.PhotoImage | None = None
         self._window_icon_images: list[tk.PhotoImage] = []
@@ -288,6 +310,10 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         self.bulk_cassette_var = tk.BooleanVar(value=True)
         self.bulk_vinyl_var = tk.BooleanVar(value=True)
         self.global_vinyl_mask_var = tk.StringVar(value="inside")
+        self.png_profile_var = tk.StringVar(value="default")
+        self.collapse_covers_var = tk.BooleanVar(value=False)
+        self.texture_size_var = tk.StringVar(value="native")
+        self.hr_textures_var = tk.StringVar(value="auto")
         self.build_progress_var = tk.DoubleVar(value=0.0)
 
         self.sort_state: dict[str, bool] = {}
@@ -604,7 +630,29 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         self.file_menu.add_command(label="Exit", command=self.on_close)
         self._refresh_recent_menu()
         self.menu_bar.add_cascade(label="File", menu=self.file_menu)
+        self.build_menu = tk.Menu(self.menu_bar, tearoff=0)
+        for profile, label in zip(PNG_PROFILES, ("Draft (fast PNG)", "Default", "Release (smallest PNG)")):
+            self.build_menu.add_radiobutton(label=label, variable=self.png_profile_var, value=profile)
+        self.build_menu.add_separator()
+        self.texture_size_menu = tk.Menu(self.build_menu, tearoff=0)
+        for policy, label in zip(TEXTURE_SIZE_POLICIES, ("Native (template sizes)", "Power of Two 128", "Power of Two 256")):
+            self.texture_size_menu.add_radiobutton(label=label, variable=self.texture_size_var, value=policy)
+        self.build_menu.add_cascade(label="Texture Size", menu=self.texture_size_menu)
+        self.hr_menu = tk.Menu(self.build_menu, tearoff=0)
+        hr_labels = (
+            "Auto (skip in Draft builds)",
+            "Ship Full Size",
+            "Ship Downsampled",
+            "Side Folder (not uploaded)",
+            "Off",
+        )
+        for policy, label in zip(HR_TEXTURE_POLICIES, hr_labels):
+            self.hr_menu.add_radiobutton(label=label, variable=self.hr_textures_var, value=policy)
+        self.build_menu.add_cascade(label="HR Covers", menu=self.hr_menu)
+        self.build_menu.add_checkbutton(label="Share Textures for Look-alike Covers", variable=self.collapse_covers_var)
+        self.menu_bar.add_cascade(label="Build", menu=self.build_menu)
         self.menu_bar.add_command(label="Create Mix", command=self.open_song_builder_popup)
+        self.menu_bar.add_command(label="Find Duplicates", command=self.scan_duplicate_songs)
         self.configure(menu=self.menu_bar)
 
     def _bind_shortcuts(self) -> None:
@@ -678,6 +726,10 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             "output_dir": str(self.out_dir),
             "workshop_dir": str(self.workshop_dir_override) if self.workshop_dir_override else None,
             "global_vinyl_mask": (self.global_vinyl_mask_var.get() or "inside").strip().lower(),
+            "png_profile": self.png_profile_var.get(),
+            "collapse_similar_covers": bool(self.collapse_covers_var.get()),
+            "texture_size": self.texture_size_var.get(),
+            "hr_textures": self.hr_textures_var.get(),
             "track_settings": self.track_settings,
             "song_order": [row["ogg"].name for row in self.track_rows],
             "excluded_oggs": sorted(self.excluded_oggs),
@@ -726,6 +778,13 @@ class SimpleMoozicBuilderUI(ctk.CTk):
 
         mask = (data.get("global_vinyl_mask") or "inside").strip().lower()
         self.apply_global_vinyl_mask(mask)
+        png_profile = str(data.get("png_profile") or "default").strip().lower()
+        self.png_profile_var.set(png_profile if png_profile in PNG_PROFILES else "default")
+        self.collapse_covers_var.set(bool(data.get("collapse_similar_covers", False)))
+        texture_size = str(data.get("texture_size") or "native").strip().lower()
+        self.texture_size_var.set(texture_size if texture_size in TEXTURE_SIZE_POLICIES else "native")
+        hr_textures = str(data.get("hr_textures") or "auto").strip().lower()
+        self.hr_textures_var.set(hr_textures if hr_textures in HR_TEXTURE_POLICIES else "auto")
 
         poster_raw = data.get("poster_path")
         add_name_to_poster = data.get("add_name_to_poster")
@@ -751,6 +810,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         self.filter_var.set(str(data.get("filter_text", "") or ""))
 
         self.refresh_songs()
+        self._index_covers(cfg.get("cover") for cfg in self.track_settings.values())
 
         song_order = data.get("song_order")
         if isinstance(song_order, list) and song_order:
@@ -886,6 +946,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         self.refresh_songs()
 
     def on_close(self) -> None:
+        self._stop_catalog_watcher()
         self.stop_preview()
         self._hide_hover_tip()
         for proc in list(self._aux_preview_procs):
@@ -894,6 +955,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             except Exception:
                 pass
         self._aux_preview_procs.clear()
+        self._stop_auto_convert()
         self._save_last_session_state()
         self.destroy()
 
@@ -933,18 +995,19 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         return Path.home()
 
     def _song_status_for_paths(self, source: Path, ogg: Path) -> tuple[str, str]:
-        if source.suffix.lower() == ".ogg":
+        if is_mix_recipe(source):
+            return ("ready", "mix (rendered)") if STAT_CACHE.exists(ogg) else ("mix recipe", "renders at build")
+        if source.suffix.lower() == ".ogg" and source == ogg:
             return "ready", "source ogg"
-        if not ogg.exists():
+        ogg_st = STAT_CACHE.stat(ogg)
+        if ogg_st is None:
             return "needs convert", "not converted"
-        try:
-            src_mtime = source.stat().st_mtime
-            ogg_mtime = ogg.stat().st_mtime
-            if ogg_mtime >= src_mtime:
-                return "ready", "up-to-date"
-            return "stale", "source newer"
-        except Exception:
+        src_st = STAT_CACHE.stat(source)
+        if src_st is None:
+            return "ready", "up-to-date"
+        if ogg_st.mtime_ns >= src_st.mtime_ns:
             return "ready", "up-to-date"
+        return "stale", "source newer"
 
     def _register_linked_song(self, source_file: Path) -> str | None:
         src = source_file.resolve()
@@ -968,6 +1031,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             return
         row = self.track_rows.pop(idx)
         self.track_rows.append(row)
+        self._reindex_rows()
         self._redraw_tree()
 
     def add_song_files(self) -> None:
@@ -1027,7 +1091,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         key = row_key or (selected[0] if selected else None)
         if not key:
             return
-        row = next((r for r in self.track_rows if r["ogg"].name == key), None)
+        row = self._row_for_key(key)
         if not row:
             return
         target_file = row["ogg"] if row["ogg"].exists() else row["source"]
@@ -1071,7 +1135,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         converted = 0
         errors = 0
         for key in selected:
-            row = next((r for r in self.track_rows if r["ogg"].name == key), None)
+            row = self._row_for_key(key)
             if not row:
                 continue
             try:
@@ -1090,6 +1154,109 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         else:
             self.status_var.set(f"Converted {converted} song(s)")
 
+    def _duplicate_check_entries(self) -> list[AudioTrackEntry]:
+        entries: list[AudioTrackEntry] = []
+        for row in self.track_rows:
+            status, detail = row["status"], row["detail"]
+            if row.get("duplicate_of"):
+                # The duplicate note replaced the detail text; recover the plain one before re-checking.
+                status, detail = self._song_status_for_paths(row["source"], row["ogg"])
+            entries.append(AudioTrackEntry(source=row["source"], ogg=row["ogg"], status=status, detail=detail))
+        return entries
+
+    def _check_duplicates_in_background(self) -> None:
+        # Catalog refreshes only reuse stored hashes; same-size files that were never hashed are read here,
+        # off the Tk thread, and land in the stat-keyed cache for the next refresh.
+        entries = self._duplicate_check_entries()
+        if len(entries) < 2:
+            return
+        cache_root = audio_cache_root(self.audio_dir_active.resolve())
+        token = object()
+        self._duplicate_check_token = token
+
+        def worker() -> None:
+            try:
+                duplicates = find_duplicate_songs(entries, cache_root, fingerprint_mode="cached")
+            except Exception:
+                return
+
+            def apply() -> None:
+                if token is self._duplicate_check_token:
+                    self._apply_duplicate_results(entries, duplicates, prompt=False)
+
+            try:
+                self.after(0, apply)
+            except Exception:
+                pass
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def scan_duplicate_songs(self) -> None:
+        if not self.track_rows:
+            self.status_var.set("No songs to check")
+            return
+        entries = self._duplicate_check_entries()
+        cache_root = audio_cache_root(self.audio_dir_active.resolve())
+        self._duplicate_check_token = None
+        self.status_var.set("Checking for duplicate songs...")
+
+        def progress(done: int, total: int) -> None:
+            self.after(0, lambda: self.status_var.set(f"Fingerprinting songs... ({done}/{total})"))
+
+        def worker() -> None:
+            try:
+                duplicates = find_duplicate_songs(entries, cache_root, fingerprint_mode="full", progress_cb=progress)
+            except Exception as e:
+                self.after(0, lambda: self.status_var.set(f"Duplicate check failed: {e}"))
+                return
+            self.after(0, lambda: self._apply_duplicate_results(entries, duplicates))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _apply_duplicate_results(
+        self, entries: list[AudioTrackEntry], duplicates: dict[str, str], prompt: bool = True
+    ) -> None:
+        by_key = {e.ogg.name: e for e in entries}
+        changed = False
+        for row in self.track_rows:
+            entry = by_key.get(row["ogg"].name)
+            if entry is None:
+                continue
+            if not prompt and row.get("duplicate_of") == entry.duplicate_of:
+                continue
+            changed = True
+            row["status"] = entry.status
+            row["detail"] = entry.detail
+            row["duplicate_of"] = entry.duplicate_of
+        if not prompt:
+            # Background checks stay quiet unless they changed a flag.
+            if changed:
+                self._redraw_tree()
+                if duplicates:
+                    self.status_var.set(f"Found {len(duplicates)} duplicate song(s)")
+            return
+        self._redraw_tree()
+        if not duplicates:
+            self.status_var.set("No duplicate songs found")
+            return
+        self.status_var.set(f"Found {len(duplicates)} duplicate song(s)")
+        enabled = [
+            key
+            for key in duplicates
+            if self.track_settings.get(key, {}).get("cassette") or self.track_settings.get(key, {}).get("vinyl")
+        ]
+        if not enabled:
+            return
+        if messagebox.askyesno(
+            "Duplicate Songs",
+            f"{len(enabled)} duplicate song(s) are set to build.\n\nUntick them so they are not converted or built?",
+            parent=self,
+        ):
+            for key in enabled:
+                self.track_settings[key]["cassette"] = False
+                self.track_settings[key]["vinyl"] = False
+            self._redraw_tree()
+
     def remove_selected_songs(self) -> None:
         selected = self._selected_keys()
         if not selected:
@@ -1098,6 +1265,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             self.excluded_oggs.add(key)
             self.track_settings.pop(key, None)
         self.track_rows = [r for r in self.track_rows if r["ogg"].name not in self.excluded_oggs]
+        self._reindex_rows()
         self._redraw_tree()
         self.status_var.set(f"Removed {len(selected)} song(s) from list")
 
@@ -1480,7 +1648,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             out_stem = _safe_song_stem(name)
             out_path = src_root / f"{out_stem}.ogg"
             overwrite_existing = False
-            if out_path.exists():
+            if out_path.exists() or mix_recipe_path(src_root, out_stem).exists():
                 overwrite_existing = bool(
                     messagebox.askyesno(
                         "Overwrite Existing Mix",
@@ -1530,19 +1698,20 @@ class SimpleMoozicBuilderUI(ctk.CTk):
 
             def worker():
                 try:
-                    out_file = create_song_from_sources(
+                    recipe_file = create_song_from_sources(
                         name,
                         song_files,
                         self.audio_dir_active,
                         overwrite_existing=overwrite_existing,
                     )
+                    song_key = f"{mix_recipe_stem(recipe_file)}.ogg"
                     def done_ok():
                         stop_pulse()
                         progress.set(1.0)
-                        self.excluded_oggs.discard(out_file.name)
+                        self.excluded_oggs.discard(song_key)
                         self.refresh_songs()
-                        self._move_song_to_bottom(out_file.name)
-                        self.status_var.set(f"Created song: {out_file.name}")
+                        self._move_song_to_bottom(song_key)
+                        self.status_var.set(f"Created song: {song_key}")
                         build_in_progress["value"] = False
                         stop_popup_preview()
                         save_last_mix_state()
@@ -1666,7 +1835,9 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         self.audio_dir_active = self._pick_active_audio_dir()
         prev_order = [row["ogg"].name for row in self.track_rows]
         prev_order_map = {name: idx for idx, name in enumerate(prev_order)}
-        rows = refresh_song_catalog(self.audio_dir_active)
+        if self.catalog is None or self.catalog.audio_dir != self.audio_dir_active:
+            self.catalog = Catalog(self.audio_dir_active)
+        rows = self.catalog.refresh().entries
         row_map = {r.ogg.name: r for r in rows}
         _, cache_root = ensure_audio_workspace(self.audio_dir_active.resolve())
         for key, cfg in self.track_settings.items():
@@ -1674,7 +1845,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             if not source_raw or key in row_map:
                 continue
             src = Path(source_raw)
-            if not src.exists() or not src.is_file():
+            if not STAT_CACHE.is_file(src):
                 continue
             ogg = src if src.suffix.lower() == ".ogg" else (cache_root / key)
             status, detail = self._song_status_for_paths(src, ogg)
@@ -1693,39 +1864,175 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             self.excluded_oggs = {k for k in self.excluded_oggs if k in all_keys}
 
         visible_rows = [
-            {"source": r.source, "ogg": r.ogg, "status": r.status, "detail": r.detail}
+            {"source": r.source, "ogg": r.ogg, "status": r.status, "detail": r.detail, "duplicate_of": r.duplicate_of}
             for r in merged_rows
             if r.ogg.name not in self.excluded_oggs
         ]
 
         self.track_rows = visible_rows
+        self._reindex_rows()
 
         for row in self.track_rows:
-            key = row["ogg"].name
-            if key not in self.track_settings:
-                self.track_settings[key] = {
-                    "cassette": True,
-                    "vinyl": True,
-                    "cover": None,
-                    "b_side": None,
-                    "display_name": None,
-                    "vinyl_art_placement": self.global_vinyl_mask_var.get(),
-                    "source_path": str(row["source"]),
-                    "cached_ogg_path": str(row["ogg"]),
-                }
-            else:
-                cfg = self.track_settings[key]
-                cfg["source_path"] = str(row["source"])
-                cfg["cached_ogg_path"] = str(row["ogg"])
-                cover = cfg.get("cover")
-                if cover and not Path(cover).exists():
-                    cfg["cover"] = None
-                b_side = cfg.get("b_side")
-                if b_side and not Path(b_side).exists():
-                    cfg["b_side"] = None
+            self._sync_row_settings(row)
 
         self._redraw_tree()
         self.status_var.set(f"Loaded {len(self.track_rows)} songs")
+        self._ensure_catalog_watcher()
+        self._check_duplicates_in_background()
+
+    def _sync_row_settings(self, row: dict) -> None:
+        key = row["ogg"].name
+        if key not in self.track_settings:
+            self.track_settings[key] = {
+                "cassette": True,
+                "vinyl": True,
+                "cover": None,
+                "b_side": None,
+                "display_name": None,
+                "vinyl_art_placement": self.global_vinyl_mask_var.get(),
+                "source_path": str(row["source"]),
+                "cached_ogg_path": str(row["ogg"]),
+            }
+            return
+        cfg = self.track_settings[key]
+        cfg["source_path"] = str(row["source"])
+        cfg["cached_ogg_path"] = str(row["ogg"])
+        cover = cfg.get("cover")
+        if cover and not STAT_CACHE.exists(Path(cover)):
+            cfg["cover"] = None
+        b_side = cfg.get("b_side")
+        if b_side and not STAT_CACHE.exists(Path(b_side)):
+            cfg["b_side"] = None
+
+    def _ensure_catalog_watcher(self) -> None:
+        watcher = self.catalog_watcher
+        if watcher is not None and watcher.audio_dir == self.audio_dir_active:
+            return
+        self._stop_catalog_watcher()
+        try:
+            self.catalog_watcher = CatalogWatcher(self.audio_dir_active, self._on_catalog_changes).start()
+        except Exception:
+            self.catalog_watcher = None
+
+    def _stop_catalog_watcher(self) -> None:
+        watcher = self.catalog_watcher
+        self.catalog_watcher = None
+        if watcher is not None:
+            watcher.stop()
+
+    def _on_catalog_changes(self, changes: list[CatalogChange]) -> None:
+        # Called on the watcher thread; hop back to Tk before touching rows.
+        watcher = self.catalog_watcher
+        try:
+            self.after(0, lambda: self._apply_catalog_changes(watcher, changes))
+        except Exception:
+            pass
+
+    def _apply_catalog_changes(self, watcher: CatalogWatcher | None, changes: list[CatalogChange]) -> None:
+        if watcher is None or watcher is not self.catalog_watcher:
+            return
+        catalog = self.catalog
+        if catalog is None or catalog.audio_dir != self.audio_dir_active:
+            self.refresh_songs()
+            return
+        touched: dict[str, str] = {}
+        for change in changes:
+            key = catalog.song_key(change.path)
+            if key is not None and touched.get(key) != "added":
+                touched[key] = change.kind
+        entries = catalog.refresh(changed_paths=[c.path for c in changes]).by_ogg_name
+        rows_by_key = self._rows_by_key
+        visible_keys = {r["ogg"].name for r in self._visible_rows()}
+        added = removed = 0
+        for key, kind in sorted(touched.items()):
+            entry = entries.get(key)
+            row = rows_by_key.get(key)
+            if entry is None:
+                if row is None:
+                    continue
+                src = row["source"]
+                if STAT_CACHE.exists(src) and not any(src.parent == root for root in watcher.roots):
+                    # Linked songs outside the library only lose their cached .ogg.
+                    row["status"], row["detail"] = self._song_status_for_paths(src, row["ogg"])
+                    self._update_tree_row(row)
+                    continue
+                self.track_rows = [r for r in self.track_rows if r is not row]
+                self._rows_by_key.pop(key, None)
+                if self.tree.exists(key):
+                    self.tree.delete(key)
+                removed += 1
+                continue
+            if key in self.excluded_oggs:
+                continue
+            if row is None:
+                row = {
+                    "source": entry.source,
+                    "ogg": entry.ogg,
+                    "status": entry.status,
+                    "detail": entry.detail,
+                    "duplicate_of": entry.duplicate_of,
+                }
+                self.track_rows.append(row)
+                self._rows_by_key[key] = row
+                self._sync_row_settings(row)
+                if self._fuzzy_match(self._row_song_label(row), self.filter_var.get()):
+                    values, _ = self._tree_values_for_row(row)
+                    self.tree.insert("", "end", iid=key, values=values, tags=("even",))
+                    self.tree.set(key, "source", self._row_song_label(row))
+                added += 1
+            else:
+                row.update(
+                    source=entry.source,
+                    ogg=entry.ogg,
+                    status=entry.status,
+                    detail=entry.detail,
+                    duplicate_of=entry.duplicate_of,
+                )
+                self._sync_row_settings(row)
+                if key in visible_keys:
+                    self._update_tree_row(row)
+            if kind != "removed" and entry.status in ("needs convert", "stale") and not entry.duplicate_of:
+                self._queue_auto_convert(entry.source)
+        if added or removed:
+            self._restripe_tree()
+            self._refresh_bulk_switches()
+            self.status_var.set(f"Library changed: +{added} / -{removed} song(s)")
+
+    def _queue_auto_convert(self, source: Path) -> None:
+        if source in self._auto_convert_pending:
+            return
+        self._auto_convert_pending.add(source)
+        self._auto_convert_queue.put((self.audio_dir_active, source))
+        # One long-lived worker drains the queue; it only exits on the shutdown sentinel,
+        # so nothing queued can be stranded between an idle timeout and a restart check.
+        if self._auto_convert_thread is None:
+            self._auto_convert_thread = threading.Thread(target=self._auto_convert_worker, daemon=True)
+            self._auto_convert_thread.start()
+
+    def _stop_auto_convert(self) -> None:
+        if self._auto_convert_thread is not None:
+            self._auto_convert_queue.put(None)
+            self._auto_convert_thread = None
+
+    def _auto_convert_worker(self) -> None:
+        while True:
+            item = self._auto_convert_queue.get()
+            if item is None:
+                return
+            audio_dir, source = item
+            message = ""
+            try:
+                convert_single_audio_file(source, audio_dir, force=False)
+            except (Exception, SystemExit) as e:
+                message = f"Auto-convert failed for {source.name}: {e}"
+            finally:
+                self._auto_convert_pending.discard(source)
+            # The watcher reports the new .ogg, which refreshes the row itself.
+            if message:
+                try:
+                    self.after(0, lambda m=message: self.status_var.set(m))
+                except Exception:
+                    pass
 
     def _fuzzy_match(self, text: str, query: str) -> bool:
         t = (text or "").lower()
@@ -1748,9 +2055,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             return list(self.track_rows)
         visible: list[dict] = []
         for row in self.track_rows:
-            cfg = self.track_settings.get(row["ogg"].name, {})
-            song = str(cfg.get("display_name") or row["source"].name)
-            if self._fuzzy_match(song, q):
+            if self._fuzzy_match(self._row_song_label(row), q):
                 visible.append(row)
         return visible
 
@@ -1763,6 +2068,16 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             selected = [fallback_row_id]
         return selected
 
+    def _reindex_rows(self) -> None:
+        self._rows_by_key = {row["ogg"].name: row for row in self.track_rows}
+
+    def _row_for_key(self, key: str) -> dict | None:
+        row = self._rows_by_key.get(key)
+        if row is None or row["ogg"].name != key:
+            self._reindex_rows()
+            row = self._rows_by_key.get(key)
+        return row
+
     def _redraw_tree(self) -> None:
         prev_selected = [iid for iid in self.tree.selection() if iid]
         for iid in self.tree.get_children():
@@ -1773,39 +2088,9 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             if key in seen_iids:
                 continue
             seen_iids.add(key)
-            cfg = self.track_settings.get(key, {})
-            song_label = str(cfg.get("display_name") or (row["ogg"].name if row["ogg"].exists() else row["source"].name))
-            cover = cfg.get("cover")
-            if cover:
-                cover_path = Path(cover)
-                if self.poster_path and cover_path == self.poster_path:
-                    cover_text = "(poster override)"
-                else:
-                    cover_text = cover_path.name
-            else:
-                cover_text = "(mod default)"
-            b_side = cfg.get("b_side")
-            if b_side:
-                b_side_text = Path(b_side).name
-            else:
-                b_side_text = ""
+            values, song_label = self._tree_values_for_row(row)
             tag = "even" if i % 2 == 0 else "odd"
-            self.tree.insert(
-                "",
-                "end",
-                iid=key,
-                values=(
-                    row["ogg"].name if row["ogg"].exists() else row["source"].name,
-                    # source column is editable display label, not source-file rename
-                    "\U0001F50A",
-                    row["status"],
-                    "\u2713" if cfg.get("cassette") else "",
-                    "\u2713" if cfg.get("vinyl") else "",
-                    b_side_text,
-                    cover_text,
-                ),
-                tags=(tag,),
-            )
+            self.tree.insert("", "end", iid=key, values=values, tags=(tag,))
             self.tree.set(key, "source", song_label)
         if prev_selected:
             keep = [iid for iid in prev_selected if self.tree.exists(iid)]
@@ -1816,6 +2101,58 @@ class SimpleMoozicBuilderUI(ctk.CTk):
                     pass
         self._refresh_bulk_switches()
 
+    def _tree_values_for_row(self, row: dict) -> tuple[tuple, str]:
+        cfg = self.track_settings.get(row["ogg"].name, {})
+        file_label = self._row_file_label(row)
+        song_label = str(cfg.get("display_name") or file_label)
+        cover = cfg.get("cover")
+        if cover:
+            cover_path = Path(cover)
+            if self.poster_path and cover_path == self.poster_path:
+                cover_text = "(poster override)"
+            else:
+                cover_text = cover_path.name
+        else:
+            cover_text = "(mod default)"
+        b_side = cfg.get("b_side")
+        if b_side:
+            b_side_text = Path(b_side).name
+        else:
+            b_side_text = ""
+        values = (
+            file_label,
+            # source column is editable display label, not source-file rename
+            "\U0001F50A",
+            f"{row['status']} (duplicate)" if row.get("duplicate_of") else row["status"],
+            "\u2713" if cfg.get("cassette") else "",
+            "\u2713" if cfg.get("vinyl") else "",
+            b_side_text,
+            cover_text,
+        )
+        return values, song_label
+
+    def _row_song_label(self, row: dict) -> str:
+        cfg = self.track_settings.get(row["ogg"].name, {})
+        return str(cfg.get("display_name") or row["source"].name)
+
+    def _update_tree_row(self, row: dict) -> None:
+        key = row["ogg"].name
+        if not self.tree.exists(key):
+            return
+        values, song_label = self._tree_values_for_row(row)
+        self.tree.item(key, values=values)
+        self.tree.set(key, "source", song_label)
+
+    def _restripe_tree(self) -> None:
+        for i, iid in enumerate(self.tree.get_children()):
+            self.tree.item(iid, tags=("even" if i % 2 == 0 else "odd",))
+
+    def _row_file_label(self, row: dict) -> str:
+        # Unrendered mix recipes are listed under the .ogg name they will render to.
+        if STAT_CACHE.exists(row["ogg"]) or is_mix_recipe(row["source"]):
+            return row["ogg"].name
+        return row["source"].name
+
     def on_tree_select(self, _event=None) -> None:
         selected = self.tree.selection()
         if selected:
@@ -1893,12 +2230,57 @@ class SimpleMoozicBuilderUI(ctk.CTk):
                         self.track_settings.setdefault(key, {})["cover"] = str(Path(selected))
                     self._redraw_tree()
                     self._update_selection_status_hint()
+                    self._check_similar_cover(Path(selected), row_keys)
 
             self._defer_native_dialog(_pick_cover)
             return "break"
 
         return None
 
+    def _index_covers(self, covers) -> None:
+        # Index covers restored from a project off the UI thread, so builds and preview tiles find them.
+        paths = sorted({Path(c) for c in covers if c})
+        if not paths:
+            return
+
+        def worker() -> None:
+            for path in paths:
+                COVER_INDEX.record(path)
+            COVER_INDEX.save()
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _check_similar_cover(self, cover: Path, row_keys: list[str]) -> None:
+        # Index the new cover and compare it with the covers other songs use, off the UI thread.
+        # Look-alikes still build separate textures unless "Share Textures for Look-alike Covers" is on.
+        others = {
+            Path(cfg["cover"])
+            for key, cfg in self.track_settings.items()
+            if key not in row_keys and cfg.get("cover") and Path(cfg["cover"]) != cover
+        }
+
+        def compare(target: int | None) -> None:
+            if target is None or not others:
+                return
+            matches = sorted(
+                p.name
+                for p in others
+                if (h := COVER_INDEX.phash(p)) is not None and cover_hash_distance(target, h) <= COVER_SIMILAR_MAX_DISTANCE
+            )
+            if not matches:
+                return
+            shown = ", ".join(matches[:3]) + (f" (+{len(matches) - 3} more)" if len(matches) > 3 else "")
+            message = f"Cover {cover.name} looks like {shown}"
+            self.after(0, lambda: self.status_var.set(message))
+
+        def worker() -> None:
+            try:
+                compare(COVER_INDEX.phash(cover))
+            finally:
+                COVER_INDEX.save()
+
+        threading.Thread(target=worker, daemon=True).start()
+
     def _defer_native_dialog(self, fn) -> None:
         # Native dialogs opened directly from Treeview click handlers can crash on some
         # Windows Tk states; defer one tick to exit the event callback first.
@@ -1934,7 +2316,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             except Exception:
                 pass
             self.inline_editor = None
-        current_row = next((r for r in self.track_rows if r["ogg"].name == row_id), None)
+        current_row = self._row_for_key(row_id)
         if not current_row:
             return
         cfg = self.track_settings.get(row_id, {})
@@ -2070,10 +2452,13 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         if backend == "ffplay" and self.preview_ffplay is None:
             self.status_var.set(self._preview_unavailable_message())
             return
-        row = next((r for r in self.track_rows if r["ogg"].name == row_id), None)
+        row = self._row_for_key(row_id)
         if not row:
             return
         audio_path = row["ogg"] if row["ogg"].exists() else row["source"]
+        if is_mix_recipe(audio_path):
+            self.status_var.set("Preview unavailable: mix renders at build")
+            return
         if not audio_path.exists():
             self.status_var.set("Preview unavailable: file missing")
             return
@@ -2342,6 +2727,10 @@ class SimpleMoozicBuilderUI(ctk.CTk):
                 src_key = str(src.resolve())
                 if src_key in seen_sources:
                     continue
+                if row.get("duplicate_of"):
+                    # Flagged duplicates reuse the canonical song; don't spend a conversion on them.
+                    processed += 1
+                    continue
                 seen_sources.add(src_key)
                 entry = convert_single_audio_file(src, self.audio_dir_active, force=False)
                 _on_progress(entry)
@@ -2370,7 +2759,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             errors.append("No songs selected for cassette or vinyl.")
         for cfg in self.track_settings.values():
             cover = cfg.get("cover")
-            if cover and not Path(cover).exists():
+            if cover and not STAT_CACHE.exists(Path(cover)):
                 errors.append(f"Missing cover file: {cover}")
         return errors
 
@@ -2409,7 +2798,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             if not row_cfg.get("cover"):
                 row_cfg["cover"] = None
             b_side = row_cfg.get("b_side")
-            if not b_side or not Path(b_side).exists():
+            if not b_side or not STAT_CACHE.exists(Path(b_side)):
                 row_cfg["b_side"] = None
             row_cfg["vinyl_art_placement"] = global_mask
             row_cfg["source_path"] = str(row["source"])
@@ -2427,6 +2816,10 @@ class SimpleMoozicBuilderUI(ctk.CTk):
             "add_name_to_poster": bool(self.poster_add_name_var.get()),
             "parent_mod_id": parent_mod_id,
             "standalone_bundle": not bool(parent_mod_id),
+            "png_profile": self.png_profile_var.get(),
+            "collapse_similar_covers": bool(self.collapse_covers_var.get()),
+            "texture_size": self.texture_size_var.get(),
+            "hr_textures": self.hr_textures_var.get(),
             "cover": None,
             "track_modes": track_modes,
         }
@@ -2493,6 +2886,9 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         thumb = event.thumbnail if event.thumbnail and event.thumbnail.exists() else None
         if thumb is None and mode:
             thumb = self._pick_default_preview_asset(mode, raw_title)
+        indexed = COVER_INDEX.cached(thumb) if thumb else None
+        if indexed is not None and indexed.thumb is not None and indexed.thumb.exists():
+            thumb = indexed.thumb
 
         if thumb and thumb.exists():
             try:
@@ -2536,7 +2932,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         self.status_var.set("Building (please wait)...")
 
         try:
-            out = build_mixed_from_config(self._build_config(), on_track=self._add_preview_tile)
+            out = build_mixed_from_config(self._build_config(), on_track=self._add_preview_tile, catalog=self.catalog)
         except SystemExit as e:
             self.progress_bar.stop()
             self.progress_bar.configure(mode="determinate")
@@ -2583,6 +2979,10 @@ class SimpleMoozicBuilderUI(ctk.CTk):
         self._update_top_poster_preview(self.poster_path)
         self.global_vinyl_mask_var.set("inside")
         self._refresh_global_vinyl_mask_button()
+        self.png_profile_var.set("default")
+        self.collapse_covers_var.set(False)
+        self.texture_size_var.set("native")
+        self.hr_textures_var.set("auto")
         self.audio_dir_override = None
         self.audio_dir_active = default_audio_root()
         self.last_song_pick_dir = Path.home()
@@ -2697,6 +3097,7 @@ class SimpleMoozicBuilderUI(ctk.CTk):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     _enable_fatal_fault_log()
 
     def _global_excepthook(exc_type, exc_value, exc_traceback):